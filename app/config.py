@@ -48,4 +48,57 @@ if FRONTEND_URL and not FRONTEND_URL.startswith("http"):
 
 # Admin Config table name registered in models/ at MODEL_FACTORY
 ADMIN_CONFIG_TABLE_NAME = "admin_config"
-ADMIN_CONFIG_TABLE_JSON_CONFIG_COL = "configuration"
\ No newline at end of file
+ADMIN_CONFIG_TABLE_JSON_CONFIG_COL = "configuration"
+
+# Task execution configuration
+# Direct tasks kept in memory per state (finished tasks are evicted first, least recently used)
+TASK_REGISTRY_MAX_SIZE = int(os.getenv("TASK_REGISTRY_MAX_SIZE", "1000"))
+# Seconds a finished direct task stays in memory before it's moved to the archive
+TASK_REGISTRY_TTL_SECONDS = float(os.getenv("TASK_REGISTRY_TTL_SECONDS", "3600"))
+# Finished task results kept in the compact archive per state
+TASK_ARCHIVE_MAX_SIZE = int(os.getenv("TASK_ARCHIVE_MAX_SIZE", "10000"))
+# Persist direct tasks to the TaskRecord table so any worker can serve them after a restart
+TASK_STORE_ENABLED = os.getenv("TASK_STORE_ENABLED", "true").lower() in ["true", "1", "yes"]
+# Seconds between batched task status writes (terminal statuses are written immediately)
+TASK_STORE_FLUSH_INTERVAL_SECONDS = float(os.getenv("TASK_STORE_FLUSH_INTERVAL_SECONDS", "1.0"))
+# Seconds between store reads when streaming a task owned by another worker
+TASK_STORE_POLL_INTERVAL_SECONDS = float(os.getenv("TASK_STORE_POLL_INTERVAL_SECONDS", "2.0"))
+# Direct tasks running at once across all states, and per state
+TASK_MAX_CONCURRENCY = int(os.getenv("TASK_MAX_CONCURRENCY", "8"))
+TASK_MAX_CONCURRENCY_PER_STATE = int(os.getenv("TASK_MAX_CONCURRENCY_PER_STATE", "4"))
+# Direct tasks waiting for a slot before new submissions are rejected with HTTP 429
+TASK_MAX_PENDING = int(os.getenv("TASK_MAX_PENDING", "1000"))
+# Worker processes for tasks declared with @monitored_background_task(executor="process")
+TASK_PROCESS_POOL_SIZE = int(os.getenv("TASK_PROCESS_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+# Client sessions whose task snapshots are cached for the status and result endpoints
+TASK_STATUS_CACHE_MAX_SESSIONS = int(os.getenv("TASK_STATUS_CACHE_MAX_SESSIONS", "1000"))
+# Seconds a cached snapshot of a running task (or a session's task list) is served before
+# the session is read from the state manager again (catches updates from other workers)
+TASK_STATUS_CACHE_MAX_AGE_SECONDS = float(os.getenv("TASK_STATUS_CACHE_MAX_AGE_SECONDS", "2"))
+# Milliseconds between state writes of a task's progress updates (status changes are written at once)
+TASK_UPDATE_FLUSH_INTERVAL_MS = float(os.getenv("TASK_UPDATE_FLUSH_INTERVAL_MS", "100"))
+# History entries kept per direct task (oldest are overwritten; clients resume with ?since=<seq>)
+TASK_HISTORY_SIZE = int(os.getenv("TASK_HISTORY_SIZE", "500"))
+# Task subscriptions allowed on one multiplexed websocket connection (/ws/tasks)
+TASK_WS_MAX_SUBSCRIPTIONS = int(os.getenv("TASK_WS_MAX_SUBSCRIPTIONS", "200"))
+# Seconds a repeated submission (same Idempotency-Key, or same arguments of a memoize=True task) reuses the earlier task
+TASK_IDEMPOTENCY_TTL_SECONDS = float(os.getenv("TASK_IDEMPOTENCY_TTL_SECONDS", "600"))
+TASK_IDEMPOTENCY_MAX_KEYS = int(os.getenv("TASK_IDEMPOTENCY_MAX_KEYS", "10000"))
+# Name of this backend worker, encoded in the task IDs it creates (defaults to hostname and process ID)
+TASK_WORKER_ID = os.getenv("TASK_WORKER_ID", "")
+# Run tasks declared with schedule= or listed in the schedules AdminConfig row (enable on one worker only)
+TASK_SCHEDULER_ENABLED = os.getenv("TASK_SCHEDULER_ENABLED", "true").lower() in ["true", "1", "yes"]
+# Name of the AdminConfig row holding {"schedules": [{"state", "task", "cron", "parameters"}, ...]}
+TASK_SCHEDULE_CONFIG_NAME = os.getenv("TASK_SCHEDULE_CONFIG_NAME", "Task Schedules")
+# Seconds between reloads of the schedules AdminConfig row
+TASK_SCHEDULE_RELOAD_SECONDS = float(os.getenv("TASK_SCHEDULE_RELOAD_SECONDS", "60"))
+# Name of the AdminConfig row holding named pipeline definitions {"pipelines": {"<name>": {"nodes": [...]}}}
+TASK_PIPELINE_CONFIG_NAME = os.getenv("TASK_PIPELINE_CONFIG_NAME", "Task Pipelines")
+# Pipelines kept in memory for the progress endpoints (the oldest finished ones are dropped first)
+TASK_PIPELINE_MAX_SIZE = int(os.getenv("TASK_PIPELINE_MAX_SIZE", "1000"))
+# Finished tasks kept in a session's state; older ones move to its backend-only archive (0 keeps all)
+TASK_STATE_MAX_TASKS = int(os.getenv("TASK_STATE_MAX_TASKS", "100"))
+# Seconds a finished task stays in a session's state after it was created (0 for no age limit)
+TASK_STATE_MAX_AGE_SECONDS = float(os.getenv("TASK_STATE_MAX_AGE_SECONDS", "0"))
+# Archived tasks kept per session for "load older tasks" (the oldest are dropped)
+TASK_STATE_ARCHIVE_SIZE = int(os.getenv("TASK_STATE_ARCHIVE_SIZE", "1000"))
@@ -2,9 +2,10 @@
 from .admin.user import User, UserAttribute, CollectionResponse
 from .admin.admin_config import AdminConfig
 from .admin.subscription import SubscriptionFeature
+from .task import TaskRecord
 
 
-__all__ = ["User", "UserAttribute", "CollectionResponse", "AdminConfig", "SubscriptionFeature"]
+__all__ = ["User", "UserAttribute", "CollectionResponse", "AdminConfig", "SubscriptionFeature", "TaskRecord"]
 
 
 # Factory mapping for modeles to for initailizing default values
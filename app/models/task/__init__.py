@@ -0,0 +1,4 @@
+"""Task models package."""
+from .task_record import TaskRecord
+
+__all__ = ["TaskRecord"]
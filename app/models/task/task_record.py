@@ -0,0 +1,42 @@
+"""Durable record of directly executed tasks."""
+from typing import Optional, Any
+import datetime
+from datetime import timezone
+
+import reflex as rx
+import sqlalchemy
+from sqlalchemy import DateTime, JSON
+from sqlmodel import Field, Column
+
+
+class TaskRecord(rx.Model, table=True):
+    """Status and result of a direct task, shared by all backend workers."""
+    id: str = Field(primary_key=True, max_length=64)
+    state: str = Field(index=True)
+    task_name: str = Field(index=True)
+    # Hash of the validated task arguments
+    params_hash: Optional[str] = Field(default=None, index=True, max_length=64)
+    status: str
+    progress: int = 0
+    result: Optional[Any] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = None
+    created_at: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(timezone.utc),
+        sa_column=Column(
+            "created_at",
+            DateTime(timezone=True),
+            server_default=sqlalchemy.func.now(),
+        ),
+    )
+    updated_at: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(timezone.utc),
+        sa_column=Column(
+            "updated_at",
+            DateTime(timezone=True),
+            server_default=sqlalchemy.func.now(),
+        ),
+    )
+    finished_at: Optional[datetime.datetime] = Field(
+        default=None,
+        sa_column=Column("finished_at", DateTime(timezone=True), nullable=True),
+    )
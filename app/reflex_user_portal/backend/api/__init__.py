@@ -1,10 +1,15 @@
 import reflex as rx
 
 from .task import TaskAPI
+from .multiplex import TaskStreamMultiplexer
+from .schedules import TaskScheduleRunner
+from .pipelines import TaskPipelineRunner
 from .client import ClientAPI
 from .clerk_user import setup_api as setup_clerk_user_api
 from .user import setup_api as setup_user_api
 from ..states.task import STATE_MAPPINGS
+from ..wrapper.store import task_store_lifespan
+from ..wrapper.executor import process_pool_lifespan
 
 # setting up multiple task APIs with different states
 def setup_state_task_apis(app):
@@ -13,15 +18,28 @@ def setup_state_task_apis(app):
     
     This function creates TaskAPI instances for each state in STATE_MAPPINGS,
     organizing them by state name for better API documentation.
+    Returns the TaskAPI instances by state name.
     """   
+    task_apis = {}
     for state_name, state_info in STATE_MAPPINGS.items():
         # Extract the state class and API prefix
         print(f"Setting up API for state: {state_name} at {state_info['api_prefix']}")
         # Pass state_name to TaskAPI constructor for better route organization
-        TaskAPI(app, state_name, state_info)
+        task_apis[state_name] = TaskAPI(app, state_name, state_info)
+    return task_apis
 
 def setup_api(app: rx.App):
-    setup_state_task_apis(app)
+    task_apis = setup_state_task_apis(app)
+    # One websocket for watching tasks of any state
+    TaskStreamMultiplexer(app, task_apis)
+    # Start tasks declared with schedule= or listed in the schedules AdminConfig row
+    TaskScheduleRunner(app, task_apis)
+    # Pipelines of tasks that pass results to the tasks depending on them
+    TaskPipelineRunner(app, task_apis)
+    # Write batched task records before the backend exits
+    app.register_lifespan_task(task_store_lifespan)
+    # Keep the process pool of executor="process" tasks warm for the app lifetime
+    app.register_lifespan_task(process_pool_lifespan)
     setup_clerk_user_api(app.api_transformer)
     setup_user_api(app.api_transformer)
     
@@ -1,10 +1,12 @@
 import os
+from typing import Dict
 
 # Base command patterns
 HTTP_CMD_PATTERN = {
     "GET": "curl -X GET {base_url}{route}",
     "POST": "curl -X POST -H \"Content-Type: application/json\" {base_url}{route}",
-    "WS": "wscat -c {ws_url}{route}"
+    "WS": "wscat -c {ws_url}{route}",
+    "SSE": "curl -N -H \"Accept: text/event-stream\" {base_url}{route}"
 }
 
 # API Route templates for consistent path definitions that create routes
@@ -15,14 +17,32 @@ API_ROUTES = {
     "status": "/tasks/{client_token}",
     "status_by_id": "/tasks/{client_token}/{task_id}",
     "start": "/tasks/{client_token}/start/{task_name}",
+    "batch": "/tasks/{client_token}/batch",
     "result": "/tasks/{client_token}/result/{task_id}",
+    "cancel": "/tasks/{client_token}/cancel/{task_id}",
     "ws_monitor": "/tasks/{client_token}",
     "ws_task": "/tasks/{client_token}/{task_id}",
     # direct
     "direct_start": "/task/start/{task_name}",
+    "direct_batch": "/task/batch",
     "direct_status": "/task/status/{task_id}",
     "direct_result": "/task/result/{task_id}",
+    "direct_cancel": "/task/cancel/{task_id}",
     "direct_ws": "/task/ws/{task_id}",
+    "direct_events": "/task/events/{task_id}",
+    "direct_stats": "/task/stats",
+    "direct_schemas": "/task/schemas",
+    "direct_schema": "/task/schema/{task_name}",
+    # multiplexed websocket for all states, under the root websocket prefix
+    "ws_multiplex": "{prefix}/tasks",
+    # scheduled runs of all states
+    "schedules": "/api/schedules",
+    # task pipelines across states
+    "pipelines": "/api/pipelines",
+    "pipeline": "/api/pipelines/{pipeline_id}",
+    "pipeline_cancel": "/api/pipelines/{pipeline_id}/cancel",
+    "pipeline_run": "/api/pipelines/run/{name}",
+    "ws_pipeline": "/ws/pipelines/{pipeline_id}",
 }
 
 # Command templates using route patterns for display in MonitorState
@@ -33,15 +53,42 @@ API_COMMANDS = {
     "status_by_id": ("GET", API_ROUTES["status_by_id"]),
     "start": ("POST", API_ROUTES["start"]),
     "result": ("GET", API_ROUTES["result"]),
+    "cancel": ("POST", "{prefix}" + API_ROUTES["cancel"]),
     "ws_all": ("WS", API_ROUTES["ws_monitor"]),
     "ws_task": ("WS", API_ROUTES["ws_task"]),
+    "ws_multiplex": ("WS", API_ROUTES["ws_multiplex"]),
     
     # Standalone commands (without client token)
     "direct_base": "{base_url}" + API_ROUTES["base_direct"],
     "direct_start": ("POST", API_ROUTES["base_direct"]),
     "direct_status": ("GET", API_ROUTES["base_direct"]),
     "direct_result": ("GET", API_ROUTES["base_direct"]),
-    "direct_ws": ("WS", API_ROUTES["base_direct"])
+    "direct_ws": ("WS", API_ROUTES["base_direct"]),
+    # Served under the state's API prefix
+    "direct_cancel": ("POST", "{prefix}" + API_ROUTES["direct_cancel"]),
+    "direct_events": ("SSE", "{prefix}" + API_ROUTES["direct_events"]),
+}
+
+# Root websocket prefix, for the websocket shared by all states (states add their name to it)
+WS_PREFIX = "/ws"
+SHARED_WS_COMMANDS = {"ws_multiplex"}
+
+# Placeholder of the client token in precomputed commands, substituted per session
+CLIENT_TOKEN_PLACEHOLDER = "{client_token}"
+
+# Commands of the task dashboard: name -> (command type, route arguments other than the
+# client token and task name); the task ID and session ID stay placeholders for the user
+DASHBOARD_COMMANDS = {
+    "base_api_path": ("base", {}),
+    "status_command": ("status", {}),
+    "task_status_command": ("status_by_id", {"task_id": "{task_id}"}),
+    "start_command": ("start", {"session_id": "{session_id}"}),
+    "result_command": ("result", {"task_id": "{task_id}"}),
+    "cancel_command": ("cancel", {"task_id": "{task_id}"}),
+    "ws_status_command": ("ws_all", {}),
+    "ws_task_command": ("ws_task", {"task_id": "{task_id}"}),
+    "ws_multiplex_command": ("ws_multiplex", {}),
+    "sse_task_command": ("direct_events", {"task_id": "{task_id}"}),
 }
 
 def get_route(route_type: str, prefix: str = "/api", client_token: str="{client_token}", task_id: str="{task_id}", **kwargs) -> str:
@@ -69,8 +116,10 @@ def format_command(command_type: str, state_info: dict, **kwargs) -> str:
 
     # Format with prefix-specific routing
     prefix = state_info.get("api_prefix", "/api")
-    if command_type.startswith("ws_"):
-        prefix = state_info.get("ws_prefix", "/ws")
+    if command_type in SHARED_WS_COMMANDS:
+        prefix = WS_PREFIX
+    elif command_type.startswith("ws_"):
+        prefix = state_info.get("ws_prefix", WS_PREFIX)
 
     # Special handling for base command
     if command_type == "base":
@@ -87,3 +136,15 @@ def format_command(command_type: str, state_info: dict, **kwargs) -> str:
     }
 
     return HTTP_CMD_PATTERN[method].format(**format_params)
+
+def format_dashboard_commands(state_info: dict, task_name: str = "") -> Dict[str, str]:
+    """
+    Format all dashboard commands of a state and task once, keeping the client token
+    as CLIENT_TOKEN_PLACEHOLDER so a session only has to substitute its own.
+    """
+    return {
+        name: format_command(
+            command_type, state_info, client_token=CLIENT_TOKEN_PLACEHOLDER, task_name=task_name, **kwargs
+        )
+        for name, (command_type, kwargs) in DASHBOARD_COMMANDS.items()
+    }
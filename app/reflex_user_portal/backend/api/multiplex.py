@@ -0,0 +1,132 @@
+"""
+Multiplexed websocket for watching many tasks over one connection.
+
+Clients send JSON messages to add or remove subscriptions, across any task state:
+
+    {"action": "subscribe", "state": "example_task2", "task_id": "fa27f2da"}
+    {"action": "subscribe", "state": "example_task", "client_token": "<token>"}
+    {"action": "unsubscribe", "state": "example_task2", "task_id": "fa27f2da"}
+
+A subscription with only a task_id follows a direct task (optionally from "since");
+one with a client_token follows the tasks of that client session (or one of them
+with task_id). Every frame sent back is a frame of the per-task endpoints plus the
+"subscription" it belongs to. Each subscription is fed by the same push-based frame
+generator as the single-task websockets.
+"""
+import asyncio
+import contextlib
+from typing import Any, Dict, Optional, Tuple
+
+import reflex as rx
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.config import TASK_WS_MAX_SUBSCRIPTIONS
+
+from .commands import WS_PREFIX, get_route
+from .task import TaskAPI
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SubscriptionKey = Tuple[str, Optional[str], Optional[str]]
+
+
+class TaskStreamMultiplexer:
+    """Serve the multiplexed task websocket for all task states."""
+    def __init__(self, app: rx.App, task_apis: Dict[str, TaskAPI]):
+        self.app = app
+        # Task APIs by state name and by the state segment of their routes
+        self.task_apis: Dict[str, TaskAPI] = {}
+        for state_name, task_api in task_apis.items():
+            self.task_apis[state_name] = task_api
+            self.task_apis[task_api.api_base_path.rsplit("/", 1)[-1]] = task_api
+        app.api_transformer.add_api_websocket_route(
+            get_route("ws_multiplex", prefix=WS_PREFIX), self.stream_tasks, name="stream_tasks_multiplexed"
+        )
+
+    @staticmethod
+    def _subscription_key(message: Dict[str, Any]) -> SubscriptionKey:
+        return message.get("state"), message.get("client_token"), message.get("task_id")
+
+    @staticmethod
+    def _describe(key: SubscriptionKey) -> Dict[str, Any]:
+        state, client_token, task_id = key
+        subscription = {"state": state, "task_id": task_id}
+        if client_token is not None:
+            subscription["client_token"] = client_token
+        return subscription
+
+    def _frames(self, key: SubscriptionKey, since: Optional[int]):
+        """Frame generator of a subscription; raises ValueError for invalid ones."""
+        state, client_token, task_id = key
+        task_api = self.task_apis.get(state)
+        if task_api is None:
+            raise ValueError(f"Unknown state '{state}'")
+        if client_token is not None:
+            return task_api._state_task_frames(client_token, task_id)
+        if task_id is None:
+            raise ValueError("A subscription needs a task_id, a client_token or both")
+        return task_api._direct_task_frames(task_id, since)
+
+    async def _forward(self, key: SubscriptionKey, frames, outbox: asyncio.Queue):
+        """Copy the frames of one subscription to the connection's outbox."""
+        subscription = self._describe(key)
+        try:
+            async for frame in frames:
+                await outbox.put({**frame, "subscription": subscription})
+            await outbox.put({"type": "subscription_end", "subscription": subscription})
+        except Exception as e:
+            logger.error(f"Error in multiplexed subscription {subscription}: {str(e)}")
+            await outbox.put({"type": "error", "subscription": subscription, "message": str(e)})
+
+    async def _send_frames(self, websocket: WebSocket, outbox: asyncio.Queue):
+        while True:
+            await websocket.send_json(await outbox.get())
+
+    async def stream_tasks(self, websocket: WebSocket):
+        """WebSocket endpoint interleaving the updates of many task subscriptions."""
+        await websocket.accept()
+        # Bounded, so a slow client holds back its forwarders (whose bus queues overflow into a resync)
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=256)
+        forwarders: Dict[SubscriptionKey, asyncio.Task] = {}
+        sender = asyncio.create_task(self._send_frames(websocket, outbox))
+        try:
+            while True:
+                message = await websocket.receive_json()
+                key = self._subscription_key(message)
+                action = message.get("action")
+                if action == "subscribe":
+                    if key in forwarders and not forwarders[key].done():
+                        continue
+                    if len(forwarders) >= TASK_WS_MAX_SUBSCRIPTIONS:
+                        # Drop finished subscriptions before refusing a new one
+                        forwarders = {k: task for k, task in forwarders.items() if not task.done()}
+                        if len(forwarders) >= TASK_WS_MAX_SUBSCRIPTIONS:
+                            await outbox.put({
+                                "type": "error",
+                                "subscription": self._describe(key),
+                                "message": f"At most {TASK_WS_MAX_SUBSCRIPTIONS} subscriptions per connection",
+                            })
+                            continue
+                    try:
+                        frames = self._frames(key, message.get("since"))
+                    except ValueError as e:
+                        await outbox.put({"type": "error", "subscription": self._describe(key), "message": str(e)})
+                        continue
+                    forwarders[key] = asyncio.create_task(self._forward(key, frames, outbox))
+                elif action == "unsubscribe":
+                    forwarder = forwarders.pop(key, None)
+                    if forwarder is not None:
+                        forwarder.cancel()
+                else:
+                    await outbox.put({"type": "error", "message": f"Unknown action '{action}'"})
+        except WebSocketDisconnect:
+            logger.info("Multiplexed task websocket disconnected")
+        except Exception as e:
+            logger.error(f"Error in multiplexed task websocket: {str(e)}")
+            with contextlib.suppress(Exception):
+                await websocket.close()
+        finally:
+            for forwarder in forwarders.values():
+                forwarder.cancel()
+            sender.cancel()
@@ -0,0 +1,429 @@
+"""
+Task pipelines: DAGs of direct tasks that pass results downstream.
+
+A pipeline is posted to `/api/pipelines` (or kept under a name in the AdminConfig row
+TASK_PIPELINE_CONFIG_NAME and started with `/api/pipelines/run/<name>`):
+
+    {"state": "example_task2", "nodes": [
+        {"id": "load", "task": "task1"},
+        {"id": "report", "task": "task2_with_args", "depends_on": ["load"],
+         "parameters": {"age": 25}, "inputs": {"name": "load"}}]}
+
+A node starts as soon as all the nodes it depends on have completed, so independent
+branches run concurrently (within the task scheduler's limits). Its `task_args` are
+built from the dict results of its dependencies, overridden by its own `parameters`,
+overridden by its `inputs` (argument name -> "<node>" or "<node>.<key>" of a result).
+When a node fails, the nodes downstream of it are skipped and the pipeline ends with
+an error once the other branches are done.
+
+Progress of the pipeline and each node is served by `GET /api/pipelines/<id>` and
+streamed by `/ws/pipelines/<id>`; every node is also an ordinary direct task that
+the per-task endpoints can follow.
+"""
+import asyncio
+import contextlib
+import datetime
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import reflex as rx
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
+
+from app.config import TASK_PIPELINE_CONFIG_NAME, TASK_PIPELINE_MAX_SIZE
+from app.models.admin.admin_config import AdminConfig
+
+from .commands import get_route
+from .task import TaskAPI
+from ..wrapper.events import task_event_bus, direct_topic, pipeline_topic, next_events
+from ..wrapper.ids import new_task_id
+from ..wrapper.models import TaskStatus, is_terminal_status
+from ..wrapper.scheduler import PRIORITIES
+from ...utils.error_handler import TaskError
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Status of a node that didn't run because a node it depends on didn't complete
+NODE_SKIPPED = "Skipped"
+# Seconds between registry checks of a running node, in case an update was missed
+NODE_POLL_SECONDS = 5.0
+
+
+class PipelineNode(BaseModel):
+    """One task of a pipeline."""
+    id: str
+    task: str
+    # State of the task (route name or class name); defaults to the pipeline's state
+    state: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    depends_on: List[str] = []
+    # Task argument -> "<node>" (its whole result) or "<node>.<key>" (one key of it)
+    inputs: Dict[str, str] = {}
+
+
+class PipelineRequest(BaseModel):
+    """Request body of the pipeline endpoint."""
+    name: Optional[str] = None
+    state: Optional[str] = None
+    nodes: List[PipelineNode]
+    # Scheduler lane of the pipeline's tasks
+    priority: str = "normal"
+
+
+@dataclass
+class NodeRun:
+    """Run state of a pipeline node."""
+    node: PipelineNode
+    task_api: TaskAPI
+    # Declared dependencies plus the nodes its inputs are read from
+    depends_on: List[str] = field(default_factory=list)
+    status: str = TaskStatus.PENDING
+    task_id: Optional[str] = None
+    progress: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.node.id,
+            "state": self.task_api.state_name,
+            "task_name": self.node.task,
+            "depends_on": self.depends_on,
+            "task_id": self.task_id,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+        }
+        if self.status == TaskStatus.COMPLETED:
+            data["result"] = self.result
+        return data
+
+
+@dataclass
+class PipelineRun:
+    """A submitted pipeline and the run state of its nodes (in topological order)."""
+    pipeline_id: str
+    name: Optional[str]
+    priority: str
+    nodes: Dict[str, NodeRun]
+    status: str = TaskStatus.PENDING
+    # Why a failed pipeline ended with TaskStatus.ERROR
+    error: Optional[str] = None
+    cancelled: bool = False
+    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+    finished_at: Optional[datetime.datetime] = None
+    handle: Optional[asyncio.Task] = None
+
+    @property
+    def progress(self) -> int:
+        """Mean progress of the nodes (finished nodes count as 100)."""
+        if not self.nodes:
+            return 100
+        total = sum(
+            100 if run.status == NODE_SKIPPED or is_terminal_status(run.status) else run.progress
+            for run in self.nodes.values()
+        )
+        return total // len(self.nodes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pipeline_id": self.pipeline_id,
+            "name": self.name,
+            "status": self.status,
+            "error": self.error,
+            "progress": self.progress,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "nodes": [run.to_dict() for run in self.nodes.values()],
+        }
+
+
+def _node_dependencies(node: PipelineNode) -> List[str]:
+    """Declared dependencies of a node plus the nodes its inputs are read from."""
+    dependencies = list(node.depends_on)
+    for source in node.inputs.values():
+        source_id = source.partition(".")[0]
+        if source_id not in dependencies:
+            dependencies.append(source_id)
+    return dependencies
+
+
+def _topological_order(nodes: List[PipelineNode], dependencies: Dict[str, List[str]]) -> List[PipelineNode]:
+    """Order nodes so every node follows its dependencies (node ID -> node IDs).
+
+    Raises:
+        ValueError: If node IDs repeat, a dependency is unknown or the nodes form a cycle.
+    """
+    by_id: Dict[str, PipelineNode] = {}
+    for node in nodes:
+        if node.id in by_id:
+            raise ValueError(f"Duplicate node id '{node.id}'")
+        by_id[node.id] = node
+    waiting = {node.id: set(dependencies[node.id]) for node in nodes}
+    for node_id, depends_on in waiting.items():
+        unknown = depends_on - by_id.keys()
+        if unknown:
+            raise ValueError(f"Node '{node_id}' depends on unknown nodes {sorted(unknown)}")
+    ordered = []
+    ready = [node.id for node in nodes if not waiting[node.id]]
+    while ready:
+        node_id = ready.pop(0)
+        ordered.append(by_id[node_id])
+        for other_id, depends_on in waiting.items():
+            if node_id in depends_on:
+                depends_on.discard(node_id)
+                if not depends_on:
+                    ready.append(other_id)
+    if len(ordered) != len(nodes):
+        cyclic = sorted(node_id for node_id, depends_on in waiting.items() if depends_on)
+        raise ValueError(f"Pipeline has a dependency cycle between nodes {cyclic}")
+    return ordered
+
+
+def _resolve_input(source: str, nodes: Dict[str, NodeRun]) -> Any:
+    """Value of an input reference "<node>" or "<node>.<key>[.<key>...]"."""
+    node_id, _, path = source.partition(".")
+    value = nodes[node_id].result
+    for key in filter(None, path.split(".")):
+        if not isinstance(value, dict) or key not in value:
+            raise ValueError(f"Result of node '{node_id}' has no key '{path}'")
+        value = value[key]
+    return value
+
+
+class TaskPipelineRunner:
+    """Run task pipelines over the direct-execution path of all task states."""
+    def __init__(self, app: rx.App, task_apis: Dict[str, TaskAPI]):
+        self.app = app
+        # Task APIs by state name and by the state segment of their routes
+        self.task_apis: Dict[str, TaskAPI] = {}
+        for state_name, task_api in task_apis.items():
+            self.task_apis[state_name] = task_api
+            self.task_apis[task_api.api_base_path.rsplit("/", 1)[-1]] = task_api
+        # Pipelines by ID in submission order; the oldest finished ones are dropped first
+        self.pipelines: "OrderedDict[str, PipelineRun]" = OrderedDict()
+        self.setup_routes()
+
+    def _build(self, request: PipelineRequest) -> PipelineRun:
+        """Validate a pipeline definition and create its run.
+
+        Raises:
+            ValueError: If the definition is invalid.
+            TaskError: If a node without dependencies has invalid parameters.
+        """
+        if request.priority not in PRIORITIES:
+            raise ValueError(f"Invalid priority '{request.priority}'. Available priorities: {list(PRIORITIES)}")
+        if not request.nodes:
+            raise ValueError("A pipeline needs at least one node")
+        # Nodes an input is read from are dependencies too (the request itself is left as it is)
+        dependencies = {node.id: _node_dependencies(node) for node in request.nodes}
+        runs = {}
+        for node in _topological_order(request.nodes, dependencies):
+            state = node.state or request.state
+            task_api = self.task_apis.get(state) if state else None
+            if task_api is None:
+                raise ValueError(f"Node '{node.id}' needs a known state, got '{state}'")
+            spec = task_api.task_specs.get(node.task)
+            if spec is None or not spec.direct:
+                raise ValueError(f"Node '{node.id}': '{node.task}' is not a static-method task of {task_api.state_name}")
+            if not dependencies[node.id]:
+                # Parameters of later nodes are only known once their inputs are
+                task_api._prepare_direct_task(node.task, node.parameters)
+            runs[node.id] = NodeRun(node, task_api, depends_on=dependencies[node.id])
+        return PipelineRun(new_task_id(), request.name, request.priority, runs)
+
+    def _publish(self, pipeline: PipelineRun):
+        task_event_bus.publish(pipeline_topic(pipeline.pipeline_id), {"pipeline_id": pipeline.pipeline_id})
+
+    def _node_parameters(self, pipeline: PipelineRun, node_run: NodeRun) -> Dict[str, Any]:
+        node = node_run.node
+        parameters: Dict[str, Any] = {}
+        for dependency in node_run.depends_on:
+            result = pipeline.nodes[dependency].result
+            if isinstance(result, dict):
+                parameters.update(result)
+        parameters.update(node.parameters or {})
+        for argument, source in node.inputs.items():
+            parameters[argument] = _resolve_input(source, pipeline.nodes)
+        return parameters
+
+    def _refresh_node(self, node_run: NodeRun) -> bool:
+        """Copy the node task's status from its registry. Returns True once it finished."""
+        task_info = node_run.task_api._get_direct_task_info(node_run.task_id)
+        if task_info is None:
+            node_run.status = TaskStatus.ERROR
+            node_run.error = f"Task {node_run.task_id} is no longer known"
+            return True
+        node_run.status = task_info["status"]
+        node_run.progress = task_info["progress"]
+        node_run.result = task_info["result"]
+        node_run.error = task_info.get("error")
+        return is_terminal_status(node_run.status)
+
+    async def _run_node(self, pipeline: PipelineRun, node_run: NodeRun):
+        node = node_run.node
+        try:
+            dependencies = [pipeline.nodes[dependency] for dependency in node_run.depends_on]
+            for dependency in dependencies:
+                await dependency.done.wait()
+            failed = [dependency.node.id for dependency in dependencies if dependency.status != TaskStatus.COMPLETED]
+            if pipeline.cancelled:
+                node_run.status = TaskStatus.CANCELLED
+                return
+            if failed:
+                node_run.status = NODE_SKIPPED
+                node_run.error = f"Upstream nodes {failed} did not complete"
+                return
+
+            task_api = node_run.task_api
+            try:
+                parameters = self._node_parameters(pipeline, node_run)
+                task_method, validated_params = task_api._prepare_direct_task(node.task, parameters)
+                node_run.task_id = task_api._submit_direct_task(
+                    node.task, task_method, validated_params, pipeline.priority
+                )
+            except (TaskError, ValueError) as e:
+                node_run.status = TaskStatus.ERROR
+                node_run.error = e.message if isinstance(e, TaskError) else str(e)
+                return
+
+            # The scheduler starts the task on a later loop iteration, so no update is missed
+            with task_event_bus.subscribe(direct_topic(task_api.state_name, node_run.task_id)) as queue:
+                while not self._refresh_node(node_run):
+                    self._publish(pipeline)
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(next_events(queue), NODE_POLL_SECONDS)
+        finally:
+            node_run.done.set()
+            self._publish(pipeline)
+
+    async def _run(self, pipeline: PipelineRun):
+        pipeline.status = TaskStatus.PROCESSING
+        self._publish(pipeline)
+        await asyncio.gather(*(self._run_node(pipeline, run) for run in pipeline.nodes.values()))
+        statuses = {run.status for run in pipeline.nodes.values()}
+        if pipeline.cancelled:
+            pipeline.status = TaskStatus.CANCELLED
+        elif statuses == {TaskStatus.COMPLETED}:
+            pipeline.status = TaskStatus.COMPLETED
+        else:
+            failed = [run.node.id for run in pipeline.nodes.values() if run.status not in (TaskStatus.COMPLETED, NODE_SKIPPED)]
+            pipeline.status = TaskStatus.ERROR
+            pipeline.error = f"Nodes {failed} failed"
+        pipeline.finished_at = datetime.datetime.now()
+        logger.info(f"Pipeline {pipeline.pipeline_id} finished with status {pipeline.status}")
+        self._publish(pipeline)
+
+    def _start(self, request: PipelineRequest) -> Dict[str, Any]:
+        try:
+            pipeline = self._build(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except TaskError as e:
+            raise HTTPException(status_code=e.code, detail=e.message)
+        self.pipelines[pipeline.pipeline_id] = pipeline
+        while len(self.pipelines) > TASK_PIPELINE_MAX_SIZE:
+            oldest_id = next(
+                (pipeline_id for pipeline_id, run in self.pipelines.items() if run.finished_at is not None), None
+            )
+            if oldest_id is None:
+                break
+            del self.pipelines[oldest_id]
+        pipeline.handle = asyncio.create_task(self._run(pipeline))
+        logger.info(f"Started pipeline {pipeline.pipeline_id} with {len(pipeline.nodes)} nodes")
+        return {"pipeline_id": pipeline.pipeline_id, "nodes": list(pipeline.nodes)}
+
+    async def start_pipeline(self, request: PipelineRequest):
+        """Start a pipeline of tasks whose results feed the tasks that depend on them."""
+        return self._start(request)
+
+    @staticmethod
+    def _read_pipeline_config(name: str) -> Optional[Dict[str, Any]]:
+        with rx.session() as session:
+            config = session.exec(
+                AdminConfig.select().where(AdminConfig.name == TASK_PIPELINE_CONFIG_NAME)
+            ).first()
+            if config is None:
+                return None
+            return (config.configuration or {}).get("pipelines", {}).get(name)
+
+    async def run_named_pipeline(self, name: str):
+        """Start a pipeline defined in the pipelines AdminConfig row."""
+        definition = await asyncio.to_thread(self._read_pipeline_config, name)
+        if definition is None:
+            raise HTTPException(status_code=404, detail=f"Pipeline {name} not found in '{TASK_PIPELINE_CONFIG_NAME}'")
+        try:
+            request = PipelineRequest(**{"name": name, **definition})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid pipeline {name}: {str(e)}")
+        return self._start(request)
+
+    def _get(self, pipeline_id: str) -> PipelineRun:
+        pipeline = self.pipelines.get(pipeline_id)
+        if pipeline is None:
+            raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
+        return pipeline
+
+    async def get_pipeline(self, pipeline_id: str):
+        """Get the status and progress of a pipeline and each of its nodes."""
+        return self._get(pipeline_id).to_dict()
+
+    async def cancel_pipeline(self, pipeline_id: str):
+        """Cancel the running tasks of a pipeline; nodes that haven't started won't."""
+        pipeline = self._get(pipeline_id)
+        if pipeline.finished_at is not None:
+            raise HTTPException(status_code=409, detail=f"Pipeline {pipeline_id} already finished")
+        pipeline.cancelled = True
+        for node_run in pipeline.nodes.values():
+            if node_run.task_id is not None and not is_terminal_status(node_run.status):
+                with contextlib.suppress(HTTPException):
+                    await node_run.task_api.cancel_direct_task(node_run.task_id)
+        return {"pipeline_id": pipeline_id, "status": TaskStatus.CANCELLED}
+
+    async def stream_pipeline(self, websocket: WebSocket, pipeline_id: str):
+        """WebSocket endpoint sending the pipeline status each time one of its nodes changes."""
+        await websocket.accept()
+        pipeline = self.pipelines.get(pipeline_id)
+        if pipeline is None:
+            await websocket.send_json({"type": "error", "message": f"Pipeline {pipeline_id} not found"})
+            await websocket.close()
+            return
+        try:
+            with task_event_bus.subscribe(pipeline_topic(pipeline_id)) as queue:
+                while True:
+                    await websocket.send_json({"type": "pipeline_update", "data": pipeline.to_dict()})
+                    if pipeline.finished_at is not None:
+                        break
+                    await next_events(queue)
+            await websocket.close()
+        except WebSocketDisconnect:
+            logger.info(f"Pipeline websocket disconnected for {pipeline_id}")
+        except Exception as e:
+            logger.error(f"Error in pipeline websocket: {str(e)}")
+            with contextlib.suppress(Exception):
+                await websocket.close()
+
+    def setup_routes(self):
+        api = self.app.api_transformer
+        api.add_api_route(
+            get_route("pipelines"), self.start_pipeline, methods=["POST"],
+            description="Start a pipeline of tasks",
+        )
+        api.add_api_route(
+            get_route("pipeline_run", name="{name}"), self.run_named_pipeline, methods=["POST"],
+            description=f"Start a pipeline defined in the '{TASK_PIPELINE_CONFIG_NAME}' AdminConfig",
+        )
+        api.add_api_route(
+            get_route("pipeline", pipeline_id="{pipeline_id}"), self.get_pipeline, methods=["GET"],
+            description="Get the progress of a pipeline and its nodes",
+        )
+        api.add_api_route(
+            get_route("pipeline_cancel", pipeline_id="{pipeline_id}"), self.cancel_pipeline, methods=["POST"],
+            description="Cancel a pipeline",
+        )
+        api.add_api_websocket_route(
+            get_route("ws_pipeline", pipeline_id="{pipeline_id}"), self.stream_pipeline, name="stream_pipeline",
+        )
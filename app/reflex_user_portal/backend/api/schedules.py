@@ -0,0 +1,276 @@
+"""
+Cron-style runner of scheduled tasks.
+
+Schedules come from two places:
+
+* static-method tasks declared with `@monitored_background_task(schedule="<cron>")`
+* the AdminConfig row named TASK_SCHEDULE_CONFIG_NAME, reloaded every
+  TASK_SCHEDULE_RELOAD_SECONDS:
+
+      {"schedules": [{"name": "refresh", "state": "example_task2", "task": "task1",
+                      "cron": "*/15 * * * *", "parameters": {}, "priority": "low"}]}
+
+Due tasks are started through the direct-execution path of their state's TaskAPI, so
+they are queued on the task scheduler and tracked like any direct task. A schedule
+whose previous run hasn't finished skips its turn instead of overlapping it. Each run
+records when it was due, when it was submitted and when its body actually started.
+Cron expressions are evaluated in UTC.
+"""
+import asyncio
+import contextlib
+import datetime
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+import reflex as rx
+
+from app.config import TASK_SCHEDULER_ENABLED, TASK_SCHEDULE_CONFIG_NAME, TASK_SCHEDULE_RELOAD_SECONDS
+from app.models.admin.admin_config import AdminConfig
+
+from .commands import get_route
+from .task import TaskAPI
+from ..wrapper.cron import CronExpression
+from ..wrapper.models import is_terminal_status
+from ...utils.error_handler import TaskError
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Runs remembered per schedule
+RUN_HISTORY_SIZE = 20
+# Longest sleep of the runner loop, so clock jumps are noticed
+MAX_SLEEP_SECONDS = 60.0
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+@dataclass
+class TaskSchedule:
+    """A task started whenever its cron expression is due."""
+    name: str
+    task_api: TaskAPI
+    task_name: str
+    cron: CronExpression
+    parameters: Optional[Dict[str, Any]] = None
+    priority: str = "normal"
+    source: str = "decorator"
+    next_due: Optional[datetime.datetime] = None
+    last_task_id: Optional[str] = None
+    skipped: int = 0
+    runs: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=RUN_HISTORY_SIZE))
+
+    def same_as(self, other: "TaskSchedule") -> bool:
+        return (
+            self.task_api is other.task_api
+            and self.task_name == other.task_name
+            and self.cron == other.cron
+            and self.parameters == other.parameters
+            and self.priority == other.priority
+        )
+
+
+class TaskScheduleRunner:
+    """Start scheduled tasks of all task states when they are due."""
+    def __init__(self, app: rx.App, task_apis: Dict[str, TaskAPI]):
+        self.app = app
+        # Task APIs by state name and by the state segment of their routes
+        self.task_apis: Dict[str, TaskAPI] = {}
+        for state_name, task_api in task_apis.items():
+            self.task_apis[state_name] = task_api
+            self.task_apis[task_api.api_base_path.rsplit("/", 1)[-1]] = task_api
+        self.schedules: Dict[str, TaskSchedule] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        app.api_transformer.add_api_route(
+            get_route("schedules"), self.get_schedules, methods=["GET"],
+            description="Get the scheduled tasks, when they are next due and their recent runs",
+        )
+        app.register_lifespan_task(self.lifespan)
+
+    def _decorator_schedules(self) -> List[TaskSchedule]:
+        schedules = []
+        for state_name, task_api in self.task_apis.items():
+            if state_name != task_api.state_name:
+                continue
+            for task_name, spec in task_api.task_specs.items():
+                if spec.schedule is None:
+                    continue
+                # Only static methods can run without a client session
+                if not spec.direct:
+                    logger.warning(f"Ignoring schedule of {state_name}.{task_name}: only static-method tasks can be scheduled")
+                    continue
+                schedules.append(TaskSchedule(f"{state_name}.{task_name}", task_api, task_name, spec.schedule))
+        return schedules
+
+    @staticmethod
+    def _read_admin_config() -> List[Dict[str, Any]]:
+        with rx.session() as session:
+            config = session.exec(
+                AdminConfig.select().where(AdminConfig.name == TASK_SCHEDULE_CONFIG_NAME)
+            ).first()
+            return list((config.configuration or {}).get("schedules", [])) if config else []
+
+    def _config_schedule(self, index: int, entry: Dict[str, Any]) -> TaskSchedule:
+        """Build a schedule from an AdminConfig entry.
+
+        Raises:
+            ValueError: If the entry is incomplete or names an unknown state or task.
+        """
+        state, task_name, expression = entry.get("state"), entry.get("task"), entry.get("cron")
+        if not (state and task_name and expression):
+            raise ValueError("needs 'state', 'task' and 'cron'")
+        task_api = self.task_apis.get(state)
+        if task_api is None:
+            raise ValueError(f"unknown state '{state}'")
+        spec = task_api.task_specs.get(task_name)
+        if spec is None or not spec.direct:
+            raise ValueError(f"'{task_name}' is not a static-method task of {state}")
+        return TaskSchedule(
+            name=entry.get("name") or f"{task_api.state_name}.{task_name}#{index}",
+            task_api=task_api,
+            task_name=task_name,
+            cron=CronExpression.parse(expression),
+            parameters=entry.get("parameters"),
+            priority=entry.get("priority", "normal"),
+            source="admin_config",
+        )
+
+    async def reload(self):
+        """Rebuild the schedules, keeping the run state of those that didn't change."""
+        schedules = self._decorator_schedules()
+        try:
+            entries = await asyncio.to_thread(self._read_admin_config)
+        except Exception as e:
+            logger.warning(f"Could not read the '{TASK_SCHEDULE_CONFIG_NAME}' AdminConfig: {str(e)}")
+            # Keep the schedules read from it before
+            entries = None
+            schedules.extend(s for s in self.schedules.values() if s.source == "admin_config")
+        for index, entry in enumerate(entries or []):
+            if not entry.get("enabled", True):
+                continue
+            try:
+                schedules.append(self._config_schedule(index, entry))
+            except ValueError as e:
+                logger.error(f"Invalid schedule #{index} in '{TASK_SCHEDULE_CONFIG_NAME}': {str(e)}")
+
+        now = _utcnow()
+        updated = {}
+        for schedule in schedules:
+            current = self.schedules.get(schedule.name)
+            if current is not None and current.same_as(schedule):
+                schedule = current
+            else:
+                schedule.next_due = schedule.cron.next_after(now)
+            updated[schedule.name] = schedule
+        self.schedules = updated
+
+    def _previous_run_active(self, schedule: TaskSchedule) -> Optional[str]:
+        """Status of the schedule's previous run if it hasn't finished yet."""
+        if schedule.last_task_id is None:
+            return None
+        task_info = schedule.task_api._get_direct_task_info(schedule.last_task_id)
+        if task_info is None or is_terminal_status(task_info["status"]):
+            return None
+        return task_info["status"]
+
+    def _trigger(self, schedule: TaskSchedule, due: datetime.datetime):
+        """Start a due run of a schedule, or record why it didn't start."""
+        run: Dict[str, Any] = {"due_at": due.isoformat()}
+        active_status = self._previous_run_active(schedule)
+        if active_status is not None:
+            schedule.skipped += 1
+            run["skipped"] = f"Previous run {schedule.last_task_id} is still {active_status}"
+            logger.warning(f"Skipping run of schedule {schedule.name}: {run['skipped']}")
+            schedule.runs.append(run)
+            return
+        task_api = schedule.task_api
+        try:
+            task_method, validated_params = task_api._prepare_direct_task(schedule.task_name, schedule.parameters)
+            task_id = task_api._submit_direct_task(
+                schedule.task_name, task_method, validated_params,
+                priority=schedule.priority, due_at=due.timestamp(),
+            )
+        except (TaskError, ValueError) as e:
+            message = e.message if isinstance(e, TaskError) else str(e)
+            logger.error(f"Could not start scheduled run of {schedule.name}: {message}")
+            run["error"] = message
+            schedule.runs.append(run)
+            return
+        schedule.last_task_id = task_id
+        run.update(task_id=task_id, submitted_at=_utcnow().isoformat())
+        schedule.runs.append(run)
+        logger.info(f"Started scheduled run {task_id} of {schedule.name} (due {run['due_at']})")
+
+    def run_due(self, now: datetime.datetime):
+        """Start every schedule that is due at now; missed turns collapse into one run."""
+        for schedule in self.schedules.values():
+            if schedule.next_due is not None and schedule.next_due <= now:
+                self._trigger(schedule, schedule.next_due)
+                schedule.next_due = schedule.cron.next_after(now)
+
+    async def _run_loop(self):
+        next_reload = _utcnow()
+        while True:
+            try:
+                now = _utcnow()
+                if now >= next_reload:
+                    await self.reload()
+                    next_reload = now + datetime.timedelta(seconds=TASK_SCHEDULE_RELOAD_SECONDS)
+                self.run_due(now)
+                wake = min([s.next_due for s in self.schedules.values() if s.next_due] + [next_reload])
+                delay = (wake - _utcnow()).total_seconds()
+            except Exception as e:
+                logger.error(f"Error in task schedule runner: {str(e)}")
+                delay = MAX_SLEEP_SECONDS
+            await asyncio.sleep(min(max(delay, 0.05), MAX_SLEEP_SECONDS))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """App lifespan task that runs the schedules while the backend runs."""
+        if TASK_SCHEDULER_ENABLED:
+            self._loop_task = asyncio.create_task(self._run_loop())
+        try:
+            yield
+        finally:
+            if self._loop_task is not None:
+                self._loop_task.cancel()
+                self._loop_task = None
+
+    def _describe_run(self, schedule: TaskSchedule, run: Dict[str, Any]) -> Dict[str, Any]:
+        """A run with the start time and status of its task, while the task is still known."""
+        run = dict(run)
+        task_id = run.get("task_id")
+        if task_id is None:
+            return run
+        task_info = schedule.task_api._get_direct_task_info(task_id)
+        if task_info is not None:
+            run["status"] = task_info["status"]
+        task_context = schedule.task_api.registry.get_context(task_id)
+        if task_context is not None and task_context.started_at is not None:
+            run["started_at"] = datetime.datetime.fromtimestamp(
+                task_context.started_at, datetime.timezone.utc
+            ).isoformat()
+            run["start_delay"] = round(task_context.started_at - task_context.due_at, 3)
+        return run
+
+    async def get_schedules(self):
+        """Get the scheduled tasks, when they are next due and their recent runs."""
+        return {
+            "enabled": TASK_SCHEDULER_ENABLED,
+            "schedules": [
+                {
+                    "name": schedule.name,
+                    "state": schedule.task_api.state_name,
+                    "task_name": schedule.task_name,
+                    "cron": str(schedule.cron),
+                    "source": schedule.source,
+                    "priority": schedule.priority,
+                    "next_due": schedule.next_due.isoformat() if schedule.next_due else None,
+                    "skipped": schedule.skipped,
+                    "runs": [self._describe_run(schedule, run) for run in schedule.runs],
+                }
+                for schedule in self.schedules.values()
+            ],
+        }
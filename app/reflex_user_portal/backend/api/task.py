@@ -1,25 +1,66 @@
 # Import necessary modules and classes
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, APIRouter, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, APIRouter, HTTPException, Request, Header
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from typing import Optional, Any, Dict
 import asyncio
 import inspect
+import json
 import logging
 import re
-import uuid
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, ValidationError, create_model
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel
 import reflex as rx
+from reflex.state import _substate_key
 from .commands import get_route
+from app.config import (
+    TASK_REGISTRY_MAX_SIZE, TASK_REGISTRY_TTL_SECONDS, TASK_ARCHIVE_MAX_SIZE,
+    TASK_STORE_POLL_INTERVAL_SECONDS,
+)
 from ...utils.logger import get_logger
 from ...utils.error_handler import (
-    TaskError, TaskNotFoundError, InvalidParametersError, create_error_response
+    TaskError, TaskNotFoundError, InvalidParametersError, TaskQueueFullError, TaskTimeoutError,
+    create_error_response,
 )
 
-from ..wrapper.models import TaskStatus, TaskData
+from ..wrapper.models import TaskStatus, TaskData, is_terminal_status, hash_task_args, task_update_stats
+from ..wrapper.store import task_store
+from ..wrapper.scheduler import task_scheduler, PRIORITIES
+from ..wrapper.executor import call_task_function, run_with_timeout
+from ..wrapper.retry import call_with_retry
+from ..wrapper.usage import run_metered, task_usage_stats
+from ..wrapper.task import cancel_state_task, get_state_task_context
+from ..wrapper.registry import TaskRegistry
+from ..wrapper.ids import new_task_id, task_worker, is_local_task, current_worker
+from ..wrapper.status_cache import task_status_cache
+from ..wrapper.delta import TaskDeltaEncoder
+from ..wrapper.idempotency import task_idempotency_cache
+from ..wrapper.validators import EmptyParams, task_validators
+from ..wrapper.catalog import task_catalog
+from ..wrapper.events import task_event_bus, state_topic, direct_topic, next_events, OVERFLOW
 
 logger = get_logger(__name__)
 
+
+class BatchTaskItem(BaseModel):
+    """One task of a batch submission."""
+    task_name: str
+    parameters: Optional[Dict[str, Any]] = None
+
+
+class BatchTaskRequest(BaseModel):
+    """Request body of the batch task endpoints."""
+    tasks: List[BatchTaskItem]
+    # Scheduler lane for direct tasks (ignored for client-event tasks)
+    priority: str = "normal"
+
+
+def _batch_error(index: int, item: BatchTaskItem, error: TaskError) -> Dict[str, Any]:
+    """Per-item error entry of a batch response."""
+    return {"index": index, "task_name": item.task_name, "error": create_error_response(error)}
+
+
 class TaskAPI:
     """
     Class response for setting up API endpoints for task management.
@@ -46,121 +87,375 @@ class TaskAPI:
             prefix=f"{self.api_base_path}", 
             tags=[f"Direct Task API - {state_name}"]
         )
-        # Store active tasks with their status, progress, result, and error
-        self.active_tasks = {}
+        # Store direct tasks (status, progress, result, error) with their task contexts
+        # (includes history with timestamps); finished tasks are evicted to an archive
+        self.registry = TaskRegistry(
+            max_size=TASK_REGISTRY_MAX_SIZE,
+            ttl=TASK_REGISTRY_TTL_SECONDS,
+            archive_size=TASK_ARCHIVE_MAX_SIZE,
+        )
         
-        # Store task contexts for each task (includes history with timestamps)
-        self.task_contexts = {}
+        # Monitored tasks of the state (input models, defaults, executor settings),
+        # introspected once when the task states were discovered
+        self.task_specs = task_catalog.get(self.state_cls)
         
         self.setup_routes()
         # Register routers with the app instance at init
         self.register_routers(app.api_transformer)
 
-    def _get_input_params(self, task_method, parameters: Dict[str, Any], input_arg_name: str = "task_args") -> BaseModel:
+    def _get_input_params(self, task_name: str, task_method, parameters: Optional[Dict[str, Any]]) -> BaseModel:
         """
-        Get and validate input parameters against the input model if it exists.
-        Find the argument name `input_arg_name` in the task method signature.
-        If the argument is found, validate the parameters against the model type.
+        Validate input parameters against the task's input model, if it has one.
+        The model (annotation of the task's `task_args` argument) is resolved once per
+        task and kept in the task catalog (or, for other event handlers, the validator registry).
         """
-        
-        # Get the actual function from EventHandler
-        if hasattr(task_method, 'fn'):
-            task_method = task_method.fn
-            
-        sig = inspect.signature(task_method)
-        logger.debug(f"Method signature: {sig}. Parameters: {sig.parameters}")
-        # 'task' is essential for wrapper to pass 'TaskContext' and must be excluded here for non-detection
-        EXCLUDE_PARAM = ["self", "task", "kwargs"]  
-        params = [p for p in sig.parameters.values() if p.name not in EXCLUDE_PARAM]
-        logger.debug(f"Parameters: {params}")
-        for param in params:
-            logger.debug(f"Checking parameter: {param.name}")
-            # Check both task_args and args since Reflex may use either
-            if param.name == input_arg_name:
-                model_type = param.annotation
-                logger.debug(f"Found matching parameter '{param.name}' with type: {model_type}")
-                
-                if not parameters:
-                    raise ValueError(f"Parameters are required for input model '{param.name}' but none were provided.")
-                
-                if model_type:
-                    try:
-                        validated = model_type(**parameters)
-                        logger.debug(f"Successfully validated parameters: {validated}")
-                        return validated
-                    except ValidationError as e:
-                        raise ValueError(f"Invalid parameters for input model: {str(e)}")
-        logger.debug(f"No matching parameter found for '{input_arg_name}' Available parameters: {params}")
-        return create_model('EmptyModel', __base__=BaseModel)()
+        spec = self.task_specs.get(task_name)
+        if spec is not None:
+            return spec.validator.validate(parameters)
+        return task_validators.get(self.state_cls, task_name, task_method).validate(parameters)
 
-    
-    async def start_task(
-            self, client_token: str, task_name: str, parameters: Dict[str, Any] = Body(default=None)
-        ):
-        """
-        Start a background task by invoking the task method through a client event.
-        Such tasks are not directly accessible from the client and are used for background processing.
+    def _prepare_state_task(self, task_name: str, parameters: Optional[Dict[str, Any]]) -> Tuple[Any, BaseModel]:
+        """Resolve a task method of the state class and validate its parameters.
+
+        Raises:
+            TaskNotFoundError: If the state class has no such task.
+            InvalidParametersError: If the parameters don't match the task's input model.
         """
-        # Get the task method from the state class
         task_method = getattr(self.state_cls, task_name, None)
         if not task_method:
             logger.error(f"Task method {task_name} not found in {self.state_cls.__name__}")
-            return create_error_response(TaskNotFoundError(task_name))
-            
-        logger.debug(f"Starting task {task_name} with parameters: {parameters}")
-        task_id = str(uuid.uuid4())[:8]
-        
-        # Validate parameters
+            raise TaskNotFoundError(task_name)
+
         try:
-            validated_params: BaseModel = self._get_input_params(task_method, parameters)
+            validated_params: BaseModel = self._get_input_params(task_name, task_method, parameters)
         except ValueError as e:
             logger.error(f"Parameter validation error: {str(e)}")
-            return create_error_response(InvalidParametersError(str(e)))
-        logger.debug(f"Validated parameters: {validated_params}")
-        # Get state and set up task arguments
+            raise InvalidParametersError(str(e))
+        return task_method, validated_params
+
+    async def _emit_state_tasks(self, client_token: str, tasks: List[Tuple[str, str, Any, BaseModel]]):
+        """Queue the arguments of (task_id, task_name, task_method, params) entries in the
+        client's state and trigger all their events in a single update."""
         async with self.app.state_manager.modify_state(client_token) as state_manager:
-            logger.debug(f"Starting task {task_name} ")
             monitor_state = await state_manager.get_state(self.state_cls)
-            # parse pydantic model back as dict
-            monitor_state.tasks_argument = {task_id: validated_params.model_dump()}
+            for task_id, task_name, _, validated_params in tasks:
+                # parse pydantic model back as dict
+                monitor_state.tasks_argument[task_id] = {
+                    "task_name": task_name,
+                    "task_args": validated_params.model_dump(),
+                    "queued_at": time.time(),
+                }
             await self.app.event_namespace.emit_update(
                 update=rx.state.StateUpdate(
                     events=rx.event.fix_events(
-                        [task_method], token=monitor_state.client_token
+                        [task_method for _, _, task_method, _ in tasks], token=monitor_state.client_token
                     ),
                 ),
                 sid=monitor_state.session_id,
             )
+    
+    def _dedup_keys(self, scope: Tuple, task_name: str, task_method, validated_params: BaseModel,
+                    idempotency_key: Optional[str]) -> Tuple[Optional[Tuple], Optional[Tuple], Optional[str]]:
+        """Idempotency cache keys of a submission: (request key, memoization key, params hash)."""
+        params_hash = hash_task_args(validated_params)
+        request_key = task_idempotency_cache.request_key(scope, idempotency_key) if idempotency_key else None
+        args_key = None
+        spec = self.task_specs.get(task_name)
+        if spec is not None and spec.memoize:
+            args_key = task_idempotency_cache.args_key(scope, task_name, params_hash)
+        return request_key, args_key, params_hash
+
+    def _lookup_duplicate(self, task_name: str, request_key: Optional[Tuple], args_key: Optional[Tuple],
+                          params_hash: Optional[str]) -> Tuple[Optional[str], Optional[Tuple]]:
+        """Task ID of an earlier identical submission and the key that matched, if any.
+
+        Raises:
+            TaskError: If the Idempotency-Key was used before for another task or with different parameters.
+        """
+        if request_key is not None:
+            entry = task_idempotency_cache.get(request_key)
+            if entry is not None:
+                if not entry.matches(task_name, params_hash):
+                    raise TaskError(
+                        "Idempotency-Key was already used for another task or with different parameters", code=422
+                    )
+                return entry.task_id, request_key
+        if args_key is not None:
+            entry = task_idempotency_cache.get(args_key)
+            if entry is not None:
+                return entry.task_id, args_key
+        return None, None
+
+    @staticmethod
+    def _remember_submission(task_id: str, task_name: str, request_key: Optional[Tuple], args_key: Optional[Tuple],
+                             params_hash: Optional[str]):
+        for key in (request_key, args_key):
+            if key is not None:
+                task_idempotency_cache.put(key, task_id, params_hash, task_name)
+
+    @staticmethod
+    def _forget_submission(request_key: Optional[Tuple], args_key: Optional[Tuple]):
+        for key in (request_key, args_key):
+            if key is not None:
+                task_idempotency_cache.discard(key)
+
+    async def _find_duplicate(self, task_name: str, request_key: Optional[Tuple], args_key: Optional[Tuple],
+                              params_hash: Optional[str], read_task_info,
+                              unknown_is_pending: bool) -> Optional[Dict[str, Any]]:
+        """Response for a repeated submission, or None if a new task has to be started.
+
+        read_task_info(task_id) is awaited for the status of an earlier task. None means
+        it hasn't started yet if unknown_is_pending (session tasks are only added by their
+        event), otherwise that it is gone. When None is returned there is no await after
+        the last lookup, so the caller can reserve the keys for its new task before any
+        other request looks them up.
+
+        Raises:
+            TaskError: If the Idempotency-Key was used before for another task or with different parameters.
+        """
+        while True:
+            task_id, matched_key = self._lookup_duplicate(task_name, request_key, args_key, params_hash)
+            if task_id is None:
+                return None
+            task_info = await read_task_info(task_id)
+            response = None
+            if task_info is not None or unknown_is_pending:
+                response = self._duplicate_response(task_id, task_info, matched_key, args_key)
+            if response is not None:
+                self._remember_submission(task_id, task_name, request_key, args_key, params_hash)
+                return response
+            # The earlier task can't be reused; another request may have started one since
+            task_idempotency_cache.discard(matched_key)
+
+    @staticmethod
+    def _duplicate_response(task_id: str, task_info: Optional[Dict[str, Any]], matched_key: Tuple,
+                            args_key: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        """Response for a repeated submission, or None if the earlier task can't be reused.
+
+        An Idempotency-Key always maps to its task; a memoized call is only reused while
+        the earlier task is pending, running or completed.
+        """
+        status = task_info["status"] if task_info else None
+        failed = is_terminal_status(status) and status != TaskStatus.COMPLETED
+        if matched_key is args_key and failed:
+            task_idempotency_cache.discard(args_key)
+            return None
+        response = {"task_id": task_id, "deduplicated": True, "status": status}
+        if status == TaskStatus.COMPLETED:
+            response["result"] = task_info["result"]
+        return response
+
+    async def start_task(
+            self, client_token: str, task_name: str, parameters: Dict[str, Any] = Body(default=None),
+            idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+        ):
+        """
+        Start a background task by invoking the task method through a client event.
+        Such tasks are not directly accessible from the client and are used for background processing.
+
+        A repeated request with the same Idempotency-Key header (or, for tasks declared with
+        memoize=True, the same parameters) within TASK_IDEMPOTENCY_TTL_SECONDS returns the
+        earlier task ID, and its result once completed, instead of starting a new task.
+        """
+        async def read_task_info(task_id):
+            # Not in the session's tasks yet means the task event hasn't started it yet
+            return (await self._read_state_tasks(client_token, task_id)).get(task_id)
+
+        try:
+            task_method, validated_params = self._prepare_state_task(task_name, parameters)
+            request_key, args_key, params_hash = self._dedup_keys(
+                (self.state_name, client_token), task_name, task_method, validated_params, idempotency_key
+            )
+            response = await self._find_duplicate(
+                task_name, request_key, args_key, params_hash, read_task_info, unknown_is_pending=True
+            )
+        except TaskError as e:
+            return create_error_response(e)
+        if response is not None:
+            return response
+        task_id = new_task_id()
+        # Reserved before the task is emitted, so concurrent repeats get this task
+        self._remember_submission(task_id, task_name, request_key, args_key, params_hash)
+        try:
+            await self._emit_state_tasks(client_token, [(task_id, task_name, task_method, validated_params)])
+        except BaseException:
+            self._forget_submission(request_key, args_key)
+            raise
         return {"task_id": task_id}
+
+    async def start_task_batch(self, client_token: str, batch: BatchTaskRequest):
+        """
+        Start several background tasks through client events with a single request.
+        All entries are validated first; valid ones are started together and invalid
+        ones are reported per item.
+        """
+        results, accepted = [], []
+        for index, item in enumerate(batch.tasks):
+            try:
+                task_method, validated_params = self._prepare_state_task(item.task_name, item.parameters)
+            except TaskError as e:
+                results.append(_batch_error(index, item, e))
+                continue
+            task_id = new_task_id()
+            accepted.append((task_id, item.task_name, task_method, validated_params))
+            results.append({"index": index, "task_name": item.task_name, "task_id": task_id})
+        if accepted:
+            await self._emit_state_tasks(client_token, accepted)
+        return {"tasks": results}
     
+    async def _read_state_tasks(self, client_token: str, task_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Task snapshots of a client session, without taking its state lock.
+
+        Served from the status cache the task contexts of this process keep up to date.
+        The session is read through a read-only get_state when the cache can't answer
+        for it (or for task_id): tasks of other workers only reach the cache that way.
+        """
+        state_name = self.state_cls.get_full_name()
+        tasks = task_status_cache.get(state_name, client_token, task_id)
+        if tasks is None:
+            read_at = time.monotonic()
+            root_state = await self.app.state_manager.get_state(_substate_key(client_token, self.state_cls))
+            monitor_state = await root_state.get_state(self.state_cls)
+            # Archived tasks are still served by the status and result endpoints
+            snapshots = {tid: task.to_dict() for tid, task in monitor_state._archived_tasks.items()}
+            snapshots.update({tid: task.to_dict() for tid, task in monitor_state.tasks.items()})
+            # Progress ticks of running tasks are only written to task_progress
+            for tid, progress in monitor_state.task_progress.items():
+                if tid in snapshots:
+                    snapshots[tid]["progress"] = progress
+            tasks = task_status_cache.seed(state_name, client_token, snapshots, read_at)
+        return tasks
+
     async def get_task_status(self, client_token: str, task_id: Optional[str] = None):
-        async with self.app.state_manager.modify_state(client_token) as state_manager:
-            monitor_state = await state_manager.get_state(self.state_cls)
-            
-            if task_id:
-                if task_id not in monitor_state.tasks:
-                    return create_error_response(TaskNotFoundError(task_id))
-                return monitor_state.tasks[task_id].to_dict()
-            
-            return {
-                "all_tasks": {tid: task.to_dict() for tid, task in monitor_state.tasks.items()}
-            }
+        tasks = await self._read_state_tasks(client_token, task_id)
+
+        if task_id:
+            if task_id not in tasks:
+                return create_error_response(TaskNotFoundError(task_id))
+            return dict(tasks[task_id])
+
+        return {
+            "all_tasks": {tid: dict(task) for tid, task in tasks.items()}
+        }
 
     
     async def get_task_result(self, client_token: str, task_id: str):
-        async with self.app.state_manager.modify_state(client_token) as state_manager:
-            monitor_state = await state_manager.get_state(self.state_cls)
-            
-            if task_id not in monitor_state.tasks:
-                return create_error_response(TaskNotFoundError(task_id))
-                
-            task = monitor_state.tasks[task_id]
-            if task.status != TaskStatus.COMPLETED:
-                return create_error_response(TaskError(
-                    f"Task {task_id} not completed. Current status: {task.status}",
-                    code=400
-                ))
-            return task.result
+        tasks = await self._read_state_tasks(client_token, task_id)
+
+        if task_id not in tasks:
+            return create_error_response(TaskNotFoundError(task_id))
+
+        task = tasks[task_id]
+        if task["status"] != TaskStatus.COMPLETED:
+            return create_error_response(TaskError(
+                f"Task {task_id} not completed. Current status: {task['status']}",
+                code=400
+            ))
+        return task["result"]
+
+    async def cancel_task(self, client_token: str, task_id: str):
+        """Cancel a running task of a client session; it ends with status Cancelled."""
+        tasks = await self._read_state_tasks(client_token, task_id)
+
+        if task_id not in tasks:
+            return create_error_response(TaskNotFoundError(task_id))
+        status = tasks[task_id]["status"]
+        if is_terminal_status(status):
+            return create_error_response(TaskError(
+                f"Task {task_id} already finished with status {status}", code=409
+            ))
+        if not cancel_state_task(self.state_cls.get_full_name(), client_token, task_id):
+            return create_error_response(TaskError(f"Task {task_id} is not running in this worker", code=409))
+        return {"task_id": task_id, "status": TaskStatus.CANCELLED}
+
+    async def _state_task_frames(self, client_token: str, task_id: Optional[str] = None):
+        """Yield status frames for tasks of a client session as they change.
+
+        The first frame is a snapshot of the current state; after that the generator
+        only wakes up when the session's task contexts publish an update, and each
+        `state_update` frame holds a task's id and the fields that changed (just
+        `{id, progress}` for a progress tick; a new task is sent in full).
+        If the subscriber fell behind and events were dropped, the chunks it missed
+        are sent again (from the running task contexts) followed by a `resync` frame,
+        a full snapshot like the first frame that later deltas apply to.
+        """
+        state_name = self.state_cls.get_full_name()
+        topic = state_topic(state_name, client_token)
+        # Subscribe before taking the snapshot so no update falls in between
+        with task_event_bus.subscribe(topic) as queue:
+            frame_type = "state_update"
+            # Result chunks sent so far, per task ID
+            sent_chunks: Dict[str, int] = {}
+            while True:
+                current_state = await self.get_task_status(client_token, task_id)
+                if current_state.get("error"):
+                    yield {"type": "error", "data": current_state}
+                    return
+                snapshots = [current_state] if task_id else list(current_state["all_tasks"].values())
+                if frame_type == "resync":
+                    # Chunks the dropped events carried; finished tasks hold them all in their result
+                    for snapshot in snapshots:
+                        task_ctx = get_state_task_context(state_name, client_token, snapshot["id"])
+                        start = sent_chunks.get(snapshot["id"], 0)
+                        if task_ctx is not None and len(task_ctx.chunks) > start:
+                            chunks = task_ctx.chunks[start:]
+                            sent_chunks[snapshot["id"]] = start + len(chunks)
+                            yield {"type": "result_chunks",
+                                   "data": {"id": snapshot["id"], "chunk_start": start, "chunks": chunks}}
+                yield {"type": frame_type, "data": current_state}
+                if task_id and is_terminal_status(current_state.get("status")):
+                    return
+                # Later frames only carry the id and the changed fields of a task
+                encoder = TaskDeltaEncoder()
+                encoder.prime(snapshots)
+
+                resync = False
+                async for frame in self._state_task_deltas(queue, encoder, sent_chunks, task_id):
+                    if frame is None:
+                        resync = True
+                        break
+                    yield frame
+                if not resync:
+                    return
+                frame_type = "resync"
+
+    @staticmethod
+    async def _state_task_deltas(queue, encoder: TaskDeltaEncoder, sent_chunks: Dict[str, int],
+                                 task_id: Optional[str] = None):
+        """Frames of the events published on a session's topic, until its task ends
+        (with task_id) or, after an overflow, a final None asking for a resync."""
+        while True:
+            events = await next_events(queue)
+            # Merge the updates of each task from a burst, but keep every result chunk
+            latest = {}
+            chunks = {}
+            for event in events:
+                if event is OVERFLOW or (task_id is not None and event.get("id") != task_id):
+                    continue
+                if "chunks" not in event:
+                    latest.setdefault(event["id"], {}).update(event)
+                    continue
+                # Skip chunks a resync already sent
+                start = max(event["chunk_start"], sent_chunks.get(event["id"], 0))
+                new_chunks = event["chunks"][start - event["chunk_start"]:]
+                if not new_chunks:
+                    continue
+                sent_chunks[event["id"]] = start + len(new_chunks)
+                if event["id"] in chunks:
+                    chunks[event["id"]]["chunks"].extend(new_chunks)
+                else:
+                    chunks[event["id"]] = {**event, "chunk_start": start, "chunks": list(new_chunks)}
+            for event in chunks.values():
+                yield {"type": "result_chunks", "data": event}
+            for event in latest.values():
+                delta = encoder.encode(event)
+                if delta is not None:
+                    yield {"type": "state_update", "data": delta}
+                if task_id and is_terminal_status(event.get("status")):
+                    return
+            if events[-1] is OVERFLOW:
+                yield None
+                return
 
     async def stream_task_status(self, websocket: WebSocket, client_token: str, task_id: Optional[str] = None): 
         """WebSocket endpoint for streaming real-time task status updates."""
@@ -168,85 +463,166 @@ class TaskAPI:
         await websocket.accept()
         
         try:
-            while True:
-                current_state = await self.get_task_status(
-                    client_token, task_id
-                )
-                
-                if current_state.get("error"):
-                    break
-                    
-                await websocket.send_json({
-                    "type": "state_update",
-                    "data": current_state.get("data")
-                })
-                
-                # Check if all tasks are completed
-                if task_id and current_state.get("data", {}).get("status") in [TaskStatus.COMPLETED, TaskStatus.ERROR]:
+            async for frame in self._state_task_frames(client_token, task_id):
+                if frame["type"] == "error":
                     break
-                    
-                await asyncio.sleep(1)
+                await websocket.send_json(frame)
         except WebSocketDisconnect:
             logger.info(f"Websocket disconnected for client {client_token}")
         except Exception as e:
             logger.error(f"Error in WebSocket connection: {str(e)}")
             await websocket.close()
             
-    async def run_task_direct(self, task_name: str, parameters: Dict[str, Any] = Body(default=None)):
-        """Execute a task directly.
-        
-        This bypasses the Reflex event system and executes the task method directly.
-        Only works with methods decorated with @monitored_background_task in state classes.
+    def _prepare_direct_task(self, task_name: str, parameters: Optional[Dict[str, Any]]) -> Tuple[Any, BaseModel]:
+        """Resolve a monitored task method for direct execution and validate its parameters.
+
+        Raises:
+            TaskNotFoundError: If the state class has no such task.
+            TaskError: If the method isn't a static @monitored_background_task method.
+            InvalidParametersError: If the parameters don't match the task's input model.
         """
         # Get the task method from the state class
         task_method = getattr(self.state_cls, task_name, None)
         if not task_method:
             logger.error(f"Task method {task_name} not found in {self.state_cls.__name__}")
-            raise HTTPException(status_code=404, detail=f"Task {task_name} not found")
+            raise TaskNotFoundError(task_name)
             
         # Check if the method has the monitored_background_task decorator
-        has_monitored_decorator = hasattr(task_method, 'is_monitored_background_task')
-        if not has_monitored_decorator:
+        spec = self.task_specs.get(task_name)
+        if spec is None:
             logger.error(f"Task method {task_name} is not decorated with @monitored_background_task")
-            raise HTTPException(status_code=400, detail=f"Task {task_name} is not decorated with @monitored_background_task")
-        
-        # Get the original function from the decorated method
-        # The monitored_background_task decorator adds a __wrapped__ attribute to the function
-        original_func = getattr(task_method, '__wrapped__', task_method)
-        logger.debug(f"Original function: {original_func.__name__}")
-        
-        logger.debug(f"Executing task {task_name} directly with parameters: {parameters}")
-        task_id = str(uuid.uuid4())[:8]
+            raise TaskError(f"Task {task_name} is not decorated with @monitored_background_task", code=400)
+        # Instance-method tasks need the Reflex state of a client session
+        if not spec.direct:
+            logger.error(f"Task method {task_name} is not a static method")
+            raise TaskError(f"Task {task_name} needs a client session, start it through the state events API", code=400)
         
         # Validate parameters
         try:
-            validated_params = self._get_input_params(task_method, parameters)
+            validated_params = self._get_input_params(task_name, task_method, parameters)
         except ValueError as e:
             logger.error(f"Parameter validation error: {str(e)}")
-            raise HTTPException(status_code=400, detail=str(e))
+            raise InvalidParametersError(str(e))
+        return task_method, validated_params
+
+    def _submit_direct_task(self, task_name: str, task_method, validated_params: BaseModel,
+                            priority: str = "normal", dispatch: bool = True, due_at: Optional[float] = None) -> str:
+        """Register a validated direct task and queue it on the scheduler. Returns its task ID.
+
+        due_at is the epoch time a scheduled run was due, recorded against its actual start.
+
+        Raises:
+            ValueError: If the priority is unknown.
+            TaskQueueFullError: If the scheduler queue is full.
+        """
+        task_id = new_task_id()
         
         # Import the DirectTaskContext from models.py
         from ..wrapper.models import DirectTaskContext
         
-        # Initialize our active_tasks structure for API endpoints
-        self.active_tasks[task_id] = {
-            "status": TaskStatus.STARTING,
-            "progress": 0,
-            "result": None,
-            "error": None
-        }
-        
         # Create the task context using DirectTaskContext
         # The DirectTaskContext now maintains its own history
         task_context = DirectTaskContext(task_id, self)
+        task_context.due_at = due_at
+        
+        # Queue the task for background execution. The scheduler only starts it on a
+        # later loop iteration, so registering it below still happens first.
+        task_scheduler.submit(
+            task_id,
+            self.state_name,
+            lambda: self._run_task(task_method, task_context, validated_params),
+            priority=priority,
+            dispatch=dispatch,
+        )
         
-        # Store the task context for future reference
-        self.task_contexts[task_id] = task_context
+        # Register the task and its context for API endpoints
+        self.registry.add(task_id, {
+            "status": TaskStatus.PENDING,
+            "progress": 0,
+            "result": None,
+            "error": None
+        }, task_context)
+        task_store.record(
+            task_id,
+            state=self.state_name,
+            task_name=task_name,
+            params_hash=hash_task_args(validated_params),
+            status=TaskStatus.PENDING,
+            progress=0,
+        )
+        return task_id
+
+    async def run_task_direct(
+            self, task_name: str, parameters: Dict[str, Any] = Body(default=None), priority: str = "normal",
+            idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+        ):
+        """Execute a task directly.
         
-        # Execute the task in the background
-        asyncio.create_task(self._run_task(task_method, task_context, validated_params))
+        This bypasses the Reflex event system and executes the task method directly.
+        Only works with methods decorated with @monitored_background_task in state classes.
+        Tasks are queued on the task scheduler (`priority` is one of high, normal, low);
+        when its queue is full the request is rejected with HTTP 429 and Retry-After.
+
+        A repeated request with the same Idempotency-Key header (or, for tasks declared with
+        memoize=True, the same parameters) within TASK_IDEMPOTENCY_TTL_SECONDS returns the
+        earlier task ID, and its result once completed, instead of running the task again.
+        """
+        try:
+            task_method, validated_params = self._prepare_direct_task(task_name, parameters)
+            request_key, args_key, params_hash = self._dedup_keys(
+                (self.state_name,), task_name, task_method, validated_params, idempotency_key
+            )
+            response = await self._find_duplicate(
+                task_name, request_key, args_key, params_hash, self._read_direct_task_info, unknown_is_pending=False
+            )
+            if response is not None:
+                return response
+            task_id = self._submit_direct_task(task_name, task_method, validated_params, priority)
+            self._remember_submission(task_id, task_name, request_key, args_key, params_hash)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except TaskQueueFullError as e:
+            logger.warning(f"Rejected task {task_name}: {e.message}")
+            raise HTTPException(
+                status_code=e.code, detail=e.message, headers={"Retry-After": str(e.retry_after)}
+            )
+        except TaskError as e:
+            raise HTTPException(status_code=e.code, detail=e.message)
         
         return {"task_id": task_id}
+
+    async def run_task_batch_direct(self, batch: BatchTaskRequest):
+        """Execute several tasks directly with a single request.
+
+        All entries are validated in one pass, then the valid ones are queued on the
+        scheduler together. Each item of the response carries either a task ID or the
+        error for that entry (including 429 when the scheduler queue filled up).
+        """
+        if batch.priority not in PRIORITIES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid priority '{batch.priority}'. Available priorities: {list(PRIORITIES)}"
+            )
+        prepared, results = [], []
+        for index, item in enumerate(batch.tasks):
+            try:
+                prepared.append((index, item, *self._prepare_direct_task(item.task_name, item.parameters)))
+            except TaskError as e:
+                results.append(_batch_error(index, item, e))
+
+        for index, item, task_method, validated_params in prepared:
+            try:
+                task_id = self._submit_direct_task(
+                    item.task_name, task_method, validated_params, batch.priority, dispatch=False
+                )
+            except TaskQueueFullError as e:
+                results.append(_batch_error(index, item, e))
+                continue
+            results.append({"index": index, "task_name": item.task_name, "task_id": task_id})
+        # Start as many of the queued tasks as the concurrency caps allow
+        task_scheduler.dispatch()
+
+        return {"tasks": sorted(results, key=lambda item: item["index"])}
         
     async def _run_task(self, task_method, task_context, params):
         """Run a task in the background and update its status.
@@ -256,22 +632,41 @@ class TaskAPI:
         used with monitored_background_task decorator.
         """
         task_id = task_context.task_id
+        # Get the original function from the decorated method
+        # The monitored_background_task decorator adds a __wrapped__ attribute to the function
+        original_func = getattr(task_method, '__wrapped__', task_method)
+        timeout = getattr(original_func, "timeout", None)
+        retry = getattr(original_func, "retry", None)
         try:
             # Update task status to processing using the context's update method
             # This will also update the task history with a timestamp
-            await task_context.update(status=TaskStatus.PROCESSING)
-            
-            # Get the original function from the decorated method
-            # The monitored_background_task decorator adds a __wrapped__ attribute to the function
-            original_func = getattr(task_method, '__wrapped__', task_method)
+            # (and, for scheduled runs, when the run was due)
+            task_context.started_at = time.time()
+            schedule_details = {}
+            if task_context.due_at is not None:
+                schedule_details = {
+                    "due_at": datetime.fromtimestamp(task_context.due_at).isoformat(),
+                    "start_delay": round(task_context.started_at - task_context.due_at, 3),
+                }
+            await task_context.update(status=TaskStatus.PROCESSING, **schedule_details)
             logger.debug(f"Original function: {original_func.__name__}")
             
             # Execute the original function directly with the task context
             # This bypasses the monitored_background_task wrapper which expects a state parameter
-            if hasattr(params, 'model_dump'):
-                result = await original_func(task_context, task_args=params)
-            else:
-                result = await original_func(task_context)
+            # (process-executor tasks run in the shared process pool; a task with a retry
+            # policy is run again on failure, within the same timeout)
+            # As on the state path, tasks without an input model (EmptyParams) get no task_args
+            kwargs = {} if params is None or isinstance(params, EmptyParams) else {"task_args": params}
+            result = await run_with_timeout(
+                run_metered(
+                    call_with_retry(
+                        retry, lambda: call_task_function(original_func, (), task_context, kwargs),
+                        task_context.record_retry,
+                    ),
+                    task_context.usage,
+                ),
+                timeout,
+            )
                 
             # Update task status to completed using the context's update method
             # This will also update the task history with a timestamp
@@ -279,157 +674,320 @@ class TaskAPI:
             
             logger.info(f"Task {task_id} completed successfully with result: {result}")
             
+        except asyncio.CancelledError:
+            logger.warning(f"Task {task_id} cancelled")
+            self._record_direct_error(task_id, "Task cancelled")
+            await task_context.update(status=TaskStatus.CANCELLED)
+            raise
+        except TaskTimeoutError as e:
+            logger.warning(f"Task {task_id} timed out after {timeout}s")
+            self._record_direct_error(task_id, e.message)
+            await task_context.update(status=TaskStatus.TIMEOUT)
         except Exception as e:
             logger.error(f"Error executing task {task_id}: {str(e)}")
+            self._record_direct_error(task_id, str(e))
             # Update task status to error using the context's update method
             await task_context.update(status=TaskStatus.ERROR)
-            self.active_tasks[task_id]["error"] = str(e)
+        finally:
+            self._record_direct_usage(task_id, original_func.__name__, task_context.usage)
+            self.registry.mark_finished(task_id)
+
+    def _record_direct_usage(self, task_id: str, task_name: str, usage):
+        """Keep the resources a finished direct task used and add them to the per-task stats."""
+        task_info = self.registry.get_info(task_id)
+        if task_info is not None:
+            task_info["usage"] = usage.to_dict()
+        task_usage_stats.record(self.state_name, task_name, usage)
+
+    def _record_direct_error(self, task_id: str, message: str):
+        """Set the error message of a direct task in the registry and the store."""
+        task_info = self.registry.get_info(task_id)
+        if task_info is not None:
+            task_info["error"] = message
+        task_store.record(task_id, error=message)
+
+    async def cancel_direct_task(self, task_id: str):
+        """Cancel a waiting or running direct task.
+
+        A waiting task is removed from the scheduler queue; a running one is cancelled
+        and releases its scheduler slot right away. Either way the task ends with status
+        Cancelled. Process-executor tasks stop being awaited, but a worker that already
+        started the task body finishes it in the background.
+        """
+        task_info = self._get_direct_task_info(task_id)
+        if task_info is None and not is_local_task(task_id):
+            task_info = await self._get_stored_task_info(task_id)
+            if task_info is not None and not is_terminal_status(task_info["status"]):
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Task {task_id} runs on worker {task_worker(task_id)} and can only be cancelled there",
+                )
+        if task_info is None:
+            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+        if is_terminal_status(task_info["status"]):
+            raise HTTPException(
+                status_code=409, detail=f"Task {task_id} already finished with status {task_info['status']}"
+            )
+
+        job = task_scheduler.cancel(task_id)
+        if job is None:
+            raise HTTPException(status_code=409, detail=f"Task {task_id} is not scheduled")
+        if job.handle is None:
+            # Never started, so _run_task won't record the cancellation
+            self._record_direct_error(task_id, "Task cancelled")
+            await self.registry.get_context(task_id).update(status=TaskStatus.CANCELLED)
+            self.registry.mark_finished(task_id)
+        return {"task_id": task_id, "status": TaskStatus.CANCELLED}
+
+    async def _read_direct_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Status info of a direct task from this worker or, failing that, the task store."""
+        return self._get_direct_task_info(task_id) or await self._get_stored_task_info(task_id)
+
+    def _get_direct_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Status info of a direct task, from the registry or the archive of evicted tasks."""
+        task_info = self.registry.get_info(task_id)
+        if task_info is None:
+            archived = self.registry.get_archived(task_id)
+            if archived is not None:
+                task_info = archived.to_dict()
+        return task_info
+
+    async def _get_stored_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Status info of a direct task from the durable store (e.g. run by another worker)."""
+        record = await task_store.get(task_id)
+        if record is None or record.get("state", self.state_name) != self.state_name:
+            return None
+        return {
+            "status": record.get("status"),
+            "progress": record.get("progress", 0),
+            "result": record.get("result"),
+            "error": record.get("error"),
+        }
     
     async def get_direct_task_result(self, task_id: str):
-        """Get the result of a directly executed task."""
-        if task_id not in self.active_tasks:
+        """Get the result of a directly executed task.
+
+        Tasks unknown to this worker (finished before a restart or run by another
+        worker) are looked up in the durable task store.
+        """
+        task_info = self._get_direct_task_info(task_id)
+        if task_info is None:
+            task_info = await self._get_stored_task_info(task_id)
+        if task_info is None:
             raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
             
-        task_status = self.active_tasks[task_id]["status"]
+        task_status = task_info["status"]
         if task_status != TaskStatus.COMPLETED:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Task {task_id} not completed. Current status: {task_status}"
             )
             
-        return {"result": self.active_tasks[task_id]["result"]}
+        return {"result": task_info["result"]}
+
+    async def get_task_schemas(self):
+        """Get the JSON Schema of the parameters of every task of this state."""
+        return {"tasks": {task_name: spec.json_schema for task_name, spec in self.task_specs.items()}}
+
+    async def get_task_schema(self, task_name: str):
+        """Get the JSON Schema of a task's parameters."""
+        spec = self.task_specs.get(task_name)
+        if spec is None:
+            raise HTTPException(status_code=404, detail=f"Task {task_name} not found")
+        return spec.json_schema
+
+    async def get_direct_task_stats(self):
+        """Get registry counters of this state and the shared store, scheduler and cache statistics."""
+        return {
+            "worker": current_worker(),
+            "registry": self.registry.stats(),
+            "status_cache": task_status_cache.stats(),
+            "idempotency": task_idempotency_cache.stats(),
+            "state_updates": dict(task_update_stats),
+            "store": task_store.stats(),
+            "scheduler": task_scheduler.stats(),
+            "usage": task_usage_stats.stats(self.state_name),
+        }
     
-    async def stream_direct_task_status(self, websocket: WebSocket, task_id: str):
-        """WebSocket endpoint for streaming real-time status updates for directly executed tasks.
-        
-        This endpoint will first send the complete task history, then stream real-time updates
-        as they occur. Each update includes a timestamp for tracking when events occurred.
-        
-        If the task is not found in active_tasks, it will still stream the last update if available
-        in the task_contexts dictionary.
+    def _direct_status_frame(self, task_id: str, task_context=None) -> Dict[str, Any]:
+        """Build a status frame for a direct task from the registry or its context."""
+        task_info = self._get_direct_task_info(task_id)
+        if task_info is not None:
+            data = {
+                "task_id": task_id,
+                "status": task_info["status"],
+                "progress": task_info["progress"],
+                "result": task_info["result"],
+                "error": task_info["error"],
+                "usage": task_info.get("usage"),
+            }
+        else:
+            # Task no longer registered, use the latest status from task_context
+            data = {
+                "task_id": task_id,
+                "status": task_context.status,
+                "progress": task_context.progress,
+                "result": task_context.result,
+            }
+        task_context = task_context or self.registry.get_context(task_id)
+        if task_context is not None:
+            # Live usage while the task runs
+            data["usage"] = task_context.usage.to_dict()
+        data["timestamp"] = datetime.now().isoformat()
+        return {"type": "status_update", "data": data}
+
+    async def _stored_task_frames(self, task_id: str):
+        """Yield status frames for a direct task read from the durable task store.
+
+        Updates of a task running in another worker can't be pushed to this one, so
+        the store is re-read every TASK_STORE_POLL_INTERVAL_SECONDS until the task ends.
         """
-        logger.info(f"New direct task websocket connection for task {task_id}")
-        await websocket.accept()
-        
-        try:
-            # Check if we have a task context for this task_id
-            task_context = self.task_contexts.get(task_id)
-            
-            if not task_context:
-                # If no task context is found, check if we have any active tasks with this ID
-                if task_id not in self.active_tasks:
-                    # No task found - send a message but don't close the connection
-                    # This allows reconnecting to tasks that might have completed
-                    await websocket.send_json({
-                        "type": "status_update",
-                        "data": {
-                            "task_id": task_id,
-                            "status": "NOT_FOUND",
-                            "message": f"Task {task_id} not found",
-                            "timestamp": datetime.now().isoformat()
-                        }
-                    })
-                    # Keep the connection open but exit the function
-                    return
-            
-            # First, send the complete task history if we have a task context
+        last_info = None
+        while True:
+            task_info = await self._get_stored_task_info(task_id)
+            if task_info is None:
+                yield {
+                    "type": "status_update",
+                    "data": {
+                        "task_id": task_id,
+                        "status": "NOT_FOUND",
+                        "message": f"Task {task_id} not found",
+                        "timestamp": datetime.now().isoformat()
+                    }
+                }
+                return
+            if task_info != last_info:
+                yield {
+                    "type": "status_update",
+                    "data": {
+                        "task_id": task_id,
+                        **task_info,
+                        "worker": task_worker(task_id),
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                }
+                last_info = task_info
+            if is_terminal_status(task_info["status"]):
+                return
+            await asyncio.sleep(TASK_STORE_POLL_INTERVAL_SECONDS)
+
+    async def _direct_task_frames(self, task_id: str, since: Optional[int] = None):
+        """Yield history and status frames for a directly executed task.
+
+        The retained history after `since` (all of it by default) is sent first, then
+        new history entries and a status frame each time the task's context publishes
+        an update. History frames carry `last_seq` for resuming, and `truncated` when
+        entries after `since` were already overwritten in the ring buffer.
+        Chunks of async generator tasks are sent as `result_chunks` frames, starting
+        with those yielded before the client connected.
+        """
+        task_context = self.registry.get_context(task_id)
+        if not task_context and self._get_direct_task_info(task_id) is None:
+            # Not known to this worker (its ID names the worker that owns it); follow the durable store instead
+            async for frame in self._stored_task_frames(task_id):
+                yield frame
+            return
+
+        with task_event_bus.subscribe(direct_topic(self.state_name, task_id)) as queue:
+            last_seq = since
+            sent_chunks = 0
             if task_context:
-                await websocket.send_json({
+                entries, truncated = task_context.history.since(last_seq)
+                last_seq = task_context.history.last_seq
+                yield {
                     "type": "history",
                     "data": {
                         "task_id": task_id,
-                        "history": task_context.history
+                        "history": entries,
+                        "last_seq": last_seq,
+                        "truncated": truncated,
                     }
-                })
-                
-                # Keep track of the last history entry we've seen
-                last_history_index = len(task_context.history) - 1
-                
-                # Stream real-time updates
-                while True:
-                    # Check if we have new history entries
-                    current_history_index = len(task_context.history) - 1
-                    
-                    # If there are new entries, send them
-                    if current_history_index > last_history_index:
-                        new_entries = task_context.history[last_history_index+1:]
-                        await websocket.send_json({
-                            "type": "new_history",
-                            "data": {
-                                "task_id": task_id,
-                                "new_entries": new_entries
-                            }
-                        })
-                        last_history_index = current_history_index
-                    
-                    # Get current task status from active_tasks
-                    if task_id in self.active_tasks:
-                        task_info = self.active_tasks[task_id]
-                        
-                        # Send current status update
-                        await websocket.send_json({
-                            "type": "status_update",
-                            "data": {
-                                "task_id": task_id,
-                                "status": task_info["status"],
-                                "progress": task_info["progress"],
-                                "result": task_info["result"],
-                                "error": task_info["error"],
-                                "timestamp": datetime.now().isoformat()
-                            }
-                        })
-                        
-                        # Check if task is completed or errored
-                        if task_info["status"] in [TaskStatus.COMPLETED, TaskStatus.ERROR]:
-                            break
-                    else:
-                        # Task no longer in active_tasks, send the latest status from task_context
-                        await websocket.send_json({
-                            "type": "status_update",
-                            "data": {
-                                "task_id": task_id,
-                                "status": task_context.status,
-                                "progress": task_context.progress,
-                                "result": task_context.result,
-                                "timestamp": datetime.now().isoformat()
-                            }
-                        })
-                        
-                        # If task is completed or errored, break the loop
-                        if task_context.status in [TaskStatus.COMPLETED, TaskStatus.ERROR]:
-                            break
-                    
-                    # Wait before checking again
-                    await asyncio.sleep(1)
-            else:
-                # We have an active task but no task_context (shouldn't happen with current implementation)
-                # Just stream the active task info
-                while True:
-                    task_info = self.active_tasks[task_id]
-                    await websocket.send_json({
-                        "type": "status_update",
+                }
+
+            while True:
+                if task_context and task_context.history.last_seq > last_seq:
+                    entries, truncated = task_context.history.since(last_seq)
+                    last_seq = task_context.history.last_seq
+                    yield {
+                        "type": "new_history",
                         "data": {
                             "task_id": task_id,
-                            "status": task_info["status"],
-                            "progress": task_info["progress"],
-                            "result": task_info["result"],
-                            "error": task_info["error"],
-                            "timestamp": datetime.now().isoformat()
+                            "new_entries": entries,
+                            "last_seq": last_seq,
+                            "truncated": truncated,
                         }
-                    })
-                    
-                    # Check if task is completed or errored
-                    if task_info["status"] in [TaskStatus.COMPLETED, TaskStatus.ERROR]:
-                        break
-                        
-                    await asyncio.sleep(1)
-                    
+                    }
+
+                if task_context and len(task_context.chunks) > sent_chunks:
+                    yield {
+                        "type": "result_chunks",
+                        "data": {
+                            "task_id": task_id,
+                            "chunk_start": sent_chunks,
+                            "chunks": task_context.chunks[sent_chunks:],
+                        }
+                    }
+                    sent_chunks = len(task_context.chunks)
+
+                frame = self._direct_status_frame(task_id, task_context)
+                yield frame
+                if is_terminal_status(frame["data"]["status"]):
+                    return
+
+                # Sleep until the task publishes its next update
+                await next_events(queue)
+
+    async def stream_direct_task_status(self, websocket: WebSocket, task_id: str, since: Optional[int] = None):
+        """WebSocket endpoint for streaming real-time status updates for directly executed tasks.
+        
+        This endpoint will first send the task history, then stream real-time updates
+        as they occur. Each update includes a timestamp for tracking when events occurred.
+        A reconnecting client passes `?since=<last_seq>` to receive only the entries it missed.
+        
+        If the task has been evicted from the registry, the final status is still streamed
+        from the archive of finished tasks.
+        """
+        logger.info(f"New direct task websocket connection for task {task_id} (since={since})")
+        await websocket.accept()
+        
+        try:
+            async for frame in self._direct_task_frames(task_id, since):
+                await websocket.send_json(frame)
         except WebSocketDisconnect:
             logger.info(f"WebSocket disconnected for task {task_id}")
         except Exception as e:
             logger.error(f"Error in direct task WebSocket connection: {str(e)}")
             await websocket.close()
 
+    async def stream_direct_task_events(self, request: Request, task_id: str, since: Optional[int] = None):
+        """Server-Sent Events endpoint for directly executed tasks.
+
+        Streams the same frames as the direct task websocket, one SSE event per frame
+        (the event name is the frame type). History events carry their last_seq as the
+        event ID, so a reconnecting client resumes from `Last-Event-ID` or `?since=<seq>`.
+        """
+        if since is None and request.headers.get("last-event-id", "").isdigit():
+            since = int(request.headers["last-event-id"])
+        logger.info(f"New direct task event stream for task {task_id} (since={since})")
+
+        async def events():
+            async for frame in self._direct_task_frames(task_id, since):
+                if await request.is_disconnected():
+                    logger.info(f"Event stream disconnected for task {task_id}")
+                    return
+                event_id = frame["data"].get("last_seq")
+                lines = [f"event: {frame['type']}"]
+                if event_id is not None:
+                    lines.append(f"id: {event_id}")
+                lines.append(f"data: {json.dumps(frame['data'], default=str)}")
+                yield "\n".join(lines) + "\n\n"
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     def setup_routes(self):
         """Set up API endpoints using APIRouter."""
         # Task management endpoints
@@ -440,6 +998,13 @@ class TaskAPI:
             description=f"Start a task for {self.state_name}",
         )
         
+        self.router.add_api_route(
+            get_route("batch"),
+            self.start_task_batch,
+            methods=["POST"],
+            description=f"Start several tasks for {self.state_name} at once",
+        )
+        
         # Status endpoints
         self.router.add_api_route(
             get_route("status"),
@@ -463,6 +1028,14 @@ class TaskAPI:
             description=f"Get task result for {self.state_name}",
         )
 
+        # Cancel endpoint
+        self.router.add_api_route(
+            get_route("cancel"),
+            self.cancel_task,
+            methods=["POST"],
+            description=f"Cancel a running task for {self.state_name}",
+        )
+
         # WebSocket endpoints
         self.ws_router.add_api_websocket_route(
             get_route("ws_monitor"),
@@ -484,6 +1057,13 @@ class TaskAPI:
             description="Execute a task directly using static methods",
         )
 
+        self.direct_router.add_api_route(
+            get_route("direct_batch"),
+            self.run_task_batch_direct,
+            methods=["POST"],
+            description="Execute several tasks directly with a single request",
+        )
+
         self.direct_router.add_api_route(
             get_route("direct_result"),
             self.get_direct_task_result,
@@ -491,6 +1071,42 @@ class TaskAPI:
             description="Get result of a directly executed task",
         )
         
+        self.direct_router.add_api_route(
+            get_route("direct_cancel"),
+            self.cancel_direct_task,
+            methods=["POST"],
+            description="Cancel a waiting or running directly executed task",
+        )
+        
+        self.direct_router.add_api_route(
+            get_route("direct_schemas"),
+            self.get_task_schemas,
+            methods=["GET"],
+            description=f"Get the parameter JSON Schemas of all tasks of {self.state_name}",
+        )
+        
+        self.direct_router.add_api_route(
+            get_route("direct_schema", task_name="{task_name}"),
+            self.get_task_schema,
+            methods=["GET"],
+            description="Get the parameter JSON Schema of a task",
+        )
+        
+        self.direct_router.add_api_route(
+            get_route("direct_stats"),
+            self.get_direct_task_stats,
+            methods=["GET"],
+            description="Get registry statistics for directly executed tasks",
+        )
+        
+        # Server-Sent Events for clients that can't hold a websocket
+        self.direct_router.add_api_route(
+            get_route("direct_events"),
+            self.stream_direct_task_events,
+            methods=["GET"],
+            description="Stream status updates of a directly executed task as Server-Sent Events",
+        )
+        
         # WebSocket for direct task status updates
         self.ws_router.add_api_websocket_route(
             get_route("direct_ws"),
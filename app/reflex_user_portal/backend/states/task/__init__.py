@@ -8,12 +8,14 @@ import os
 import json
 import importlib
 import inspect
-from pydantic import BaseModel
-from typing import Dict, Type, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple, Type, Optional
 
 import reflex as rx
 
 from .base import MonitorState
+from ...wrapper.catalog import task_catalog
+from ...wrapper.usage import task_usage_stats
 from ....utils.logger import get_logger
 logger = get_logger(__name__)
 
@@ -21,6 +23,7 @@ logger = get_logger(__name__)
 def discover_task_states() -> Dict[str, dict]:
     """
     Dynamically discover all task state classe 
+    The monitored tasks of each state class are registered in the task catalog.
     Returns:
         Dict[str, dict]: A dictionary of state mappings
         Details:
@@ -73,7 +76,10 @@ def discover_task_states() -> Dict[str, dict]:
                                 
                 except ImportError as e:
                     logger.info(f"Warning: Could not import package {item}: {e}")
-                    
+
+    # Introspect the tasks once; consumers read their specs from the catalog
+    for state_info in state_mappings.values():
+        task_catalog.register_state(state_info["cls"])
     return state_mappings
 
 def _process_module(module_name: str, state_mappings: Dict[str, dict]):
@@ -109,13 +115,52 @@ def _process_module(module_name: str, state_mappings: Dict[str, dict]):
 STATE_MAPPINGS: Dict[str, dict] = discover_task_states()
 logger.info(f"Discovered task states: {list(STATE_MAPPINGS.keys())}")
 
-from ....backend.api.commands import format_command
+from ....backend.api.commands import CLIENT_TOKEN_PLACEHOLDER, format_command, format_dashboard_commands
+
+
+def _format_curl_body(default_args: Optional[Dict[str, Any]]) -> str:
+    """Format task arguments into a curl -d string, empty for tasks without default args."""
+    if default_args is None:
+        return ""
+    return f"-d '{json.dumps(default_args, indent=2, sort_keys=True)}'"
+
+
+def _build_dashboard_commands() -> Dict[Tuple[str, str], Mapping[str, str]]:
+    """Dashboard commands (and curl body) of every (state, task), plus (state, "") for no
+    task selected, with the client token left as a placeholder."""
+    commands = {}
+    for state_name, state_info in STATE_MAPPINGS.items():
+        specs = task_catalog.get(state_info["cls"])
+        for task_name in ["", *specs]:
+            task_commands = format_dashboard_commands(state_info, task_name)
+            spec = specs.get(task_name)
+            task_commands["formatted_curl_body"] = _format_curl_body(spec.default_args if spec else None)
+            commands[(state_name, task_name)] = MappingProxyType(task_commands)
+    return commands
+
+
+# Formatted once at startup; sessions only substitute their client token
+TASK_DASHBOARD_COMMANDS: Dict[Tuple[str, str], Mapping[str, str]] = _build_dashboard_commands()
+
+
+def dashboard_command(state_name: str, task_name: str, name: str, client_token: str) -> str:
+    """A precomputed dashboard command for a session, or "" for an unknown state."""
+    commands = TASK_DASHBOARD_COMMANDS.get((state_name, task_name))
+    if commands is None:
+        if state_name not in STATE_MAPPINGS:
+            return ""
+        # Not a monitored task of the state: format it on demand
+        commands = format_dashboard_commands(STATE_MAPPINGS[state_name], task_name)
+        commands["formatted_curl_body"] = ""
+    return commands[name].replace(CLIENT_TOKEN_PLACEHOLDER, client_token)
 
 class DisplayMonitorState(MonitorState):
     """Advanced Monitor State with built-in state type management."""
     current_state_type: str = list(STATE_MAPPINGS.keys())[0]
     # Class variables for state management
     state_mappings: Dict[str, dict] = STATE_MAPPINGS
+    # Per-task resource usage of finished runs in this backend process
+    task_usage: List[Dict[str, Any]] = []
 
     @rx.var
     def current_state_info(self) -> dict:
@@ -128,6 +173,8 @@ class DisplayMonitorState(MonitorState):
     
     @rx.var
     def avail_task_functions(self) -> Dict[str, str]:
+        if self.current_state_class is None:
+            return {}
         return self.current_state_class.get_task_functions()
     
     @rx.var
@@ -167,6 +214,12 @@ class DisplayMonitorState(MonitorState):
             return
         self.current_task_function = list(self.task_functions.keys())[0]
         logger.debug(f"Preselected task function: {self.current_task_function}")
+        self.refresh_task_usage()
+
+    @rx.event
+    def refresh_task_usage(self):
+        """Reload the per-task resource usage (queue wait, wall time, CPU time, peak memory)."""
+        self.task_usage = task_usage_stats.stats()
         
     # TODO: Untested function - require validation
     @rx.event
@@ -197,83 +250,13 @@ class DisplayMonitorState(MonitorState):
             raise ValueError(f"Invalid task function. Available functions in {self.current_state_type}: {list(self.task_functions.keys())}")
 
     
-    ## The following functions are used to format the commands for the API
-    ## and WebSocket endpoints.
+    ## The following vars are the commands for the API and WebSocket endpoints,
+    ## looked up from TASK_DASHBOARD_COMMANDS (formatted once per state and task at startup).
     
     @rx.var
     def formatted_curl_body(self) -> str:
         """Format task arguments into a curl -d string using default args."""
-        if not self.current_task_function or not self.current_state_class:
-            return ""
-            
-        try:
-            # Get the method directly from the class
-            method_name = self.current_task_function
-            logger.debug(f"Looking for method: {method_name} in class {self.current_state_class.__name__}")
-            current_method = getattr(self.current_state_class, method_name, None)
-            
-            if not current_method:
-                logger.debug(f"Method {method_name} not found in {self.current_state_class.__name__}")
-                return ""
-            
-            logger.debug(f"Found method: {current_method}")
-            
-            # Handle different types of methods
-            original_func = None
-            
-            # Case 1: Regular Reflex event handler with fn attribute
-            if hasattr(current_method, 'fn'):
-                logger.debug(f"Method has fn attribute: {current_method.fn}")
-                original_func = current_method.fn
-            # Case 2: Direct function with monitored_background_task decorator
-            elif hasattr(current_method, 'is_monitored_background_task'):
-                logger.debug(f"Method has is_monitored_background_task attribute")
-                # Check if this is a wrapper with original_func attribute
-                if hasattr(current_method, 'original_func'):
-                    logger.debug(f"Found original_func attribute: {current_method.original_func}")
-                    original_func = current_method.original_func
-                else:
-                    original_func = current_method
-            else:
-                logger.debug(f"Method is not a monitored background task")
-                return ""
-                
-            # Inspect signature to find task_args parameter
-            sig = inspect.signature(original_func)
-            logger.debug(f"Method signature: {sig}")
-            logger.debug(f"Parameter types: {[p for p in sig.parameters.values()]}")
-            
-            # Look for task_args parameter and get its default value
-            for param_name, param in sig.parameters.items():
-                logger.debug(f"Checking parameter: {param_name}, annotation: {param.annotation}, default: {'has default' if param.default is not param.empty else 'no default'}")
-                if param_name == "task_args":
-                    logger.debug(f"Found task_args parameter with annotation: {param.annotation}")
-                    # Get the default value if it exists
-                    if param.default is not param.empty:
-                        default_value = param.default
-                        # Convert default value to dict if it's a pydantic model
-                        logger.debug(f"Default value type: {type(default_value)}, dir: {dir(default_value)}")
-                        if isinstance(default_value, BaseModel):
-                            default_dict = default_value.model_dump()
-                            logger.debug(f"Converted to dict: {default_dict}")
-                            return f"-d '{json.dumps(default_dict, indent=2, sort_keys=True)}'"
-                        elif hasattr(default_value, 'model_dump'):
-                            # Handle case where it's a Pydantic model but not recognized as BaseModel subclass
-                            logger.debug(f"Object has model_dump method but is not recognized as BaseModel")
-                            default_dict = default_value.model_dump()
-                            logger.debug(f"Converted to dict: {default_dict}")
-                            return f"-d '{json.dumps(default_dict, indent=2, sort_keys=True)}'"
-                        else:
-                            logger.debug(f"Default value is not a BaseModel: {type(default_value)}")
-                    else:
-                        logger.debug("task_args parameter has no default value")
-                    break
-            logger.debug("No task_args parameter found or no valid default value")
-            return ""
-            
-        except Exception as e:
-            logger.error(f"Error formatting curl body: {e}")
-            return ""
+        return dashboard_command(self.current_state_type, self.current_task_function, "formatted_curl_body", "")
            
     def get_command(self, cmd_type: str, state_name: str, **kwargs) -> str:
         """Helper to format commands with current state info"""
@@ -287,31 +270,43 @@ class DisplayMonitorState(MonitorState):
     @rx.var
     def base_api_path(self) -> str:
         """Get the base API path for the current state type."""
-        return self.get_command("base", self.current_state_type)
+        return dashboard_command(self.current_state_type, self.current_task_function, "base_api_path", self.client_token)
     @rx.var
     def status_command(self) -> str:
         """Get the command to check the status of all tasks."""
-        return self.get_command("status", self.current_state_type)
+        return dashboard_command(self.current_state_type, self.current_task_function, "status_command", self.client_token)
     @rx.var
     def task_status_command(self) -> str:
         """Get the command to check the status of a specific task."""
-        return self.get_command("status_by_id", self.current_state_type, task_id="{task_id}")
+        return dashboard_command(self.current_state_type, self.current_task_function, "task_status_command", self.client_token)
     @rx.var
     def start_command(self) -> str:
         """Get the command to start a task."""
-        return self.get_command("start", self.current_state_type, session_id="{session_id}", task_name=self.current_task_function)
+        return dashboard_command(self.current_state_type, self.current_task_function, "start_command", self.client_token)
     @rx.var
     def result_command(self) -> str:
         """Get the command to check the result of a task."""
-        return self.get_command("result", self.current_state_type, task_id="{task_id}")
+        return dashboard_command(self.current_state_type, self.current_task_function, "result_command", self.client_token)
+    @rx.var
+    def cancel_command(self) -> str:
+        """Get the command to cancel a running task."""
+        return dashboard_command(self.current_state_type, self.current_task_function, "cancel_command", self.client_token)
     @rx.var
     def ws_status_command(self) -> str:
         """Get the command to check the status of all tasks via WebSocket."""
-        return self.get_command("ws_all", self.current_state_type)
+        return dashboard_command(self.current_state_type, self.current_task_function, "ws_status_command", self.client_token)
     @rx.var
     def ws_task_command(self) -> str:
         """Get the command to check the status of a specific task via WebSocket."""
-        return self.get_command("ws_task", self.current_state_type, task_id="{task_id}")
+        return dashboard_command(self.current_state_type, self.current_task_function, "ws_task_command", self.client_token)
+    @rx.var
+    def ws_multiplex_command(self) -> str:
+        """Get the command to watch many tasks of any state over one WebSocket."""
+        return dashboard_command(self.current_state_type, self.current_task_function, "ws_multiplex_command", self.client_token)
+    @rx.var
+    def sse_task_command(self) -> str:
+        """Get the command to stream the events of a direct task via Server-Sent Events."""
+        return dashboard_command(self.current_state_type, self.current_task_function, "sse_task_command", self.client_token)
         
 # Export discovered classes
 __all__ = ["MonitorState", "DisplayMonitorState", "STATE_MAPPINGS"] + list(STATE_MAPPINGS.keys())
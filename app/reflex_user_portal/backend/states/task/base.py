@@ -1,5 +1,7 @@
-import inspect
+import bisect
+import heapq
 import sys
+import time
 from typing import Dict, Type, Optional, List, Any, Callable, Set, Union
 from pydantic import BaseModel
 from sqlmodel import select, desc
@@ -7,11 +9,48 @@ from sqlmodel import select, desc
 import reflex as rx
 
 from ...wrapper.task import TaskContext, TaskData, TaskStatus
+from ...wrapper.models import ACTIVE_STATUSES, is_terminal_status
+from ...wrapper.ids import task_created_ms
+from ...wrapper.status_cache import task_status_cache
+from ...wrapper.catalog import task_catalog
 from ....utils.logger import get_logger
 from app.models.admin.admin_config import AdminConfig
+from app.config import TASK_STATE_MAX_TASKS, TASK_STATE_MAX_AGE_SECONDS, TASK_STATE_ARCHIVE_SIZE
 
 logger = get_logger(__name__)
 
+# Archived tasks brought back by one "load older tasks" event
+LOAD_OLDER_BATCH = 20
+
+def _unproxied(value):
+    """The container behind a state var's change-tracking proxy, for reads only.
+
+    Item access through the proxy wraps every item it returns, which dominates the
+    cost of reading thousands of tasks.
+    """
+    return getattr(value, "__wrapped__", value)
+
+class TaskIndex:
+    """IDs of the active and finished tasks of a session, sorted oldest first (task IDs
+    sort by creation time).
+
+    A plain object rather than list vars: Reflex only tracks changes of lists, dicts and
+    models, so updating the index skips its dirty marking. `tasks` changes along with
+    every index change, and that alone refreshes the task lists.
+    """
+    def __init__(self):
+        self.active: List[str] = []
+        self.completed: List[str] = []
+
+    def update(self, task_id: str, active: bool, completed: bool):
+        for ids, member in ((self.active, active), (self.completed, completed)):
+            position = bisect.bisect_left(ids, task_id)
+            present = position < len(ids) and ids[position] == task_id
+            if member and not present:
+                ids.insert(position, task_id)
+            elif present and not member:
+                del ids[position]
+
 class MonitorState(rx.State):
     """
     Base Monitor State for task tracking.
@@ -42,12 +81,27 @@ class MonitorState(rx.State):
     """
     tasks: Dict[str, TaskData] = {}
     current_task_function: str = ""
-    # Arguments for the current task. Mapping of task ID to its arguments.
-    tasks_argument: Dict[str, Union[Dict[str, Any], BaseModel]] = {}
+    # Arguments of tasks started through the API, claimed by the task when it starts.
+    # Mapping of task ID to {"task_name": ..., "task_args": {...}, "queued_at": <epoch time>}.
+    tasks_argument: Dict[str, Dict[str, Any]] = {}
     
     # this is for API access (task ID + task arguments)
     enqueued_tasks: Dict[str, dict] = {}
 
+    # Latest progress of the active tasks. Progress ticks only write this small var, so
+    # the client isn't sent `tasks` (with every result) again for each of them.
+    task_progress: Dict[str, int] = {}
+
+    # Kept in step with `tasks` by index_task, so the task lists don't filter and sort all tasks.
+    _task_index: TaskIndex = TaskIndex()
+
+    # Finished tasks moved out of `tasks` by the retention policy (TASK_STATE_MAX_TASKS,
+    # TASK_STATE_MAX_AGE_SECONDS). Backend-only, so they are no longer
+    # part of the state sent to the client.
+    _archived_tasks: Dict[str, TaskData] = {}
+    # Archived tasks brought back by load_older_tasks; kept until hide_older_tasks
+    _loaded_task_ids: List[str] = []
+
     @rx.var
     def client_token(self) -> str:
         """Token for client identification."""
@@ -57,69 +111,89 @@ class MonitorState(rx.State):
         """Session ID for client identification."""
         return self.router.session.session_id
     @rx.var
+    def archived_task_count(self) -> int:
+        """Number of older tasks that can be loaded back with load_older_tasks."""
+        return len(self._archived_tasks)
+    @rx.var
     def active_tasks(self) -> List[TaskData]:
         """List of currently active tasks, sorted by creation time (newest first)."""
-        active_tasks = [
-            task for task in self.tasks.values() 
-            if task.status in [TaskStatus.STARTING, TaskStatus.PROCESSING]
-        ]
-        return sorted(active_tasks, key=lambda x: x.created_at, reverse=True)
+        tasks = _unproxied(self.tasks)
+        return [tasks[task_id] for task_id in reversed(self._task_index.active)]
     @rx.var
     def completed_tasks(self) -> List[TaskData]:
-        """List of currently active tasks, sorted by creation time (newest first)."""
-        completed_tasks = [
-            task for task in self.tasks.values() 
-            if task.status in [TaskStatus.COMPLETED, TaskStatus.ERROR]
-        ]
-        return sorted(completed_tasks, key=lambda x: x.created_at, reverse=True)
+        """List of finished tasks, sorted by creation time (newest first)."""
+        tasks = _unproxied(self.tasks)
+        return [tasks[task_id] for task_id in reversed(self._task_index.completed)]
+
+    def index_task(self, task_id: str):
+        """Move a task to the index matching its current status, or drop it from both if
+        it is gone, and track the progress of active tasks in task_progress. Called by the
+        task wrapper on every status change, with the state lock held."""
+        task = _unproxied(self.tasks).get(task_id)
+        status = task.status if task is not None else None
+        self._task_index.update(task_id, status in ACTIVE_STATUSES, is_terminal_status(status))
+        if status in ACTIVE_STATUSES:
+            if task_id not in _unproxied(self.task_progress):
+                self.task_progress[task_id] = task.progress
+        elif task_id in _unproxied(self.task_progress):
+            del self.task_progress[task_id]
+
+    def prune_tasks(self):
+        """Archive the finished tasks beyond the retention policy: only the newest
+        TASK_STATE_MAX_TASKS, created within TASK_STATE_MAX_AGE_SECONDS, stay in `tasks`.
+        Called by the task wrapper when a task finishes, with the state lock held."""
+        loaded = set(_unproxied(self._loaded_task_ids))
+        completed = self._task_index.completed
+        excess = len(completed) - len(loaded) - TASK_STATE_MAX_TASKS if TASK_STATE_MAX_TASKS > 0 else 0
+        cutoff_ms = (time.time() - TASK_STATE_MAX_AGE_SECONDS) * 1000 if TASK_STATE_MAX_AGE_SECONDS > 0 else None
+        expired = []
+        # The index is sorted oldest first, so stop at the first task that may stay
+        for task_id in completed:
+            if task_id in loaded:
+                continue
+            if excess > 0:
+                excess -= 1
+            elif cutoff_ms is None or (task_created_ms(task_id) or cutoff_ms) >= cutoff_ms:
+                break
+            expired.append(task_id)
+        for task_id in expired:
+            self._archived_tasks[task_id] = self.tasks.pop(task_id)
+            self.index_task(task_id)
+
+        overflow = len(self._archived_tasks) - TASK_STATE_ARCHIVE_SIZE
+        if overflow > 0:
+            # Drop the oldest tasks (loaded tasks hidden again are archived out of order)
+            dropped = heapq.nsmallest(overflow, _unproxied(self._archived_tasks))
+            for task_id in dropped:
+                del self._archived_tasks[task_id]
+            task_status_cache.discard(self.get_full_name(), self.router.session.client_token, dropped)
+
+    @rx.event
+    def load_older_tasks(self):
+        """Bring the newest LOAD_OLDER_BATCH archived tasks back into `tasks`."""
+        for task_id in sorted(_unproxied(self._archived_tasks))[-LOAD_OLDER_BATCH:]:
+            self.tasks[task_id] = self._archived_tasks.pop(task_id)
+            self._loaded_task_ids.append(task_id)
+            self.index_task(task_id)
+
+    @rx.event
+    def hide_older_tasks(self):
+        """Archive the loaded older tasks again (with anything else beyond the retention policy)."""
+        self._loaded_task_ids = []
+        self.prune_tasks()
 
     @classmethod
     def get_task_functions(cls) -> Dict[str, str]:
         """
         Get all available task functions with their display names.
         Maps function names to their display names based on docstrings or formatted names.
-        Includes:
-        - Methods defined directly in the class with @monitored_background_task
-        - Standalone functions discovered from the module with @reflex_task
+        Read from the task catalog, where the @monitored_background_task methods
+        (instance and static) defined in this class were introspected once at discovery.
         
         Returns:
-            Dictionary mapping: function names -> display names.
+            Dictionary mapping: function names -> display names, sorted by name.
         """
-        task_functions = {}
-        
-        # Get methods defined in this specific class (not from base classes)
-        class_methods = {
-            name: method for name, method in cls.__dict__.items() 
-            if callable(method) and not name.startswith('_')
-        }
-        
-        # Find all methods that are monitored background tasks
-        for name, method in class_methods.items():
-            # For Reflex EventHandler, we need to check the original function
-            if hasattr(method, 'fn') and hasattr(method.fn, 'is_monitored_background_task'):
-                # Get the docstring's first line or use formatted name
-                doc = inspect.getdoc(method.fn)
-                if doc:
-                    display_name = doc.split('\n')[0].strip()
-                else:
-                    display_name = name.replace('_', ' ').title()
-                task_functions[name] = display_name
-            # For standalone functions wrapped with monitored_background_task
-            # (these won't have .fn attribute but will have is_monitored_background_task)
-            elif hasattr(method, 'is_monitored_background_task'):
-                # Get the docstring's first line or use formatted name
-                doc = inspect.getdoc(method)
-                if doc:
-                    display_name = doc.split('\n')[0].strip()
-                else:
-                    display_name = name.replace('_', ' ').title()
-                task_functions[name] = display_name
-                    
-        if task_functions:
-            # Sort task functions by their names
-            task_functions = dict(sorted(task_functions.items(), key=lambda item: item[0]))
-            
-        return task_functions
+        return {name: spec.display_name for name, spec in task_catalog.get(cls).items()}
         
     @rx.event
     def change_task_function(self, function_name: str):
@@ -7,11 +7,13 @@ Takes no arguments.
 import asyncio
 
 import reflex as rx
+from sqlalchemy.exc import OperationalError
 from app.utils.logger import get_logger
 
 from .base import MonitorState
 from ....backend.wrapper.task import monitored_background_task
 from ....backend.wrapper.models import TaskStatus, TaskContext
+from ....backend.wrapper.retry import RetryPolicy
 
 from app.models.admin.admin_config import AdminConfig
 logger = get_logger(__name__)
@@ -38,10 +40,11 @@ class ExampleTaskState(MonitorState):
         logger.info(f"Finished long-running task {task.task_id}")
         return "<My Task Result>"
     
-    @monitored_background_task
+    @monitored_background_task(retry=RetryPolicy(max_attempts=3, backoff=0.5, retry_on=(OperationalError,)))
     async def task2_show_db_config(
         self, task: TaskContext, config_name: str="Default Admin Config"):
         """Background task that fetch and shows a database configuration from AdminConfig.
+        Retried on transient database errors (e.g. a dropped connection).
         """
         logger.info(f"Using database configuration {config_name} for task {task.task_id}")
         with rx.session() as session:
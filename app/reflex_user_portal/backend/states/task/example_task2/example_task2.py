@@ -13,7 +13,7 @@ from ..base import MonitorState
 from .....backend.wrapper.task import monitored_background_task, TaskContext
 from .....backend.wrapper.models import TaskStatus
 
-from .model import InputArgs
+from .model import InputArgs, PrimeArgs, ReportArgs
 
 logger = get_logger(__name__)
 
@@ -69,6 +69,36 @@ class ExampleTaskState2(MonitorState):
         logger.info(f"Finished task2_with_args {task.task_id}")
         return {**task_args.model_dump()}
     
+    @staticmethod
+    @monitored_background_task(executor="process", memoize=True)
+    async def count_primes(task: TaskContext, task_args: PrimeArgs = PrimeArgs()):
+        """CPU-bound task that runs in the task process pool."""
+        count = 0
+        step = max(task_args.limit // 10, 1)
+        for n in range(2, task_args.limit):
+            if all(n % d for d in range(2, int(n ** 0.5) + 1)):
+                count += 1
+            if n % step == 0:
+                await task.update(progress=min(n * 100 // task_args.limit, 99), status=TaskStatus.PROCESSING)
+        return {"limit": task_args.limit, "primes": count}
+    
+    @staticmethod
+    @monitored_background_task
+    async def failing_task(task: TaskContext):
+        """Task that fails halfway, to show how errors are reported."""
+        await task.update(progress=50, status=TaskStatus.PROCESSING)
+        await asyncio.sleep(0.5)
+        raise RuntimeError("Example task failure")
+    
+    @staticmethod
+    @monitored_background_task
+    async def stream_report(task: TaskContext, task_args: ReportArgs = ReportArgs()):
+        """Task that streams its result row by row."""
+        for i in range(task_args.rows):
+            await asyncio.sleep(0.2)
+            await task.update(progress=(i + 1) * 100 // task_args.rows, status=TaskStatus.PROCESSING)
+            yield {"row": i + 1, "value": (i + 1) ** 2}
+    
     @monitored_background_task
     async def instance_task(self, task: TaskContext):
         """This task is defined as an instance method in the state class."""
@@ -3,4 +3,12 @@ from pydantic import BaseModel
 class InputArgs(BaseModel):
     """Input arguments for the task."""
     name: str
-    age: int
\ No newline at end of file
+    age: int
+
+class PrimeArgs(BaseModel):
+    """Input arguments for the CPU-bound prime counting task."""
+    limit: int = 200_000
+
+class ReportArgs(BaseModel):
+    """Input arguments for the streaming report task."""
+    rows: int = 10
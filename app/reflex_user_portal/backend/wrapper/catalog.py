@@ -0,0 +1,130 @@
+"""
+Metadata of the monitored tasks of each state class, built once at discovery.
+
+`discover_task_states` registers every state class it finds; its monitored tasks are
+introspected a single time (docstring, input model, default arguments, JSON Schema and
+the decorator's executor settings) into frozen TaskSpecs. The dashboard, the task APIs
+and the scheduler read these specs instead of walking the class on every call.
+"""
+import inspect
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Type
+
+from pydantic import BaseModel
+
+from .executor import unwrap_task_function
+from .cron import CronExpression
+from .retry import RetryPolicy
+from .validators import INPUT_ARG_NAME, TaskValidator, monitored_task_names, task_validators
+
+
+def task_display_name(task_name: str, func: Any) -> str:
+    """First line of the task's docstring, or its name in title case."""
+    doc = inspect.getdoc(func)
+    if doc:
+        return doc.split('\n')[0].strip()
+    return task_name.replace('_', ' ').title()
+
+
+def default_task_args(func: Any, input_arg_name: str = INPUT_ARG_NAME) -> Optional[Dict[str, Any]]:
+    """Default value of the task's input argument as a dict, if it has a model default."""
+    param = inspect.signature(func).parameters.get(input_arg_name)
+    if param is None or param.default is param.empty:
+        return None
+    if isinstance(param.default, BaseModel) or hasattr(param.default, "model_dump"):
+        return param.default.model_dump()
+    return None
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """What is known about a monitored task without running it.
+
+    `default_args` and `json_schema` are shared by all readers; treat them as read-only.
+    """
+    name: str
+    display_name: str
+    # The attribute of the state class (EventHandler, or the wrapper of a static task)
+    method: Any
+    validator: TaskValidator
+    default_args: Optional[Dict[str, Any]]
+    # Static-method tasks run without a client session (direct API, schedules)
+    direct: bool
+    # Async generator tasks stream their chunks
+    streaming: bool
+    executor: str
+    timeout: Optional[float]
+    memoize: bool
+    retry: Optional[RetryPolicy]
+    schedule: Optional[CronExpression]
+
+    @property
+    def model(self) -> Optional[Type[BaseModel]]:
+        return self.validator.model
+
+    @property
+    def json_schema(self) -> Dict[str, Any]:
+        return self.validator.json_schema
+
+    @classmethod
+    def build(cls, state_cls: Any, task_name: str) -> "TaskSpec":
+        method = getattr(state_cls, task_name)
+        func = unwrap_task_function(method)
+        # Decorator settings are set on both the wrapper and the original function
+        return cls(
+            name=task_name,
+            display_name=task_display_name(task_name, func),
+            method=method,
+            validator=task_validators.get(state_cls, task_name, method),
+            default_args=default_task_args(func),
+            direct=isinstance(vars(state_cls).get(task_name), staticmethod),
+            streaming=inspect.isasyncgenfunction(func),
+            executor=getattr(func, "executor", "loop"),
+            timeout=getattr(func, "timeout", None),
+            memoize=getattr(func, "memoize", False),
+            retry=getattr(func, "retry", None),
+            schedule=getattr(func, "schedule", None),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly description of the task (without the method)."""
+        return {
+            "name": self.name,
+            "display_name": self.display_name,
+            "default_args": self.default_args,
+            "json_schema": self.json_schema,
+            "direct": self.direct,
+            "streaming": self.streaming,
+            "executor": self.executor,
+            "timeout": self.timeout,
+            "memoize": self.memoize,
+            "retry_attempts": self.retry.max_attempts if self.retry is not None else None,
+            "schedule": str(self.schedule) if self.schedule is not None else None,
+        }
+
+
+class TaskCatalog:
+    """Read-only task specs per state class (by full state name), sorted by task name."""
+    def __init__(self):
+        self._states: Dict[str, Mapping[str, TaskSpec]] = {}
+
+    def register_state(self, state_cls: Any) -> Mapping[str, TaskSpec]:
+        """Introspect the monitored tasks of a state class once."""
+        specs = {
+            task_name: TaskSpec.build(state_cls, task_name)
+            for task_name in sorted(monitored_task_names(state_cls))
+        }
+        tasks = self._states[state_cls.get_full_name()] = MappingProxyType(specs)
+        return tasks
+
+    def get(self, state_cls: Any) -> Mapping[str, TaskSpec]:
+        """Task specs of a state class, registered on first use if discovery didn't see it."""
+        tasks = self._states.get(state_cls.get_full_name())
+        if tasks is None:
+            tasks = self.register_state(state_cls)
+        return tasks
+
+
+# Shared catalog for the whole backend process
+task_catalog = TaskCatalog()
@@ -0,0 +1,157 @@
+"""
+Cron expressions for scheduled tasks.
+
+Supports the five standard fields (minute, hour, day of month, month, day of week)
+with `*`, lists, ranges, steps and month/weekday names, plus the @hourly, @daily,
+@weekly, @monthly and @yearly aliases. As in Vixie cron, a day matches when either
+the day of month or the day of week matches if both fields are restricted.
+"""
+import datetime
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {name: index for index, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+WEEKDAY_NAMES = {name: index for index, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# (name, lowest, highest, names) of each field
+FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, MONTH_NAMES),
+    ("day of week", 0, 7, WEEKDAY_NAMES),
+)
+
+# Give up on expressions that never match (e.g. "0 0 30 2 *") after this many years
+MAX_SEARCH_YEARS = 5
+
+
+def _parse_value(text: str, names: dict, field: str) -> int:
+    value = names.get(text.lower())
+    if value is not None:
+        return value
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid {field} value '{text}'")
+
+
+def _parse_field(text: str, field: str, lowest: int, highest: int, names: dict) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        range_part, _, step_part = part.partition("/")
+        step = int(step_part) if step_part else 1
+        if step < 1:
+            raise ValueError(f"Invalid {field} step '{step_part}'")
+        if range_part == "*":
+            start, end = lowest, highest
+        elif "-" in range_part:
+            start_text, end_text = range_part.split("-", 1)
+            start, end = _parse_value(start_text, names, field), _parse_value(end_text, names, field)
+        else:
+            start = _parse_value(range_part, names, field)
+            end = highest if step_part else start
+        if not lowest <= start <= end <= highest:
+            raise ValueError(f"{field.capitalize()} '{part}' is out of range {lowest}-{highest}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronExpression:
+    """A parsed cron expression."""
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    # Whether the day fields were restricted (not "*"), for the day-of-month/day-of-week OR rule
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronExpression":
+        """Parse an expression.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        fields = ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != len(FIELDS):
+            raise ValueError(f"Cron expression '{expression}' must have {len(FIELDS)} fields")
+        minutes, hours, days, months, weekdays = (
+            _parse_field(text, name, lowest, highest, names)
+            for text, (name, lowest, highest, names) in zip(fields, FIELDS)
+        )
+        # 7 is Sunday too
+        if 7 in weekdays:
+            weekdays = (weekdays - {7}) | {0}
+        return cls(
+            expression=expression,
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=weekdays,
+            days_restricted=not fields[2].startswith("*"),
+            weekdays_restricted=not fields[4].startswith("*"),
+        )
+
+    def _day_matches(self, moment: datetime.datetime) -> bool:
+        day_match = moment.day in self.days
+        # isoweekday(): Monday is 1, Sunday is 7
+        weekday_match = moment.isoweekday() % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def matches(self, moment: datetime.datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime.datetime) -> datetime.datetime:
+        """The first matching minute strictly after moment (keeps moment's tzinfo).
+
+        Raises:
+            ValueError: If the expression matches no date in the next MAX_SEARCH_YEARS years.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = candidate + datetime.timedelta(days=366 * MAX_SEARCH_YEARS)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + datetime.timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += datetime.timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def __str__(self) -> str:
+        return self.expression
+
+
+def parse_cron(expression: Optional[str]) -> Optional[CronExpression]:
+    """Parse an optional expression (None stays None)."""
+    return None if expression is None else CronExpression.parse(expression)
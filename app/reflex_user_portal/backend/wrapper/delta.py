@@ -0,0 +1,42 @@
+"""
+Delta encoding of task updates for stream consumers.
+
+Task contexts publish either full snapshots (on status changes) or small deltas
+(`{"id", "progress"}` for progress ticks). Each stream connection keeps an encoder
+that remembers what it already sent per task and forwards only the fields that
+changed, so a status change doesn't resend an unchanged result either.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+_MISSING = object()
+
+
+class TaskDeltaEncoder:
+    """Encode task updates as deltas against what one consumer already received."""
+    def __init__(self):
+        # Fields sent so far, per task ID
+        self._sent: Dict[str, Dict[str, Any]] = {}
+
+    def prime(self, snapshots: Iterable[Dict[str, Any]]):
+        """Remember full snapshots the consumer received by other means (e.g. a first frame)."""
+        for snapshot in snapshots:
+            self._sent[snapshot["id"]] = dict(snapshot)
+
+    def encode(self, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The id and the fields of update that differ from what was sent for its task.
+
+        A task seen for the first time is sent as it is; None if nothing changed.
+        """
+        task_id = update["id"]
+        sent = self._sent.get(task_id)
+        if sent is None:
+            self._sent[task_id] = dict(update)
+            return dict(update)
+        delta = {
+            key: value for key, value in update.items()
+            if key != "id" and sent.get(key, _MISSING) != value
+        }
+        if not delta:
+            return None
+        sent.update(delta)
+        return {"id": task_id, **delta}
@@ -0,0 +1,112 @@
+"""
+In-process publish/subscribe bus for task updates.
+
+Task contexts publish to a topic whenever a task changes; API streams subscribe
+to the topics they serve and only wake up when something was actually published.
+"""
+import asyncio
+import contextlib
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Set
+
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def state_topic(state_name: str, client_token: str) -> str:
+    """Topic carrying the task updates of one client session of a state."""
+    return f"state:{state_name}:{client_token}"
+
+
+def direct_topic(state_name: str, task_id: str) -> str:
+    """Topic carrying the updates of one directly executed task."""
+    return f"direct:{state_name}:{task_id}"
+
+
+def pipeline_topic(pipeline_id: str) -> str:
+    """Topic signalling progress of one task pipeline."""
+    return f"pipeline:{pipeline_id}"
+
+
+# Queued in place of the events a subscriber missed because its queue was full
+OVERFLOW: Dict[str, Any] = {"type": "overflow"}
+
+
+class Subscription(asyncio.Queue):
+    """Event queue of one subscriber; `overflowed` while it ends with OVERFLOW."""
+    def __init__(self, maxsize: int):
+        # One extra slot for the OVERFLOW marker
+        super().__init__(maxsize=maxsize + 1)
+        self.overflowed = False
+
+
+class TaskEventBus:
+    """Fan task events out to the queues of every subscriber of a topic.
+
+    Publishing never blocks and never drops events silently: when a subscriber's
+    queue is full, OVERFLOW is queued after the events it holds and nothing more is
+    delivered to it until it has read the marker. A subscriber that gets OVERFLOW
+    must resynchronize from the source (the task context or the state) before it
+    relies on later events, which are only deltas and chunks.
+    """
+    def __init__(self, max_queue_size: int = 256):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.overflows = 0
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> int:
+        """Publish an event to a topic. Returns the number of subscribers reached."""
+        queues = self._subscribers.get(topic)
+        if not queues:
+            return 0
+        reached = 0
+        for queue in queues:
+            if queue.overflowed:
+                continue
+            if queue.qsize() >= self.max_queue_size:
+                queue.overflowed = True
+                queue.put_nowait(OVERFLOW)
+                self.overflows += 1
+                logger.warning(f"Subscriber of {topic} fell {self.max_queue_size} events behind, it has to resync")
+                continue
+            queue.put_nowait(event)
+            reached += 1
+        return reached
+
+    @contextlib.contextmanager
+    def subscribe(self, topic: str) -> Iterator[Subscription]:
+        """Subscribe to a topic for the duration of the `with` block."""
+        queue = Subscription(maxsize=self.max_queue_size)
+        self._subscribers[topic].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(topic)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        """Number of live subscriptions on a topic."""
+        return len(self._subscribers.get(topic, ()))
+
+
+async def next_events(queue: Subscription) -> List[Dict[str, Any]]:
+    """Wait for the next event on a subscription and drain whatever else is queued.
+
+    Bursts of updates are handed back together so a consumer sends one frame per
+    wake-up instead of one per update. If the list ends with OVERFLOW, events were
+    missed; delivery resumes with the next publish.
+    """
+    events = [await queue.get()]
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    if events[-1] is OVERFLOW:
+        queue.overflowed = False
+    return events
+
+
+# Shared bus for the whole backend process
+task_event_bus = TaskEventBus()
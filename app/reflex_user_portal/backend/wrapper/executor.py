@@ -0,0 +1,252 @@
+"""
+Execution backends for monitored task functions.
+
+Tasks run on the event loop by default. Tasks declared with
+`@monitored_background_task(executor="process")` run their body in a warm
+ProcessPoolExecutor instead, so CPU-heavy work doesn't stall HTTP and websocket
+traffic. Inside the worker the task receives a ProcessTaskContext whose updates
+travel back over a manager queue and are replayed on the real task context. The
+CPU time and peak memory growth of the worker are returned with the result and
+added to the task's usage.
+"""
+import asyncio
+import contextlib
+import importlib
+import inspect
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import TASK_PROCESS_POOL_SIZE
+
+from .usage import max_rss_kb
+from ...utils.error_handler import TaskTimeoutError
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXECUTORS = ("loop", "process")
+
+# Seconds to wait for the last updates of a worker after its task returned
+UPDATE_DRAIN_TIMEOUT = 5.0
+
+
+def unwrap_task_function(obj: Any) -> Callable:
+    """Get the undecorated task function behind an EventHandler, staticmethod or wrapper."""
+    while True:
+        if hasattr(obj, "fn"):
+            obj = obj.fn
+        elif isinstance(obj, staticmethod):
+            obj = obj.__func__
+        elif hasattr(obj, "__wrapped__"):
+            obj = obj.__wrapped__
+        else:
+            return obj
+
+
+class ProcessTaskContext:
+    """Task context handed to a task body running in a pool worker.
+
+    It has no access to Reflex state or the TaskAPI; `update` only forwards its
+    arguments to the parent process.
+    """
+    def __init__(self, task_id: str, token: str, updates):
+        self.task_id = task_id
+        self.token = token
+        self._updates = updates
+        self.progress = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def update(self, **kwargs):
+        if kwargs.get("progress") is not None:
+            self.progress = kwargs["progress"]
+        self._updates.put((self.token, kwargs))
+
+
+def _warm_worker():
+    """Pool initializer: import the task states once per worker process."""
+    importlib.import_module("app.reflex_user_portal.backend.states.task")
+
+
+def _run_in_worker(module_name: str, qualname: str, leading_args: int, task_id: str,
+                   token: str, updates, kwargs: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+    """Resolve the task function by name in the worker and run it to completion.
+
+    Returns the result and the CPU time and peak RSS growth of the worker while it ran.
+    """
+    cpu_start, rss_start = time.process_time(), max_rss_kb()
+    try:
+        obj = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+        func = unwrap_task_function(obj)
+        task_ctx = ProcessTaskContext(task_id, token, updates)
+        # Reflex state can't cross process boundaries; `self` is None in the worker
+        result = asyncio.run(func(*([None] * leading_args), task_ctx, **kwargs))
+        return result, {"cpu_time": time.process_time() - cpu_start, "peak_rss_delta_kb": max_rss_kb() - rss_start}
+    finally:
+        updates.put((token, None))
+
+
+class ProcessTaskExecutor:
+    """Process pool shared by all process-executor tasks, kept for the app lifetime."""
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._updates = None
+        self._reader: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Update listeners of running tasks: token -> (event loop, asyncio queue)
+        self._listeners: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self.task_names = set()
+
+    def register(self, func: Callable):
+        """Remember a process-executor task so the pool is started with the app."""
+        self.task_names.add(func.__qualname__)
+
+    def start(self):
+        """Start (and warm up) the worker processes and the update reader thread."""
+        with self._start_lock:
+            if self._pool is None:
+                self._start()
+
+    def _start(self):
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._updates = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=context, initializer=_warm_worker
+        )
+        # Spawn every worker now rather than on the first task
+        for _ in range(self.max_workers):
+            self._pool.submit(int)
+        self._reader = threading.Thread(target=self._read_updates, name="task-process-updates", daemon=True)
+        self._reader.start()
+        logger.info(f"Started task process pool with {self.max_workers} workers")
+
+    def shutdown(self):
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with contextlib.suppress(Exception):
+            self._updates.put(None)
+        self._reader.join(timeout=1)
+        self._manager.shutdown()
+        self._pool = self._manager = self._updates = self._reader = None
+        logger.info("Stopped task process pool")
+
+    def _read_updates(self):
+        """Route updates from the workers to the event loop awaiting each task."""
+        while True:
+            try:
+                item = self._updates.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            token, update = item
+            listener = self._listeners.get(token)
+            if listener is not None:
+                loop, updates = listener
+                loop.call_soon_threadsafe(updates.put_nowait, update)
+
+    async def run(self, func: Callable, leading_args: int, task_ctx, kwargs: Dict[str, Any]) -> Any:
+        """Run a task function in the pool, replaying its updates on task_ctx."""
+        if self._pool is None:
+            # Spawning processes blocks, keep it off the event loop
+            await asyncio.to_thread(self.start)
+        loop = asyncio.get_running_loop()
+        token = uuid.uuid4().hex
+        updates: asyncio.Queue = asyncio.Queue()
+        self._listeners[token] = (loop, updates)
+        try:
+            future = loop.run_in_executor(
+                self._pool, _run_in_worker, func.__module__, func.__qualname__,
+                leading_args, task_ctx.task_id, token, self._updates, kwargs,
+            )
+            await self._forward_updates(updates, task_ctx, future)
+            result, worker_usage = await future
+            usage = getattr(task_ctx, "usage", None)
+            if usage is not None:
+                usage.add_remote(worker_usage)
+            return result
+        finally:
+            del self._listeners[token]
+
+    async def _forward_updates(self, updates: asyncio.Queue, task_ctx, future: asyncio.Future):
+        get = None
+        try:
+            while True:
+                get = asyncio.ensure_future(updates.get())
+                if not future.done():
+                    await asyncio.wait({get, future}, return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    # The worker returned; its remaining updates are at most a moment behind
+                    await asyncio.wait({get}, timeout=UPDATE_DRAIN_TIMEOUT)
+                    if not get.done():
+                        return
+                update = get.result()
+                if update is None:
+                    return
+                await task_ctx.update(**update)
+        finally:
+            if get is not None and not get.done():
+                get.cancel()
+
+
+# Shared pool for the whole backend process
+process_executor = ProcessTaskExecutor(max_workers=TASK_PROCESS_POOL_SIZE)
+
+
+async def call_task_function(func: Callable, leading_args: tuple, task_ctx, kwargs: Dict[str, Any]) -> Any:
+    """Call an undecorated task function on the executor it was declared with.
+
+    Async generator tasks stream each yielded chunk through task_ctx.emit_chunk;
+    their result is the list of all chunks.
+    """
+    if getattr(func, "executor", "loop") == "process":
+        return await process_executor.run(func, len(leading_args), task_ctx, kwargs)
+    if inspect.isasyncgenfunction(func):
+        chunks = []
+        async for chunk in func(*leading_args, task_ctx, **kwargs):
+            chunks.append(chunk)
+            await task_ctx.emit_chunk(chunk)
+        return chunks
+    return await func(*leading_args, task_ctx, **kwargs)
+
+
+async def run_with_timeout(coro, timeout: Optional[float]) -> Any:
+    """Await coro, stopping it after timeout seconds (None for no limit).
+
+    Raises:
+        TaskTimeoutError: If the timeout expired. A TimeoutError raised by the task
+            itself (e.g. from a timed-out HTTP call) is passed on as it is.
+    """
+    deadline = asyncio.timeout(timeout)
+    try:
+        async with deadline:
+            return await coro
+    except TimeoutError:
+        if deadline.expired():
+            raise TaskTimeoutError(timeout) from None
+        raise
+
+
+@contextlib.asynccontextmanager
+async def process_pool_lifespan():
+    """App lifespan task that keeps the process pool up while the backend runs."""
+    if process_executor.task_names:
+        await asyncio.to_thread(process_executor.start)
+    try:
+        yield
+    finally:
+        process_executor.shutdown()
@@ -0,0 +1,57 @@
+"""
+Fixed-capacity task history with sequence numbers.
+
+Every entry gets a monotonically increasing `seq`, so a client that reconnects can
+ask for the entries after the last one it saw instead of the whole history. When
+the buffer is full the oldest entries are overwritten; `since` reports whether the
+requested range was cut short. Timestamps are stored as epoch floats and only
+formatted as ISO strings when entries are sent out.
+"""
+import datetime
+import itertools
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class TaskHistory:
+    """Ring buffer of task history entries."""
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        # Sequence number of the latest entry (0 before the first one)
+        self.last_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained entry."""
+        return self.last_seq - len(self._entries) + 1
+
+    @property
+    def dropped(self) -> int:
+        """Entries overwritten because the buffer was full."""
+        return self.first_seq - 1
+
+    def append(self, **values) -> Dict[str, Any]:
+        """Add an entry and return it in wire format."""
+        self.last_seq += 1
+        entry = {"seq": self.last_seq, "timestamp": time.time(), **values}
+        self._entries.append(entry)
+        return self.format(entry)
+
+    @staticmethod
+    def format(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {**entry, "timestamp": datetime.datetime.fromtimestamp(entry["timestamp"]).isoformat()}
+
+    def since(self, seq: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Entries after seq (all retained entries if None), and whether some were lost."""
+        seq = 0 if seq is None else max(seq, 0)
+        start = max(seq + 1 - self.first_seq, 0)
+        entries = [self.format(entry) for entry in itertools.islice(self._entries, start, None)]
+        return entries, seq + 1 < self.first_seq
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return self.since()[0]
@@ -0,0 +1,82 @@
+"""
+Deduplication of repeated task submissions.
+
+Maps an `Idempotency-Key` header, or the hash of a task's validated arguments for
+tasks declared with `memoize=True`, to the task ID of the first submission for
+TASK_IDEMPOTENCY_TTL_SECONDS. Retried requests then get the existing task (and its
+result once finished) instead of starting the computation again. An Idempotency-Key
+entry also records the task name and arguments hash of its request, so the same key
+can't be replayed for a different request.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import TASK_IDEMPOTENCY_TTL_SECONDS, TASK_IDEMPOTENCY_MAX_KEYS
+
+
+@dataclass
+class IdempotencyEntry:
+    task_id: str
+    params_hash: Optional[str]
+    expires_at: float
+    task_name: Optional[str] = None
+
+    def matches(self, task_name: Optional[str], params_hash: Optional[str]) -> bool:
+        """Whether the entry was stored for a request of this task with these arguments."""
+        return self.task_name == task_name and self.params_hash == params_hash
+
+
+class IdempotencyCache:
+    """TTL/LRU map of submission keys to the task they started."""
+    def __init__(self, ttl: float = 600, max_keys: int = 10000):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Tuple, IdempotencyEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def request_key(scope: Tuple, idempotency_key: str) -> Tuple:
+        """Key of a client-supplied Idempotency-Key within a scope (state, client token)."""
+        return ("key", *scope, idempotency_key)
+
+    @staticmethod
+    def args_key(scope: Tuple, task_name: str, params_hash: Optional[str]) -> Tuple:
+        """Key of a memoized task call within a scope."""
+        return ("args", *scope, task_name, params_hash)
+
+    def get(self, key: Tuple) -> Optional[IdempotencyEntry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple, task_id: str, params_hash: Optional[str] = None, task_name: Optional[str] = None):
+        self._entries[key] = IdempotencyEntry(task_id, params_hash, time.monotonic() + self.ttl, task_name)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Tuple):
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._entries),
+            "max_keys": self.max_keys,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared cache for the whole backend process
+task_idempotency_cache = IdempotencyCache(ttl=TASK_IDEMPOTENCY_TTL_SECONDS, max_keys=TASK_IDEMPOTENCY_MAX_KEYS)
@@ -0,0 +1,122 @@
+"""
+Sortable, collision-safe task IDs.
+
+IDs follow the ULID layout: 26 Crockford base32 characters, starting with the
+48-bit millisecond timestamp so they sort by creation time. The 80 bits after it
+hold a 20-bit code of the worker process that created the task, then 60 random
+bits. Within one millisecond the random part is incremented instead of drawn
+again, so IDs made by one worker never collide and stay ordered.
+
+The worker code lets any backend worker tell whether a task is its own or must be
+served from the shared task store.
+"""
+import hashlib
+import os
+import secrets
+import socket
+import threading
+import time
+from typing import Optional
+
+from app.config import TASK_WORKER_ID
+
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+TIMESTAMP_LENGTH = 10
+WORKER_LENGTH = 4
+RANDOM_LENGTH = 12
+TASK_ID_LENGTH = TIMESTAMP_LENGTH + WORKER_LENGTH + RANDOM_LENGTH
+
+_RANDOM_MAX = (1 << (5 * RANDOM_LENGTH)) - 1
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(CROCKFORD_ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def _decode(text: str) -> int:
+    value = 0
+    for char in text:
+        value = value * 32 + CROCKFORD_ALPHABET.index(char)
+    return value
+
+
+class TaskIdGenerator:
+    """Monotonic ULID-style ID generator of one worker process."""
+    def __init__(self, worker_id: Optional[str] = None):
+        self._configured_worker = worker_id
+        self._worker: Optional[str] = None
+        self._pid: Optional[int] = None
+        self._last_ms = -1
+        self._last_random = 0
+        self._lock = threading.Lock()
+
+    @property
+    def worker(self) -> str:
+        """Code of this worker process (derived again after a fork)."""
+        pid = os.getpid()
+        if self._worker is None or self._pid != pid:
+            source = self._configured_worker or f"{socket.gethostname()}:{pid}"
+            digest = int.from_bytes(hashlib.blake2b(source.encode(), digest_size=4).digest(), "big")
+            self._worker = _encode(digest, WORKER_LENGTH)
+            self._pid = pid
+        return self._worker
+
+    def new_id(self) -> str:
+        worker = self.worker
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms <= self._last_ms:
+                # Same (or earlier, if the clock stepped back) millisecond: count up
+                now_ms = self._last_ms
+                self._last_random += 1
+                if self._last_random > _RANDOM_MAX:
+                    now_ms += 1
+                    self._last_random = secrets.randbits(5 * RANDOM_LENGTH - 1)
+            else:
+                # Leave headroom for incrementing within the millisecond
+                self._last_random = secrets.randbits(5 * RANDOM_LENGTH - 1)
+            self._last_ms = now_ms
+            random_part = self._last_random
+        return _encode(now_ms, TIMESTAMP_LENGTH) + worker + _encode(random_part, RANDOM_LENGTH)
+
+
+# Generator of this backend process
+task_ids = TaskIdGenerator(TASK_WORKER_ID or None)
+
+
+def new_task_id() -> str:
+    """A new task ID owned by this worker."""
+    return task_ids.new_id()
+
+
+def current_worker() -> str:
+    """Code of this worker, as embedded in the IDs it creates."""
+    return task_ids.worker
+
+
+def _is_task_id(task_id: str) -> bool:
+    return len(task_id) == TASK_ID_LENGTH and all(char in CROCKFORD_ALPHABET for char in task_id)
+
+
+def task_worker(task_id: str) -> Optional[str]:
+    """Code of the worker that created a task, or None for IDs of another format."""
+    if not _is_task_id(task_id):
+        return None
+    return task_id[TIMESTAMP_LENGTH:TIMESTAMP_LENGTH + WORKER_LENGTH]
+
+
+def task_created_ms(task_id: str) -> Optional[int]:
+    """Creation time of a task in epoch milliseconds, or None for IDs of another format."""
+    if not _is_task_id(task_id):
+        return None
+    return _decode(task_id[:TIMESTAMP_LENGTH])
+
+
+def is_local_task(task_id: str) -> bool:
+    """Whether a task was created by this worker (IDs of another format count as local)."""
+    worker = task_worker(task_id)
+    return worker is None or worker == current_worker()
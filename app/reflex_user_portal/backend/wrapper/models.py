@@ -1,38 +1,120 @@
-import uuid
-import datetime
+import time
+import json
+import hashlib
+import asyncio
 import logging
+from collections import Counter
+from enum import StrEnum
 from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
+
+from app.config import TASK_UPDATE_FLUSH_INTERVAL_MS, TASK_HISTORY_SIZE
+
+from .events import task_event_bus, state_topic, direct_topic
+from .status_cache import task_status_cache
+from .history import TaskHistory
+from .ids import new_task_id
+from .usage import TaskUsage
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-class TaskStatus:
-    """Task status constants."""
+# Update counters of all TaskContexts in this process (updates received, merged, flushes)
+task_update_stats: Counter = Counter()
+
+class TaskStatus(StrEnum):
+    """Task statuses (string-valued, so they compare and serialize as plain strings)."""
     PENDING = "PENDING"
     STARTING = "Starting"
     PROCESSING = "Processing"
     COMPLETED = "Completed"
     ERROR = "Error"
+    CANCELLED = "Cancelled"
+    TIMEOUT = "Timed Out"
+    RETRYING = "Retrying"
 
-@dataclass
+# Statuses that end a task
+TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.ERROR, TaskStatus.CANCELLED, TaskStatus.TIMEOUT)
+# Statuses of a task that is running (or waiting to retry)
+ACTIVE_STATUSES = (TaskStatus.STARTING, TaskStatus.PROCESSING, TaskStatus.RETRYING)
+
+@dataclass(slots=True)
 class TaskData:
-    """Data model for tracking task status and results."""
+    """Data model for tracking task status and results.
+
+    The message of a failed task is in `error`, its status is just TaskStatus.ERROR.
+    A task may also report a status string of its own, which is kept as it is.
+    `progress` is written along with status changes; while a task runs its latest
+    progress is in MonitorState.task_progress, so that a progress tick doesn't send
+    the whole record (result included) to the client again.
+    """
     id: str
     name: str
-    status: str = TaskStatus.PENDING
+    status: TaskStatus = TaskStatus.PENDING
     active: bool = True
     progress: int = 0
     result: Any = None
+    error: Optional[str] = None
+    # Current attempt of a task with a retry policy
+    attempt: int = 1
+    # Resources used by the finished run (queue_wait, wall_time, cpu_time, peak_rss_delta_kb)
+    usage: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the task for API responses and stream frames."""
+        return asdict(self)
+
+def hash_task_args(task_args: Any) -> Optional[str]:
+    """Stable hash of validated task arguments (pydantic model or dict)."""
+    if task_args is None:
+        return None
+    if hasattr(task_args, "model_dump"):
+        task_args = task_args.model_dump(mode="json")
+    payload = json.dumps(task_args, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def as_task_status(status: str) -> str:
+    """The TaskStatus member of a known status; custom status strings are kept as they are."""
+    try:
+        return TaskStatus(status)
+    except ValueError:
+        return status
+
+def is_terminal_status(status: Optional[str]) -> bool:
+    """Whether a status marks the end of a task."""
+    return status in TERMINAL_STATUSES
 
 class TaskContext:
-    """Context manager for updating task status in Reflex state."""
-    def __init__(self, state, task_id=None):
+    """Context manager for updating task status in Reflex state.
+
+    Updates are buffered and written to the state at most once per flush interval,
+    so a task reporting progress in a tight loop doesn't flood the state manager and
+    the websocket. A status change is written right away.
+    """
+    def __init__(self, state, task_id=None, flush_interval_ms: Optional[float] = None):
         self.state = state
         if task_id is None:
-            task_id = str(uuid.uuid4()[:8])
+            task_id = new_task_id()
         self.task_id = task_id
         self.progress = 0
+        self.status = None
+        self.state_name = state.get_full_name()
+        self.client_token = state.router.session.client_token
+        self.topic = state_topic(self.state_name, self.client_token)
+        if flush_interval_ms is None:
+            flush_interval_ms = TASK_UPDATE_FLUSH_INTERVAL_MS
+        self.flush_interval = flush_interval_ms / 1000
+        # Field values waiting for the next flush
+        self._pending: Dict[str, Any] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_flush = 0.0
+        self.updates = 0
+        self.merged = 0
+        self.flushes = 0
+        # Chunks yielded so far by an async generator task, for subscribers that resync
+        self.chunks: List[Any] = []
+        # Set by the decorator when the run starts
+        self.usage: Optional[TaskUsage] = None
         
     async def __aenter__(self):
         return self
@@ -42,17 +124,106 @@ class TaskContext:
         
     async def update(self, progress=None, status=None, result=None):
         """Update task progress, status and result in Reflex state"""
+        self.updates += 1
+        task_update_stats["updates"] += 1
+        if self._pending:
+            # Folded into the flush that is already due
+            self.merged += 1
+            task_update_stats["merged"] += 1
+        if progress is not None:
+            self.progress = progress
+            self._pending["progress"] = progress
+        if result is not None:
+            self._pending["result"] = result
+
+        if status is not None:
+            status = as_task_status(status)
+        status_changed = status is not None and status != self.status
+        if status is not None:
+            self.status = status
+            self._pending["status"] = status
+
+        wait = self._last_flush + self.flush_interval - time.monotonic()
+        if status_changed or wait <= 0:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._delayed_flush(wait))
+
+    async def record_retry(self, attempt: int, error: BaseException, delay: float):
+        """Show a failed attempt that will be retried after delay seconds."""
+        self.status = TaskStatus.RETRYING
+        self._pending.update(status=TaskStatus.RETRYING, attempt=attempt + 1)
+        await self.flush()
+
+    async def _delayed_flush(self, delay: float):
+        await asyncio.sleep(delay)
+        # Past this point the flush must not be cancelled by take_pending
+        self._flush_task = None
+        await self.flush()
+
+    def take_pending(self) -> Dict[str, Any]:
+        """Remove and return the buffered field values, cancelling the scheduled flush."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def apply(self, pending: Dict[str, Any]):
+        """Write buffered field values to the task; the caller holds the state lock."""
+        task = self.state.tasks[self.task_id]
+        if "progress" in pending:
+            task.progress = pending["progress"]
+            self.state.task_progress[self.task_id] = pending["progress"]
+        if "status" in pending:
+            task.status = pending["status"]
+            task.active = True
+            self.state.index_task(self.task_id)
+        if "result" in pending:
+            task.result = pending["result"]
+        if "attempt" in pending:
+            task.attempt = pending["attempt"]
+
+    async def flush(self):
+        """Write buffered updates to the state and notify subscribers."""
+        pending = self.take_pending()
+        if not pending:
+            return
+        progress_tick = pending.keys() == {"progress"}
         async with self.state:
-            if progress is not None:
-                self.progress = progress
-                self.state.tasks[self.task_id].progress = progress
-                
-            if status is not None:
-                self.state.tasks[self.task_id].status = status
-                self.state.tasks[self.task_id].active = True
-                
-            if result is not None:
-                self.state.tasks[self.task_id].result = result
+            if progress_tick:
+                # Only the small task_progress var changes, `tasks` isn't sent again
+                self.state.task_progress[self.task_id] = pending["progress"]
+            else:
+                self.apply(pending)
+                snapshot = self.state.tasks[self.task_id].to_dict()
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+        task_update_stats["flushes"] += 1
+        if progress_tick:
+            self.publish_progress(pending["progress"])
+        else:
+            self.publish(snapshot)
+
+    async def emit_chunk(self, chunk: Any):
+        """Stream a partial result of an async generator task to the session's subscribers.
+
+        Chunks aren't written to the state one by one; the task result holds all of them
+        and the context keeps them while the task runs.
+        """
+        self.chunks.append(chunk)
+        task_event_bus.publish(self.topic, {"id": self.task_id, "chunk_start": len(self.chunks) - 1, "chunks": [chunk]})
+
+    def publish(self, snapshot: Dict[str, Any]):
+        """Refresh the session's status cache and notify its stream subscribers."""
+        task_status_cache.put(self.state_name, self.client_token, snapshot)
+        task_event_bus.publish(self.topic, snapshot)
+
+    def publish_progress(self, progress: int):
+        """Publish a progress tick as the delta {id, progress} rather than a full snapshot."""
+        delta = {"id": self.task_id, "progress": progress}
+        task_status_cache.merge(self.state_name, self.client_token, delta)
+        task_event_bus.publish(self.topic, delta)
 
 class DirectTaskContext:
     """Task context for direct execution of tasks outside of Reflex state.
@@ -62,7 +233,8 @@ class DirectTaskContext:
     methods decorated with @monitored_background_task directly through the API.
     
     This class maintains its own task history with timestamps for each update,
-    making it easier to track task progress and status changes over time.
+    making it easier to track task progress and status changes over time. The
+    history is a ring buffer of TASK_HISTORY_SIZE entries numbered by `seq`.
     """
     def __init__(self, task_id, task_api):
         self.task_id = task_id
@@ -70,7 +242,15 @@ class DirectTaskContext:
         self.progress = 0
         self.status = TaskStatus.PENDING
         self.result = None
-        self.history = []
+        self.history = TaskHistory(TASK_HISTORY_SIZE)
+        # Partial results of an async generator task, in order
+        self.chunks: List[Any] = []
+        self.topic = direct_topic(task_api.state_name, task_id)
+        # Epoch times a scheduled run was due and the task body actually started
+        self.due_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        # Resources used by the run; it is queued from now on
+        self.usage = TaskUsage(queued_at=time.time())
         
         # Initialize with first history entry
         self._add_history_entry(progress=0, status=TaskStatus.STARTING)
@@ -82,12 +262,10 @@ class DirectTaskContext:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
     
-    def _add_history_entry(self, progress=None, status=None, message=None, result=None):
-        """Add an entry to the task history with the current timestamp."""
-        timestamp = datetime.datetime.now().isoformat()
-        
+    def _add_history_entry(self, progress=None, status=None, message=None, result=None, **details):
+        """Add an entry to the task history with the current timestamp and next seq."""
         # Only include non-None values in the history entry
-        entry = {"timestamp": timestamp}
+        entry = {}
         if progress is not None:
             entry["progress"] = progress
         if status is not None:
@@ -96,21 +274,22 @@ class DirectTaskContext:
             entry["message"] = message
         if result is not None:
             entry["result"] = result
+        entry.update(details)
             
-        self.history.append(entry)
-        return entry
+        return self.history.append(**entry)
         
-    async def update(self, progress=None, status=None, message=None, result=None):
+    async def update(self, progress=None, status=None, message=None, result=None, **details):
         """Update task progress, status and result.
         
         Records the update in task history with a timestamp and updates the
-        task_api's active_tasks for API endpoints.
+        task_api's registry entry for API endpoints.
         
         Args:
             progress: Optional progress value (0-100)
             status: Optional status string
             message: Optional status message
             result: Optional result data
+            **details: Further fields of the history entry
         """
         # Update local state
         if progress is not None:
@@ -121,17 +300,46 @@ class DirectTaskContext:
             self.result = result
             
         # Add to history
-        history_entry = self._add_history_entry(progress, status, message, result)
+        history_entry = self._add_history_entry(progress, status, message, result, **details)
         
-        # Update the task_api's active_tasks for API endpoints
-        if self.task_id in self.task_api.active_tasks:
+        # Update the task_api's registry entry for API endpoints
+        task_info = self.task_api.registry.get_info(self.task_id)
+        if task_info is not None:
             if progress is not None:
-                self.task_api.active_tasks[self.task_id]["progress"] = progress
+                task_info["progress"] = progress
             if status is not None:
-                self.task_api.active_tasks[self.task_id]["status"] = status
+                task_info["status"] = status
             if message is not None:
-                self.task_api.active_tasks[self.task_id]["message"] = message
+                task_info["message"] = message
             if result is not None:
-                self.task_api.active_tasks[self.task_id]["result"] = result
+                task_info["result"] = result
+
+        # Wake up the streams watching this task
+        task_event_bus.publish(self.topic, history_entry)
+
+        # Queue the change for the durable task store
+        changes = {
+            key: value for key, value in
+            (("progress", progress), ("status", status), ("result", result))
+            if value is not None
+        }
+        if changes:
+            from .store import task_store
+            task_store.record(self.task_id, **changes)
         
-        logger.debug(f"Task {self.task_id} updated: progress={progress}, status={status}, message={message}, timestamp={history_entry['timestamp']}")
\ No newline at end of file
+        logger.debug(f"Task {self.task_id} updated: progress={progress}, status={status}, message={message}, timestamp={history_entry['timestamp']}")
+
+    async def record_retry(self, attempt: int, error: BaseException, delay: float):
+        """Record a failed attempt that will be retried after delay seconds."""
+        await self.update(
+            status=TaskStatus.RETRYING,
+            message=f"Attempt {attempt} failed: {error}",
+            attempt=attempt,
+            error=str(error),
+            retry_in=round(delay, 3),
+        )
+
+    async def emit_chunk(self, chunk: Any):
+        """Append a partial result of an async generator task and wake up its streams."""
+        self.chunks.append(chunk)
+        task_event_bus.publish(self.topic, {"chunk_index": len(self.chunks) - 1})
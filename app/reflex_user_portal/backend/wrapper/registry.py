@@ -0,0 +1,161 @@
+"""
+Bounded in-memory registry for directly executed tasks.
+
+Running tasks are always kept. Finished tasks are dropped once their TTL expires or
+when the registry is over capacity (least recently used first); their outcome moves to
+a compact archive so results can still be served for a while after eviction.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TaskEntry:
+    """A live task: its API-facing info dict and the context that drives it."""
+    info: Dict[str, Any]
+    context: Any = None
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class ArchivedTask:
+    """What remains of a task after eviction from the registry."""
+    status: str
+    progress: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None
+    finished_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "usage": self.usage,
+        }
+
+
+class TaskRegistry:
+    """LRU/TTL registry of direct tasks with a compact archive of evicted results."""
+    def __init__(self, max_size: int = 1000, ttl: float = 3600, archive_size: int = 10000):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.archive_size = archive_size
+        # Live tasks in least-recently-used order
+        self._entries: "OrderedDict[str, TaskEntry]" = OrderedDict()
+        # Finished task IDs in finishing order (monotonic finish time), for TTL expiry
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        # Finished task IDs in least-recently-used order, for capacity eviction
+        self._finished_lru: "OrderedDict[str, None]" = OrderedDict()
+        self._archive: "OrderedDict[str, ArchivedTask]" = OrderedDict()
+        self.ttl_evictions = 0
+        self.lru_evictions = 0
+        self.archive_evictions = 0
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, task_id: str, info: Dict[str, Any], context: Any = None) -> TaskEntry:
+        """Register a new task, evicting expired or excess finished tasks."""
+        self.evict_expired()
+        entry = TaskEntry(info=info, context=context)
+        self._entries[task_id] = entry
+        # A re-added task is running again
+        self._finished.pop(task_id, None)
+        self._finished_lru.pop(task_id, None)
+        self._archive.pop(task_id, None)
+        self._evict_overflow()
+        return entry
+
+    def get(self, task_id: str) -> Optional[TaskEntry]:
+        """Get a live task entry and mark it as recently used."""
+        self.evict_expired()
+        entry = self._entries.get(task_id)
+        if entry is not None:
+            self._entries.move_to_end(task_id)
+            if entry.finished_at is not None:
+                self._finished_lru.move_to_end(task_id)
+        return entry
+
+    def get_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.get(task_id)
+        return entry.info if entry else None
+
+    def get_context(self, task_id: str) -> Any:
+        entry = self.get(task_id)
+        return entry.context if entry else None
+
+    def get_archived(self, task_id: str) -> Optional[ArchivedTask]:
+        return self._archive.get(task_id)
+
+    def mark_finished(self, task_id: str):
+        """Start the TTL clock of a task that reached a terminal status."""
+        entry = self._entries.get(task_id)
+        if entry is None or entry.finished_at is not None:
+            return
+        entry.finished_at = time.monotonic()
+        self._finished[task_id] = entry.finished_at
+        self._finished_lru[task_id] = None
+        self._evict_overflow()
+
+    def evict_expired(self):
+        """Archive finished tasks whose TTL has elapsed."""
+        deadline = time.monotonic() - self.ttl
+        while self._finished:
+            task_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > deadline:
+                break
+            self._evict(task_id)
+            self.ttl_evictions += 1
+
+    def _evict_overflow(self):
+        """Archive least recently used finished tasks while over capacity."""
+        while len(self._entries) > self.max_size and self._finished_lru:
+            self._evict(next(iter(self._finished_lru)))
+            self.lru_evictions += 1
+        if len(self._entries) > self.max_size:
+            logger.warning(
+                f"Task registry holds {len(self._entries)} running tasks, above its max size of {self.max_size}"
+            )
+
+    def _evict(self, task_id: str):
+        entry = self._entries.pop(task_id, None)
+        self._finished.pop(task_id, None)
+        self._finished_lru.pop(task_id, None)
+        if entry is None:
+            return
+        self._archive[task_id] = ArchivedTask(
+            status=entry.info.get("status"),
+            progress=entry.info.get("progress", 0),
+            result=entry.info.get("result"),
+            error=entry.info.get("error"),
+            usage=entry.info.get("usage"),
+        )
+        while len(self._archive) > self.archive_size:
+            self._archive.popitem(last=False)
+            self.archive_evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Sizes and eviction counters, for the stats endpoint."""
+        return {
+            "size": len(self._entries),
+            "running": len(self._entries) - len(self._finished),
+            "finished": len(self._finished),
+            "archived": len(self._archive),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "ttl_evictions": self.ttl_evictions,
+            "lru_evictions": self.lru_evictions,
+            "archive_evictions": self.archive_evictions,
+        }
@@ -0,0 +1,78 @@
+"""
+Retry policies of monitored tasks.
+
+A task declared with `@monitored_background_task(retry=...)` is run again when it
+raises one of the policy's exception types, after an exponentially growing delay
+with random jitter (so tasks that failed together don't retry in lockstep). Each
+failed attempt is reported to the task context before the wait, which records it
+in the task history.
+"""
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type, Union
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how often a failing task is run again.
+
+    Attributes:
+        max_attempts: Attempts in total, including the first one.
+        backoff: Seconds to wait before the first retry.
+        multiplier: Factor applied to the delay after each retry.
+        max_backoff: Upper bound of the delay in seconds.
+        jitter: Fraction of the delay that is randomized (0 for none, 1 for "full jitter").
+        retry_on: Exception types that trigger a retry; other errors fail the task at once.
+    """
+    max_attempts: int = 3
+    backoff: float = 1.0
+    multiplier: float = 2.0
+    max_backoff: float = 60.0
+    jitter: float = 0.5
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given (1-based) failed attempt."""
+        delay = min(self.backoff * self.multiplier ** (attempt - 1), self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        return attempt < self.max_attempts and isinstance(error, self.retry_on)
+
+
+def as_retry_policy(retry: Union[RetryPolicy, int, None]) -> Optional[RetryPolicy]:
+    """Normalize the decorator's `retry` option; an int is a number of attempts."""
+    if retry is None or isinstance(retry, RetryPolicy):
+        return retry
+    if isinstance(retry, int) and not isinstance(retry, bool):
+        return RetryPolicy(max_attempts=retry)
+    raise ValueError(f"Invalid retry option {retry!r}: expected a RetryPolicy or a number of attempts")
+
+
+async def call_with_retry(
+        policy: Optional[RetryPolicy],
+        attempt_fn: Callable[[], Awaitable[Any]],
+        on_retry: Callable[[int, BaseException, float], Awaitable[None]],
+    ) -> Any:
+    """Await attempt_fn() until it succeeds or the policy gives up (re-raising the last error).
+
+    on_retry(attempt, error, delay) is awaited after every failed attempt that is retried.
+    """
+    attempt = 1
+    while True:
+        try:
+            return await attempt_fn()
+        except Exception as e:
+            if policy is None or not policy.should_retry(e, attempt):
+                raise
+            delay = policy.delay(attempt)
+            await on_retry(attempt, e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
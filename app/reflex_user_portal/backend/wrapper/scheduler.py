@@ -0,0 +1,190 @@
+"""
+Concurrency-limited scheduler for directly executed tasks.
+
+Submitted tasks wait in one of three priority lanes until both a global slot and a
+slot of their state are free. The number of waiting tasks is bounded; submissions
+beyond it are rejected with a TaskQueueFullError carrying a Retry-After estimate.
+"""
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.config import TASK_MAX_CONCURRENCY, TASK_MAX_CONCURRENCY_PER_STATE, TASK_MAX_PENDING
+
+from ...utils.error_handler import TaskQueueFullError
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lanes in dispatch order
+PRIORITIES = ("high", "normal", "low")
+
+
+@dataclass
+class ScheduledJob:
+    """A task waiting for, or holding, a scheduler slot."""
+    task_id: str
+    state_name: str
+    priority: str
+    factory: Callable[[], Awaitable[Any]]
+    enqueued_at: float
+    started_at: Optional[float] = None
+    handle: Optional[asyncio.Task] = None
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Seconds spent in the queue, once started."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.enqueued_at
+
+
+class TaskScheduler:
+    """Run task coroutines under a global and a per-state concurrency cap."""
+    def __init__(self, max_concurrency: int = 8, max_per_state: int = 4, max_pending: int = 1000):
+        self.max_concurrency = max_concurrency
+        self.max_per_state = max_per_state
+        self.max_pending = max_pending
+        self._lanes: Dict[str, Deque[ScheduledJob]] = {priority: deque() for priority in PRIORITIES}
+        self._running = 0
+        self._running_by_state: Counter = Counter()
+        # Waiting and running jobs by task ID, for cancellation
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self.submitted = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.started = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        # Moving average of task run time, used for the Retry-After estimate
+        self.avg_run_time = 1.0
+
+    @property
+    def pending(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def submit(self, task_id: str, state_name: str, factory: Callable[[], Awaitable[Any]],
+               priority: str = "normal", dispatch: bool = True) -> ScheduledJob:
+        """Queue a task coroutine factory and start it as soon as slots allow.
+
+        Pass dispatch=False when queueing several tasks at once and call dispatch() after.
+
+        Raises:
+            ValueError: If the priority is not one of PRIORITIES.
+            TaskQueueFullError: If max_pending tasks are already waiting.
+        """
+        if priority not in self._lanes:
+            raise ValueError(f"Invalid priority '{priority}'. Available priorities: {list(PRIORITIES)}")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise TaskQueueFullError(self.retry_after())
+
+        job = ScheduledJob(
+            task_id=task_id,
+            state_name=state_name,
+            priority=priority,
+            factory=factory,
+            enqueued_at=time.monotonic(),
+        )
+        self._lanes[priority].append(job)
+        self._jobs[task_id] = job
+        self.submitted += 1
+        if dispatch:
+            self.dispatch()
+        return job
+
+    def dispatch(self):
+        """Start waiting jobs, highest priority first, while slots are free."""
+        for priority in PRIORITIES:
+            lane = self._lanes[priority]
+            if not lane:
+                continue
+            waiting: Deque[ScheduledJob] = deque()
+            while lane:
+                job = lane.popleft()
+                if self._running >= self.max_concurrency:
+                    waiting.append(job)
+                    waiting.extend(lane)
+                    lane.clear()
+                    break
+                if self._running_by_state[job.state_name] >= self.max_per_state:
+                    # Let jobs of other states go ahead
+                    waiting.append(job)
+                    continue
+                self._start(job)
+            lane.extend(waiting)
+
+    def _start(self, job: ScheduledJob):
+        job.started_at = time.monotonic()
+        self._running += 1
+        self._running_by_state[job.state_name] += 1
+        self.started += 1
+        self.wait_total += job.queue_wait
+        self.wait_max = max(self.wait_max, job.queue_wait)
+        job.handle = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: ScheduledJob):
+        try:
+            await job.factory()
+        except Exception as e:
+            logger.error(f"Scheduled task {job.task_id} failed: {str(e)}")
+        finally:
+            self._jobs.pop(job.task_id, None)
+            self._running -= 1
+            self._running_by_state[job.state_name] -= 1
+            if not self._running_by_state[job.state_name]:
+                del self._running_by_state[job.state_name]
+            run_time = time.monotonic() - job.started_at
+            self.avg_run_time = 0.8 * self.avg_run_time + 0.2 * run_time
+            self.dispatch()
+
+    def cancel(self, task_id: str) -> Optional[ScheduledJob]:
+        """Cancel a waiting or running job. Returns the job, or None if it isn't scheduled.
+
+        A waiting job is dropped from its lane (its factory never runs). A running job's
+        asyncio task is cancelled; its slots are released as soon as the cancellation lands.
+        """
+        job = self._jobs.get(task_id)
+        if job is None:
+            return None
+        self.cancelled += 1
+        if job.handle is None:
+            self._lanes[job.priority].remove(job)
+            del self._jobs[task_id]
+        else:
+            job.handle.cancel()
+        return job
+
+    def retry_after(self) -> int:
+        """Estimated seconds until a queued task would start."""
+        waves = (self.pending + 1) / max(self.max_concurrency, 1)
+        return max(1, math.ceil(waves * self.avg_run_time))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running counts and wait times, for the stats endpoint."""
+        return {
+            "pending": self.pending,
+            "pending_by_priority": {priority: len(lane) for priority, lane in self._lanes.items()},
+            "running": self._running,
+            "running_by_state": dict(self._running_by_state),
+            "max_concurrency": self.max_concurrency,
+            "max_per_state": self.max_per_state,
+            "max_pending": self.max_pending,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "avg_wait_seconds": self.wait_total / self.started if self.started else 0.0,
+            "max_wait_seconds": self.wait_max,
+            "avg_run_seconds": self.avg_run_time,
+        }
+
+
+# Shared scheduler for the whole backend process
+task_scheduler = TaskScheduler(
+    max_concurrency=TASK_MAX_CONCURRENCY,
+    max_per_state=TASK_MAX_CONCURRENCY_PER_STATE,
+    max_pending=TASK_MAX_PENDING,
+)
@@ -0,0 +1,138 @@
+"""
+Read-only snapshots of the tasks of each client session.
+
+Task contexts write every task snapshot they publish into this cache, so the status
+and result endpoints can answer without taking the session's state lock (and, with
+Redis, without writing the state back). Only tasks running in this process are written
+here, so the cache isn't trusted blindly: a session is (re-)read from the state manager
+with a read-only `get_state` when it was never read, when a requested task isn't cached,
+or when the cached snapshot of a running task (or, for a listing, the last read of the
+session) is older than `max_age` seconds.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.config import TASK_STATUS_CACHE_MAX_SESSIONS, TASK_STATUS_CACHE_MAX_AGE_SECONDS
+
+SessionKey = Tuple[str, str]
+
+
+class TaskStatusCache:
+    """Per-session task snapshots (state name, client token) -> {task_id: snapshot}."""
+    def __init__(self, max_sessions: int = 1000, max_age: float = 2.0):
+        self.max_sessions = max_sessions
+        self.max_age = max_age
+        # Sessions in least-recently-used order
+        self._sessions: "OrderedDict[SessionKey, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        # When each cached snapshot was written (monotonic), per session
+        self._written: Dict[SessionKey, Dict[str, float]] = {}
+        # When each session was last read from the state manager (monotonic)
+        self._read_at: Dict[SessionKey, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _session(self, key: SessionKey) -> Dict[str, Dict[str, Any]]:
+        tasks = self._sessions.get(key)
+        if tasks is None:
+            tasks = self._sessions[key] = {}
+            self._written[key] = {}
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                self._written.pop(evicted, None)
+                self._read_at.pop(evicted, None)
+                self.evictions += 1
+        else:
+            self._sessions.move_to_end(key)
+        return tasks
+
+    def put(self, state_name: str, client_token: str, snapshot: Dict[str, Any]):
+        """Record the latest snapshot of a task."""
+        key = (state_name, client_token)
+        self._session(key)[snapshot["id"]] = snapshot
+        self._written[key][snapshot["id"]] = time.monotonic()
+
+    def merge(self, state_name: str, client_token: str, delta: Dict[str, Any]):
+        """Apply a partial update {id, <field>: <value>} to a cached snapshot.
+
+        Ignored for tasks not cached yet; reading the state picks up their latest values.
+        """
+        key = (state_name, client_token)
+        tasks = self._sessions.get(key)
+        snapshot = tasks.get(delta["id"]) if tasks is not None else None
+        if snapshot is not None:
+            # Replaced rather than changed in place, published snapshots stay as they were
+            tasks[delta["id"]] = {**snapshot, **delta}
+            self._written[key][delta["id"]] = time.monotonic()
+
+    def discard(self, state_name: str, client_token: str, task_ids: Iterable[str]):
+        """Forget tasks a session no longer keeps, even in its archive."""
+        key = (state_name, client_token)
+        tasks = self._sessions.get(key)
+        if tasks is not None:
+            for task_id in task_ids:
+                tasks.pop(task_id, None)
+                self._written[key].pop(task_id, None)
+
+    def get(self, state_name: str, client_token: str,
+            task_id: Optional[str] = None) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Task snapshots of a session, or None if it has to be read from the state first.
+
+        With task_id, the cache answers if it holds that task and its snapshot is either
+        final (`active` false) or recent; without, if the session was read from the state
+        recently.
+        """
+        key = (state_name, client_token)
+        read_at = self._read_at.get(key)
+        now = time.monotonic()
+        if read_at is None:
+            fresh = False
+        elif task_id is None:
+            fresh = now - read_at <= self.max_age
+        else:
+            snapshot = self._sessions[key].get(task_id)
+            fresh = snapshot is not None and (
+                not snapshot.get("active", True)
+                or now - self._written[key].get(task_id, read_at) <= self.max_age
+            )
+        if not fresh:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._session(key)
+
+    def seed(self, state_name: str, client_token: str, snapshots: Dict[str, Dict[str, Any]],
+             read_at: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Load the tasks read from the state (read started at read_at, monotonic).
+
+        Snapshots published in this process after the read started win; other cached
+        tasks are replaced by what the state holds.
+        """
+        key = (state_name, client_token)
+        if read_at is None:
+            read_at = time.monotonic()
+        tasks = self._session(key)
+        written = self._written[key]
+        for task_id, snapshot in snapshots.items():
+            if written.get(task_id, float("-inf")) < read_at:
+                tasks[task_id] = snapshot
+                written[task_id] = read_at
+        self._read_at[key] = read_at
+        return tasks
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "max_age_seconds": self.max_age,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Shared cache for the whole backend process
+task_status_cache = TaskStatusCache(
+    max_sessions=TASK_STATUS_CACHE_MAX_SESSIONS, max_age=TASK_STATUS_CACHE_MAX_AGE_SECONDS,
+)
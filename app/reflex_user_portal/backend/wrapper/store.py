@@ -0,0 +1,148 @@
+"""
+Durable SQL store for directly executed tasks.
+
+Status updates are merged per task in memory and written in batches, so a task
+reporting progress in a tight loop costs one row write per flush interval rather
+than one per update. Terminal statuses are flushed right away. Rows are upserted
+with plain session get/add so the store works the same on SQLite and Postgres.
+The table is created by the Alembic migrations (`reflex db migrate`).
+"""
+import asyncio
+import contextlib
+import datetime
+from datetime import timezone
+from typing import Any, Dict, Optional
+
+import reflex as rx
+from fastapi.encoders import jsonable_encoder
+
+from app.models.task import TaskRecord
+from app.config import TASK_STORE_ENABLED, TASK_STORE_FLUSH_INTERVAL_SECONDS
+
+from .models import is_terminal_status
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _to_json(value: Any) -> Any:
+    """Make a task result storable in a JSON column."""
+    try:
+        return jsonable_encoder(value)
+    except Exception:
+        return repr(value)
+
+
+class TaskStore:
+    """Batched writer and reader of TaskRecord rows."""
+    def __init__(self, enabled: bool = True, flush_interval: float = 1.0):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        # Column values waiting to be written, merged per task ID
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self.rows_written = 0
+        self.flushes = 0
+
+    def record(self, task_id: str, **values):
+        """Queue column values of a task for the next batched write."""
+        if not self.enabled:
+            return
+        if "result" in values:
+            values["result"] = _to_json(values["result"])
+        now = datetime.datetime.now(timezone.utc)
+        values["updated_at"] = now
+        if is_terminal_status(values.get("status")):
+            values.setdefault("finished_at", now)
+        self._pending.setdefault(task_id, {}).update(values)
+
+        if values.get("finished_at") is not None:
+            self._schedule_flush(0)
+        else:
+            self._schedule_flush(self.flush_interval)
+
+    def _schedule_flush(self, delay: float):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (e.g. called from a script); write synchronously
+            self._write(self._take_pending())
+            return
+        if self._flush_handle is not None:
+            if delay > 0:
+                return
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_later(delay, lambda: asyncio.ensure_future(self.flush()))
+
+    def _take_pending(self) -> Dict[str, Dict[str, Any]]:
+        batch, self._pending = self._pending, {}
+        return batch
+
+    async def flush(self):
+        """Write all pending updates in one transaction."""
+        self._flush_handle = None
+        async with self._flush_lock:
+            batch = self._take_pending()
+            if not batch:
+                return
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} task records: {str(e)}")
+
+    def _write(self, batch: Dict[str, Dict[str, Any]]):
+        if not batch:
+            return
+        with rx.session() as session:
+            for task_id, values in batch.items():
+                record = session.get(TaskRecord, task_id)
+                if record is None:
+                    record = TaskRecord(id=task_id, **values)
+                else:
+                    for key, value in values.items():
+                        setattr(record, key, value)
+                session.add(record)
+            session.commit()
+        self.rows_written += len(batch)
+        self.flushes += 1
+
+    def _read(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with rx.session() as session:
+            record = session.get(TaskRecord, task_id)
+            return record.model_dump() if record else None
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read a task record, including updates not flushed yet."""
+        if not self.enabled:
+            return None
+        try:
+            record = await asyncio.to_thread(self._read, task_id)
+        except Exception as e:
+            logger.error(f"Failed to read task record {task_id}: {str(e)}")
+            record = None
+        pending = self._pending.get(task_id)
+        if pending:
+            record = {**(record or {"id": task_id}), **pending}
+        return record
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+        }
+
+
+# Shared store for the whole backend process
+task_store = TaskStore(enabled=TASK_STORE_ENABLED, flush_interval=TASK_STORE_FLUSH_INTERVAL_SECONDS)
+
+
+@contextlib.asynccontextmanager
+async def task_store_lifespan():
+    """App lifespan task that writes pending task records on shutdown."""
+    try:
+        yield
+    finally:
+        await task_store.flush()
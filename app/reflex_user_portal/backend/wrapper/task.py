@@ -1,24 +1,107 @@
 import reflex as rx
+import asyncio
 import functools
-import uuid
 import inspect
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Tuple, Type, Union
 
 from .models import TaskData, TaskStatus, TaskContext
+from .executor import EXECUTORS, call_task_function, process_executor, run_with_timeout
+from .ids import new_task_id
+from .retry import RetryPolicy, as_retry_policy, call_with_retry
+from .cron import parse_cron
+from .usage import TaskUsage, run_metered, task_usage_stats
 
+from ...utils.error_handler import TaskTimeoutError
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
-def monitored_background_task(func):
+
+# Running client-event tasks: (state name, client token, task ID) -> asyncio task
+_running_state_tasks: Dict[Tuple[str, str, str], asyncio.Task] = {}
+# Their task contexts, under the same keys
+_running_state_contexts: Dict[Tuple[str, str, str], TaskContext] = {}
+
+def get_state_task_context(state_name: str, client_token: str, task_id: str) -> Optional[TaskContext]:
+    """Context of a client-event task running in this process, if any."""
+    return _running_state_contexts.get((state_name, client_token, task_id))
+
+def cancel_state_task(state_name: str, client_token: str, task_id: str) -> bool:
+    """Cancel a running client-event task. Returns False if it isn't running in this process."""
+    handle = _running_state_tasks.get((state_name, client_token, task_id))
+    if handle is None or handle.done():
+        return False
+    handle.cancel()
+    return True
+
+def _claim_task_argument(state: rx.State, task_name: str):
+    """Pop the oldest (task_id, task_args, queued_at) the task API queued for task_name, if any."""
+    for task_id, entry in getattr(state, "tasks_argument", {}).items():
+        if entry.get("task_name") == task_name:
+            state.tasks_argument.pop(task_id)
+            return task_id, entry.get("task_args"), entry.get("queued_at")
+    return None, None, None
+
+def monitored_background_task(func=None, *, executor: str = "loop", update_interval_ms: Optional[float] = None,
+                              timeout: Optional[float] = None, memoize: bool = False,
+                              retry: Union[RetryPolicy, int, None] = None, schedule: Optional[str] = None):
     """
     Decorator that wraps rx.event(background=True) to add task monitoring.
     Usage: 
         @monitored_background_task
+        @monitored_background_task(executor="process")
+        @monitored_background_task(update_interval_ms=250)
+        @monitored_background_task(timeout=60)
+        @monitored_background_task(memoize=True)
+        @monitored_background_task(retry=RetryPolicy(max_attempts=3, backoff=0.5, retry_on=(ConnectionError,)))
+        @monitored_background_task(schedule="*/15 * * * *")
 
     The decorated function receives a TaskContext instance as its second argument (commonly named 'task').
     You can call task.update(progress=..., status=...) inside your function to update the task's progress/status,
     which will be reflected in the UI or any monitoring system.
+
+    With executor="process" the function body runs in the shared process pool, for CPU-bound work.
+    It must be importable by its qualified name, its arguments and result must be picklable,
+    and it receives None instead of the state as `self`.
+
+    Progress updates are written to the state at most once every update_interval_ms
+    (TASK_UPDATE_FLUSH_INTERVAL_MS by default); status changes are written immediately.
+
+    With timeout (seconds) the task is stopped once it runs longer and ends with
+    status TaskStatus.TIMEOUT; a task cancelled through the API ends with TaskStatus.CANCELLED.
+
+    With memoize=True a request repeating the parameters of an earlier call (within
+    TASK_IDEMPOTENCY_TTL_SECONDS) gets that task instead of a new run, unless it failed.
+
+    With retry (a RetryPolicy, or a number of attempts) a task raising one of the policy's
+    exception types runs again after an exponential backoff with jitter; the status is
+    TaskStatus.RETRYING while it waits and every failed attempt is recorded in the task
+    history. A timeout covers all attempts together.
+
+    Every run records its queue wait, wall time, CPU time and peak memory growth in
+    TaskData.usage (see wrapper/usage.py); the stats endpoint aggregates them per task.
+
+    With schedule (a cron expression, evaluated in UTC) a static-method task is also started
+    through the direct-execution path whenever the expression is due, unless its previous
+    scheduled run is still going.
+
+    The function may also be an async generator: every yielded chunk is streamed to
+    websocket and SSE subscribers as it arrives, and the task result is the list of chunks.
     """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Invalid executor '{executor}'. Available executors: {list(EXECUTORS)}")
+    retry = as_retry_policy(retry)
+    cron = parse_cron(schedule)
+    if func is not None and executor == "process" and inspect.isasyncgenfunction(func):
+        raise ValueError("Async generator tasks can't use executor='process'")
+    if func is not None and retry is not None and inspect.isasyncgenfunction(func):
+        # Chunks of a failed attempt were already streamed to subscribers
+        raise ValueError("Async generator tasks can't be retried")
+    if func is None:
+        return functools.partial(
+            monitored_background_task, executor=executor, update_interval_ms=update_interval_ms, timeout=timeout,
+            memoize=memoize, retry=retry, schedule=schedule,
+        )
+
     @rx.event(background=True)
     @functools.wraps(func)
     async def wrapper(state: rx.State, **kwargs) -> Any:
@@ -27,11 +110,12 @@ def monitored_background_task(func):
         logger.info(f"Initializing monitored background task {func.__name__}")
         # Initialize task
         async with state:
-            if getattr(state, "tasks_argument", {}):
-                task_id, task_args = state.tasks_argument.popitem()
-                kwargs.update({"task_args": task_args} if task_args else task_args)
-            else:
-                task_id = str(uuid.uuid4())[:8]
+            # Arguments queued by the task API for this task (there may be several, e.g. from a batch)
+            task_id, task_args, queued_at = _claim_task_argument(state, func.__name__)
+            if task_args:
+                kwargs.update({"task_args": task_args})
+            if task_id is None:
+                task_id = new_task_id()
             state.tasks[task_id] = TaskData(
                 id=task_id,
                 name=func.__name__.replace('_', ' ').title(),
@@ -40,28 +124,91 @@ def monitored_background_task(func):
                 progress=0,
                 result=None
             )
+            state.index_task(task_id)
+            snapshot = state.tasks[task_id].to_dict()
+        # Create task context
+        task_ctx = TaskContext(state, task_id, flush_interval_ms=update_interval_ms)
+        # Events not triggered by the task API have no queue wait
+        task_ctx.usage = TaskUsage(queued_at=queued_at)
+        task_ctx.publish(snapshot)
+        task_key = (task_ctx.state_name, task_ctx.client_token, task_id)
+        _running_state_tasks[task_key] = asyncio.current_task()
+        _running_state_contexts[task_key] = task_ctx
         try:
             logger.info(f"Kick off task {func.__name__}")
-            # Create task context
-            task_ctx = TaskContext(state, task_id)
-            result = await func(state, task_ctx, **kwargs)
-            # Mark task as complete with final result
+            result = await run_with_timeout(
+                run_metered(
+                    call_with_retry(
+                        retry, lambda: call_task_function(func, (state,), task_ctx, kwargs), task_ctx.record_retry
+                    ),
+                    task_ctx.usage,
+                ),
+                timeout,
+            )
+            # Mark task as complete with final result (buffered updates are superseded)
+            task_ctx.take_pending()
             async with state:
                 state.tasks[task_id].status = TaskStatus.COMPLETED
                 state.tasks[task_id].progress = 100
                 state.tasks[task_id].active = False
                 state.tasks[task_id].result = result
+                state.tasks[task_id].usage = task_ctx.usage.to_dict()
+                state.index_task(task_id)
+                snapshot = state.tasks[task_id].to_dict()
+                state.prune_tasks()
+            task_ctx.publish(snapshot)
+        except (asyncio.CancelledError, TaskTimeoutError) as e:
+            timed_out = isinstance(e, TaskTimeoutError)
+            message = e.message if timed_out else "Task cancelled"
+            logger.warning(f"{message}: {task_id}")
+            pending = task_ctx.take_pending()
+            async with state:
+                task_ctx.apply(pending)
+                state.tasks[task_id].status = TaskStatus.TIMEOUT if timed_out else TaskStatus.CANCELLED
+                state.tasks[task_id].active = False
+                state.tasks[task_id].result = {"error": message}
+                state.tasks[task_id].error = message
+                state.tasks[task_id].usage = task_ctx.usage.to_dict()
+                state.index_task(task_id)
+                snapshot = state.tasks[task_id].to_dict()
+                state.prune_tasks()
+            task_ctx.publish(snapshot)
+            if not timed_out:
+                raise
         except Exception as e:
             # Handle errors
             logger.error(f"Error in task {task_id}: {str(e)}")
+            pending = task_ctx.take_pending()
             async with state:
-                state.tasks[task_id].status = f"{TaskStatus.ERROR}: {str(e)}"
+                task_ctx.apply(pending)
+                state.tasks[task_id].status = TaskStatus.ERROR
                 state.tasks[task_id].active = False
                 state.tasks[task_id].result = {"error": str(e)}
+                state.tasks[task_id].error = str(e)
+                state.tasks[task_id].usage = task_ctx.usage.to_dict()
+                state.index_task(task_id)
+                snapshot = state.tasks[task_id].to_dict()
+                state.prune_tasks()
+            task_ctx.publish(snapshot)
             raise
+        finally:
+            _running_state_tasks.pop(task_key, None)
+            _running_state_contexts.pop(task_key, None)
+            task_usage_stats.record(task_ctx.state_name, func.__name__, task_ctx.usage)
+            logger.debug(
+                f"Task {task_id} updates: {task_ctx.updates} received, "
+                f"{task_ctx.merged} merged, {task_ctx.flushes} flushes"
+            )
 
     func.is_monitored_background_task = True
     wrapper.is_monitored_background_task = True
+    func.executor = wrapper.executor = executor
+    func.timeout = wrapper.timeout = timeout
+    func.memoize = wrapper.memoize = memoize
+    func.retry = wrapper.retry = retry
+    func.schedule = wrapper.schedule = cron
+    if executor == "process":
+        process_executor.register(func)
     
     # Copy the original function name and docstring
     wrapper.__name__ = func.__name__
@@ -0,0 +1,154 @@
+"""
+Resource accounting of monitored tasks.
+
+Each run records its queue wait, wall time, CPU time and the growth of the peak
+resident set size (RSS) of the process that ran it. Tasks on the event loop share
+the thread with every other coroutine, so their CPU time is measured per step: only
+the time spent inside the task's own coroutine counts. Process-executor tasks are
+measured in the worker process. Peak RSS growth is used rather than tracemalloc
+peaks, since tracing every allocation would slow down the whole web server; while
+tasks overlap on the loop it is shared between them and is an upper bound.
+
+Finished runs are aggregated per (state, task name) for the stats endpoint and the
+admin dashboard.
+"""
+import sys
+import time
+import types
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Coroutine, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_kb() -> int:
+    """Peak resident set size of this process so far, in KiB (0 where unavailable)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class TaskUsage:
+    """Resources used by one task run (seconds and KiB)."""
+    # Epoch times the task was queued and its body started
+    queued_at: Optional[float] = None
+    started_at: Optional[float] = None
+    queue_wait: Optional[float] = None
+    wall_time: Optional[float] = None
+    cpu_time: float = 0.0
+    peak_rss_delta_kb: int = 0
+    _start_perf: Optional[float] = None
+    _start_rss: int = 0
+
+    def start(self):
+        self.started_at = time.time()
+        if self.queued_at is not None:
+            self.queue_wait = max(self.started_at - self.queued_at, 0.0)
+        self._start_perf = time.perf_counter()
+        self._start_rss = max_rss_kb()
+
+    def finish(self):
+        if self._start_perf is None:
+            return
+        self.wall_time = time.perf_counter() - self._start_perf
+        self.peak_rss_delta_kb = max(self.peak_rss_delta_kb, max_rss_kb() - self._start_rss)
+
+    def add_remote(self, remote: Dict[str, Any]):
+        """Add what a worker process measured for the task."""
+        self.cpu_time += remote.get("cpu_time", 0.0)
+        self.peak_rss_delta_kb = max(self.peak_rss_delta_kb, remote.get("peak_rss_delta_kb", 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Usage so far (a running task reports its elapsed wall time)."""
+        wall_time = self.wall_time
+        if wall_time is None and self._start_perf is not None:
+            wall_time = time.perf_counter() - self._start_perf
+        return {
+            "queue_wait": None if self.queue_wait is None else round(self.queue_wait, 4),
+            "wall_time": None if wall_time is None else round(wall_time, 4),
+            "cpu_time": round(self.cpu_time, 4),
+            "peak_rss_delta_kb": self.peak_rss_delta_kb,
+        }
+
+
+@types.coroutine
+def _metered(coro: Coroutine, usage: TaskUsage):
+    """Drive coro like `await coro`, adding the thread CPU time of each of its steps to usage."""
+    send_value, error = None, None
+    while True:
+        step_start = time.thread_time()
+        try:
+            if error is not None:
+                yielded = coro.throw(error)
+            else:
+                yielded = coro.send(send_value)
+        except StopIteration as stop:
+            usage.cpu_time += time.thread_time() - step_start
+            return stop.value
+        except BaseException:
+            usage.cpu_time += time.thread_time() - step_start
+            raise
+        usage.cpu_time += time.thread_time() - step_start
+        try:
+            send_value, error = (yield yielded), None
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as e:
+            send_value, error = None, e
+
+
+async def run_metered(coro: Coroutine, usage: TaskUsage) -> Any:
+    """Await a task coroutine while recording its wall time, CPU time and peak RSS growth."""
+    usage.start()
+    try:
+        return await _metered(coro, usage)
+    finally:
+        usage.finish()
+
+
+class TaskUsageStats:
+    """Usage totals and maxima of finished runs, per (state name, task name)."""
+    METRICS = ("queue_wait", "wall_time", "cpu_time", "peak_rss_delta_kb")
+
+    def __init__(self):
+        self._runs: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._totals: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._maxima: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def record(self, state_name: str, task_name: str, usage: TaskUsage):
+        key = (state_name, task_name)
+        self._runs[key] += 1
+        values = usage.to_dict()
+        for metric in self.METRICS:
+            value = values[metric]
+            if value is None:
+                continue
+            self._totals[key][metric] += value
+            self._maxima[key][metric] = max(self._maxima[key][metric], value)
+
+    def stats(self, state_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-task aggregates, most expensive (total CPU time) first."""
+        rows = []
+        for (state, task_name), runs in self._runs.items():
+            if state_name is not None and state != state_name:
+                continue
+            totals, maxima = self._totals[(state, task_name)], self._maxima[(state, task_name)]
+            row = {"state": state, "task_name": task_name, "runs": runs}
+            for metric in self.METRICS:
+                row[f"avg_{metric}"] = round(totals[metric] / runs, 4)
+                row[f"max_{metric}"] = round(maxima[metric], 4)
+            row["total_cpu_time"] = round(totals["cpu_time"], 4)
+            rows.append(row)
+        return sorted(rows, key=lambda row: row["total_cpu_time"], reverse=True)
+
+
+# Aggregates for the whole backend process
+task_usage_stats = TaskUsageStats()
@@ -0,0 +1,91 @@
+"""
+Precompiled parameter validators of task methods.
+
+The input model of a task (the annotation of its `task_args` parameter) is resolved
+once per (state class, task name) when the task API is set up, so validating a
+request only constructs the model. The task catalog keeps the validators of the
+monitored tasks (and serves their JSON Schemas); the registry builds them and caches
+those of other event handlers started through the task API.
+"""
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from .executor import unwrap_task_function
+
+INPUT_ARG_NAME = "task_args"
+
+# Parameters of tasks without an input model
+EmptyParams = create_model("EmptyModel", __base__=BaseModel)
+
+
+def get_input_model(task_method: Any, input_arg_name: str = INPUT_ARG_NAME) -> Optional[Type[BaseModel]]:
+    """The pydantic model annotated on the task's input argument, if it has one."""
+    param = inspect.signature(unwrap_task_function(task_method)).parameters.get(input_arg_name)
+    if param is None:
+        return None
+    if isinstance(param.annotation, type) and issubclass(param.annotation, BaseModel):
+        return param.annotation
+    return None
+
+
+def monitored_task_names(state_cls: Any):
+    """Names of the @monitored_background_task methods defined on a state class."""
+    names = []
+    for name, member in vars(state_cls).items():
+        if name.startswith("_"):
+            continue
+        # Static tasks stay staticmethod objects; instance tasks become EventHandlers
+        member = getattr(member, "__func__", member)
+        member = getattr(member, "fn", member)
+        if getattr(member, "is_monitored_background_task", False):
+            names.append(name)
+    return names
+
+
+@dataclass(frozen=True)
+class TaskValidator:
+    """Validator of one task's parameters."""
+    task_name: str
+    model: Optional[Type[BaseModel]]
+    json_schema: Dict[str, Any] = field(compare=False)
+
+    @classmethod
+    def build(cls, task_name: str, task_method: Any) -> "TaskValidator":
+        model = get_input_model(task_method)
+        return cls(task_name, model, (model or EmptyParams).model_json_schema())
+
+    def validate(self, parameters: Optional[Dict[str, Any]]) -> BaseModel:
+        """Construct the task's input model from request parameters.
+
+        Raises:
+            ValueError: If parameters are missing or don't match the model.
+        """
+        if self.model is None:
+            return EmptyParams()
+        if not parameters:
+            raise ValueError(f"Parameters are required for input model '{INPUT_ARG_NAME}' but none were provided.")
+        try:
+            return self.model(**parameters)
+        except ValidationError as e:
+            raise ValueError(f"Invalid parameters for input model: {str(e)}")
+
+
+class TaskValidatorRegistry:
+    """Validators by (state name, task name), built on first use."""
+    def __init__(self):
+        self._validators: Dict[Tuple[str, str], TaskValidator] = {}
+
+    def get(self, state_cls: Any, task_name: str, task_method: Any) -> TaskValidator:
+        """Validator of a task, built the first time it is asked for."""
+        key = (state_cls.get_full_name(), task_name)
+        validator = self._validators.get(key)
+        if validator is None:
+            validator = self._validators[key] = TaskValidator.build(task_name, task_method)
+        return validator
+
+
+# Shared registry for the whole backend process
+task_validators = TaskValidatorRegistry()
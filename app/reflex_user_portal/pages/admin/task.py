@@ -28,6 +28,27 @@ def task_info_section(label: str, content: str, language: str = None) -> rx.Comp
         width="100%",
     )
 
+def task_usage_table() -> rx.Component:
+    """Per-task resource usage of finished runs (seconds and KiB)."""
+    columns = [
+        ("State", "state"), ("Task", "task_name"), ("Runs", "runs"),
+        ("Avg queue wait", "avg_queue_wait"), ("Avg wall time", "avg_wall_time"),
+        ("Avg CPU time", "avg_cpu_time"), ("Max CPU time", "max_cpu_time"),
+        ("Max peak memory growth (KiB)", "max_peak_rss_delta_kb"),
+    ]
+    return rx.table.root(
+        rx.table.header(
+            rx.table.row(*[rx.table.column_header_cell(label) for label, _ in columns]),
+        ),
+        rx.table.body(
+            rx.foreach(
+                DisplayMonitorState.task_usage,
+                lambda row: rx.table.row(*[rx.table.cell(row[key]) for _, key in columns]),
+            ),
+        ),
+        width="100%",
+    )
+
 DEFAULT_STATE_NAME = "ExampleTaskState"
 
 @portal_template(route="/admin/tasks", title="Task Dashboard", on_load=DisplayMonitorState.preselect_task_function)
@@ -94,9 +115,13 @@ def task_status_display():
                         rx.text("No parameters required for this task"),
                     ),
                     task_info_section("Get Task Result:", DisplayMonitorState.result_command, 'bash'),
+                    task_info_section("Cancel Task:", DisplayMonitorState.cancel_command, 'bash'),
                     rx.heading("WebSocket Commands", size="4"),
                     task_info_section("Monitor All Tasks:", DisplayMonitorState.ws_status_command, 'bash'),
                     task_info_section("Monitor Specific Task:", DisplayMonitorState.ws_task_command, 'bash'),
+                    task_info_section("Monitor Many Tasks (subscribe messages):", DisplayMonitorState.ws_multiplex_command, 'bash'),
+                    rx.heading("Server-Sent Events", size="4"),
+                    task_info_section("Stream Direct Task Events:", DisplayMonitorState.sse_task_command, 'bash'),
                     padding_x="20",  # Increase this value for more space
                     padding_y="2",  # Increase this value for more space
                     border="1px solid gray",
@@ -120,7 +145,7 @@ def task_status_display():
                     rx.heading(task.name, size="2"),
                     rx.text(f"Task ID: {task.id}"),
                     rx.text(f"Status: {task.status}"),
-                    rx.progress(value=task.progress, max=100),
+                    rx.progress(value=DefaultTaskState.task_progress[task.id], max=100),
                     task_info_section(
                         "Monitor this task:",
                         get_command("ws_task", DEFAULT_STATE_NAME, task_id=task.id)
@@ -138,6 +163,14 @@ def task_status_display():
                     rx.heading(task.name),
                     rx.text(f"Status: {task.status}"),
                     rx.text(f"Task ID: {task.id}"),
+                    rx.cond(task.error, rx.text(f"Error: {task.error}", color="red")),
+                    rx.cond(
+                        task.usage,
+                        rx.text(
+                            f"Wall time: {task.usage['wall_time']}s, CPU time: {task.usage['cpu_time']}s, "
+                            f"queue wait: {task.usage['queue_wait']}s, peak memory growth: {task.usage['peak_rss_delta_kb']} KiB"
+                        ),
+                    ),
                     task_info_section(
                         "Get task result:",
                         get_command("result", DEFAULT_STATE_NAME, task_id=task.id)
@@ -146,6 +179,27 @@ def task_status_display():
                     width="100%",
                 ),
             ),
+            rx.flex(
+                rx.cond(
+                    DefaultTaskState.archived_task_count > 0,
+                    rx.button(
+                        f"Load older tasks ({DefaultTaskState.archived_task_count} archived)",
+                        on_click=DefaultTaskState.load_older_tasks,
+                    ),
+                ),
+                rx.button("Hide older tasks", on_click=DefaultTaskState.hide_older_tasks, variant="soft"),
+                spacing="2",
+            ),
+            rx.divider(),
+
+            # Resource Usage Section
+            rx.flex(
+                rx.heading("Resource Usage per Task"),
+                rx.button("Refresh", on_click=DisplayMonitorState.refresh_task_usage),
+                align="center",
+                spacing="4",
+            ),
+            task_usage_table(),
             width="100%",
         ),
         width="100%",
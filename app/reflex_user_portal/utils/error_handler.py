@@ -19,6 +19,16 @@ class InvalidParametersError(TaskError):
     def __init__(self, message: str):
         super().__init__(message, code=400)
 
+class TaskQueueFullError(TaskError):
+    def __init__(self, retry_after: int):
+        super().__init__("Task queue is full, retry later", code=429, data={"retry_after": retry_after})
+        self.retry_after = retry_after
+
+class TaskTimeoutError(TaskError):
+    def __init__(self, timeout: float):
+        super().__init__(f"Task timed out after {timeout}s", code=504)
+        self.timeout = timeout
+
 def create_error_response(error: Exception) -> Dict[str, Any]:
     if isinstance(error, TaskError):
         return {
@@ -2,6 +2,8 @@ import os
 import pytest
 from clerk_backend_api import Clerk
 from dotenv import load_dotenv
+from fastapi import FastAPI
+from types import SimpleNamespace
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,11 @@ def load_test_env():
     test_env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env.test')
     load_dotenv(test_env_path, override=True)
 
+# The backend modules read their config on import. Unit tests import them without a
+# running server, so fall back to a dummy Clerk key when the env files have none.
+load_test_env()
+os.environ.setdefault("CLERK_SECRET_KEY", "test")
+
 def get_test_token_for_user() -> str:
     """Helper function to get test token"""
     try:
@@ -52,3 +59,29 @@ def clerk_client(load_env):
 def test_token():
     """Get authentication token for testing."""
     return get_test_token_for_user()
+
+
+class FakeStateManager:
+    """Read-only state manager holding the tasks of one session, as another worker left them."""
+    def __init__(self):
+        self.monitor_state = SimpleNamespace(tasks={}, _archived_tasks={}, task_progress={})
+        self.reads = 0
+
+    async def get_state(self, token):
+        self.reads += 1
+        monitor_state = self.monitor_state
+
+        class RootState:
+            async def get_state(self, state_cls):
+                return monitor_state
+        return RootState()
+
+@pytest.fixture
+def fake_state_manager():
+    """State manager of unit tests that build a TaskAPI without a server."""
+    return FakeStateManager()
+
+@pytest.fixture
+def fake_app(fake_state_manager):
+    """The parts of a Reflex app a TaskAPI needs: its FastAPI app and state manager."""
+    return SimpleNamespace(api_transformer=FastAPI(), state_manager=fake_state_manager)
@@ -0,0 +1,76 @@
+"""Unit tests for the precomputed task dashboard commands (no server needed)"""
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from app.reflex_user_portal.backend.api.commands import CLIENT_TOKEN_PLACEHOLDER, DASHBOARD_COMMANDS, format_command
+from app.reflex_user_portal.backend.api.multiplex import TaskStreamMultiplexer
+from app.reflex_user_portal.backend.api.task import TaskAPI
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS, TASK_DASHBOARD_COMMANDS, dashboard_command
+from app.reflex_user_portal.backend.wrapper.catalog import task_catalog
+
+STATE_NAME = "ExampleTaskState2"
+CLIENT_TOKEN = "token-1234"
+
+
+class TestDashboardCommands:
+    """Commands looked up for a session match formatting them on demand."""
+
+    def test_matches_format_command(self):
+        state_info = STATE_MAPPINGS[STATE_NAME]
+        for task_name in ["", *task_catalog.get(state_info["cls"])]:
+            for name, (command_type, kwargs) in DASHBOARD_COMMANDS.items():
+                expected = format_command(command_type, state_info, client_token=CLIENT_TOKEN, task_name=task_name, **kwargs)
+                assert dashboard_command(STATE_NAME, task_name, name, CLIENT_TOKEN) == expected
+
+    def test_every_state_and_task_is_precomputed(self):
+        for state_name, state_info in STATE_MAPPINGS.items():
+            for task_name in ["", *task_catalog.get(state_info["cls"])]:
+                assert (state_name, task_name) in TASK_DASHBOARD_COMMANDS
+
+    def test_client_token_is_substituted(self):
+        command = dashboard_command(STATE_NAME, "task1", "status_command", CLIENT_TOKEN)
+        assert CLIENT_TOKEN in command
+        assert "{client_token}" not in command
+
+    def test_curl_body(self):
+        """Test that tasks with default args get them as a curl body and others an empty one."""
+        body = dashboard_command(STATE_NAME, "task2_with_args", "formatted_curl_body", CLIENT_TOKEN)
+        assert body.startswith("-d '")
+        assert json.loads(body[4:-1]) == {"age": 25, "name": "MATT"}
+        assert dashboard_command(STATE_NAME, "task1", "formatted_curl_body", CLIENT_TOKEN) == ""
+
+    def test_unknown_state_or_task(self):
+        assert dashboard_command("NoSuchState", "task1", "status_command", CLIENT_TOKEN) == ""
+        command = dashboard_command(STATE_NAME, "no_such_task", "start_command", CLIENT_TOKEN)
+        assert "no_such_task" in command
+        assert dashboard_command(STATE_NAME, "no_such_task", "formatted_curl_body", CLIENT_TOKEN) == ""
+
+
+class TestDashboardCommandRoutes:
+    """Commands point at routes the task API registers."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_app):
+        task_api = TaskAPI(fake_app, STATE_NAME, STATE_MAPPINGS[STATE_NAME])
+        TaskStreamMultiplexer(fake_app, {STATE_NAME: task_api})
+        self.paths = {route.path for route in fake_app.api_transformer.routes}
+
+    def command_path(self, name: str) -> str:
+        # Keep the placeholder, as in the route paths
+        command = dashboard_command(STATE_NAME, "task1", name, CLIENT_TOKEN_PLACEHOLDER)
+        return urlsplit(command.split()[-1]).path
+
+    def test_sse_command(self):
+        assert self.command_path("sse_task_command") in self.paths
+
+    def test_cancel_commands(self):
+        assert self.command_path("cancel_command") in self.paths
+        command = format_command("direct_cancel", STATE_MAPPINGS[STATE_NAME], task_id="{task_id}")
+        assert urlsplit(command.split()[-1]).path in self.paths
+
+    def test_multiplex_command(self):
+        """Test that the websocket shared by all states is shown under the root prefix."""
+        assert self.command_path("ws_multiplex_command") == "/ws/tasks"
+        assert "/ws/tasks" in self.paths
@@ -0,0 +1,148 @@
+"""Unit tests for the task indexes and retention of MonitorState (no server needed)"""
+import time
+
+from reflex.state import State
+
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS
+from app.reflex_user_portal.backend.states.task import base as base_module
+from app.reflex_user_portal.backend.wrapper import ids as ids_module
+from app.reflex_user_portal.backend.wrapper.ids import TaskIdGenerator, new_task_id
+from app.reflex_user_portal.backend.wrapper.models import TaskData, TaskStatus
+
+STATE_NAME = "ExampleTaskState2"
+
+
+def new_state():
+    """A MonitorState of a fresh session, outside of any app."""
+    root = State(_reflex_internal_init=True)
+    state = root.get_substate(STATE_MAPPINGS[STATE_NAME]["cls"].get_full_name().split(".")[1:])
+    assert not state.tasks
+    return state
+
+
+def set_status(state, task_id: str, status: str, progress: int = 0):
+    task = state.tasks.get(task_id)
+    if task is None:
+        task = state.tasks[task_id] = TaskData(id=task_id, name="task1")
+    task.status = status
+    task.progress = progress
+    state.index_task(task_id)
+
+
+class TestTaskIndexes:
+    """Active and completed task lists kept in step with `tasks`."""
+
+    def test_lists_are_newest_first(self):
+        """Test that tasks indexed in any order are listed by creation time, newest first."""
+        state = new_state()
+        task_ids = [new_task_id() for _ in range(5)]
+        for task_id in (task_ids[3], task_ids[0], task_ids[4], task_ids[1], task_ids[2]):
+            set_status(state, task_id, TaskStatus.PROCESSING)
+        assert [task.id for task in state.active_tasks] == task_ids[::-1]
+        assert state.completed_tasks == []
+
+    def test_status_changes_move_tasks(self):
+        state = new_state()
+        first, second = new_task_id(), new_task_id()
+        set_status(state, first, TaskStatus.STARTING)
+        set_status(state, second, TaskStatus.PROCESSING, progress=30)
+        assert state.task_progress == {first: 0, second: 30}
+
+        set_status(state, first, TaskStatus.COMPLETED, progress=100)
+        set_status(state, second, TaskStatus.ERROR)
+        assert state.active_tasks == []
+        assert [task.id for task in state.completed_tasks] == [second, first]
+        assert state.task_progress == {}
+
+    def test_retrying_task_is_active(self):
+        state = new_state()
+        task_id = new_task_id()
+        set_status(state, task_id, TaskStatus.RETRYING)
+        assert [task.id for task in state.active_tasks] == [task_id]
+
+    def test_removed_task_leaves_indexes(self):
+        state = new_state()
+        task_id = new_task_id()
+        set_status(state, task_id, TaskStatus.CANCELLED)
+        del state.tasks[task_id]
+        state.index_task(task_id)
+        assert state._task_index.completed == []
+        assert state.completed_tasks == []
+
+    def test_sessions_have_their_own_index(self):
+        state, other = new_state(), new_state()
+        set_status(state, new_task_id(), TaskStatus.PROCESSING)
+        assert other._task_index.active == []
+
+    def test_cached_lists_follow_status_changes(self):
+        """Test that the task lists are refreshed although the index itself isn't change-tracked."""
+        state = new_state()
+        task_id = new_task_id()
+        set_status(state, task_id, TaskStatus.PROCESSING)
+        assert [task.id for task in state.active_tasks] == [task_id]
+        set_status(state, task_id, TaskStatus.COMPLETED)
+        assert state.active_tasks == []
+        assert [task.id for task in state.completed_tasks] == [task_id]
+
+
+class TestTaskRetention:
+    """Archiving finished tasks beyond the retention policy."""
+
+    def finished_tasks(self, state, count: int):
+        task_ids = [new_task_id() for _ in range(count)]
+        for task_id in task_ids:
+            set_status(state, task_id, TaskStatus.COMPLETED)
+        return task_ids
+
+    def test_newest_tasks_stay(self, monkeypatch):
+        """Test that only the newest finished tasks stay and running ones are never archived."""
+        monkeypatch.setattr(base_module, "TASK_STATE_MAX_TASKS", 2)
+        state = new_state()
+        running = new_task_id()
+        set_status(state, running, TaskStatus.PROCESSING)
+        task_ids = self.finished_tasks(state, 4)
+        state.prune_tasks()
+        assert set(state.tasks) == {running, *task_ids[2:]}
+        assert list(state._archived_tasks) == task_ids[:2]
+        assert state.archived_task_count == 2
+        assert [task.id for task in state.completed_tasks] == task_ids[:1:-1]
+
+    def test_old_tasks_expire(self, monkeypatch):
+        monkeypatch.setattr(base_module, "TASK_STATE_MAX_TASKS", 100)
+        monkeypatch.setattr(base_module, "TASK_STATE_MAX_AGE_SECONDS", 60)
+        generator = TaskIdGenerator("worker-a")
+        now_ns = [time.time_ns() - 120 * 10 ** 9]
+        monkeypatch.setattr(ids_module.time, "time_ns", lambda: now_ns[0])
+        old = generator.new_id()
+        now_ns[0] += 119 * 10 ** 9
+        recent = generator.new_id()
+        state = new_state()
+        for task_id in (old, recent):
+            set_status(state, task_id, TaskStatus.COMPLETED)
+        state.prune_tasks()
+        assert list(state.tasks) == [recent]
+        assert list(state._archived_tasks) == [old]
+
+    def test_archive_is_bounded(self, monkeypatch):
+        """Test that the oldest archived tasks are dropped once the archive is full."""
+        monkeypatch.setattr(base_module, "TASK_STATE_MAX_TASKS", 1)
+        monkeypatch.setattr(base_module, "TASK_STATE_ARCHIVE_SIZE", 2)
+        state = new_state()
+        task_ids = self.finished_tasks(state, 5)
+        state.prune_tasks()
+        assert list(state.tasks) == task_ids[4:]
+        assert sorted(state._archived_tasks) == task_ids[2:4]
+
+    def test_loaded_tasks_stay_until_hidden(self, monkeypatch):
+        monkeypatch.setattr(base_module, "TASK_STATE_MAX_TASKS", 1)
+        state = new_state()
+        task_ids = self.finished_tasks(state, 3)
+        state.prune_tasks()
+        state.load_older_tasks()
+        assert sorted(state.tasks) == task_ids
+        state.prune_tasks()
+        assert sorted(state.tasks) == task_ids
+
+        state.hide_older_tasks()
+        assert list(state.tasks) == task_ids[2:]
+        assert sorted(state._archived_tasks) == task_ids[:2]
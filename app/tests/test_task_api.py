@@ -76,7 +76,25 @@ class TestTaskAPI:
         assert "status" in data
         assert "progress" in data
         assert data["id"] == task_id
-    
+
+    def test_task_status_fields(self, task_api_base_url, client_token):
+        """Test that a failed task has a plain Error status and its message in the error field."""
+        response = requests.post(f"{task_api_base_url}/tasks/{client_token}/start/failing_task", timeout=10)
+        assert response.status_code == 200
+        task_id = response.json()["task_id"]
+
+        status_endpoint = f"{task_api_base_url}/tasks/{client_token}/{task_id}"
+        for _ in range(10):
+            response = requests.get(status_endpoint, timeout=10)
+            assert response.status_code == 200
+            data = response.json()
+            if data["status"] not in ("Starting", "Processing"):
+                break
+            time.sleep(1)
+
+        assert data["status"] == "Error"
+        assert data["error"] == "Example task failure"
+
     def test_get_all_tasks_status(self, task_api_base_url, client_token):
         """Test getting all tasks status."""
         # Start a task first
@@ -174,6 +192,27 @@ class TestTaskAPI:
         
         # Should return error since task isn't completed yet
         assert result_response.status_code == 400
+    
+    def test_batch_start(self, task_api_base_url, client_token):
+        """Test starting several tasks through client events with one request."""
+        endpoint = f"{task_api_base_url}/tasks/{client_token}/batch"
+        
+        response = requests.post(
+            endpoint,
+            json={
+                "tasks": [
+                    {"task_name": "task1"},
+                    {"task_name": "task2_with_args", "parameters": {"name": "BatchUser"}},
+                ]
+            },
+            timeout=10
+        )
+        
+        assert response.status_code == 200
+        items = response.json()["tasks"]
+        assert "task_id" in items[0]
+        # Missing "age" fails validation for this item only
+        assert items[1]["error"]["code"] == 400
 
 
 class TestDirectTaskAPI:
@@ -194,6 +233,39 @@ class TestDirectTaskAPI:
         assert "task_id" in data
         return data["task_id"]
     
+    def test_direct_task_ids(self, task_api_base_url):
+        """Test that direct task IDs are unique, sort by creation and name this worker."""
+        task_ids = [self.test_direct_start_task1(task_api_base_url) for _ in range(3)]
+        
+        assert len(set(task_ids)) == 3
+        assert task_ids == sorted(task_ids)
+        assert all(len(task_id) == 26 for task_id in task_ids)
+        
+        response = requests.get(f"{task_api_base_url}/task/stats", timeout=10)
+        assert all(task_id[10:14] == response.json()["worker"] for task_id in task_ids)
+    
+    def test_direct_task_usage(self, task_api_base_url):
+        """Test that a finished direct task reports its resource usage, also in the stats."""
+        task_id = self.test_direct_start_task1(task_api_base_url)
+        time.sleep(5)
+        
+        async def last_frame():
+            ws_url = f"{task_api_base_url.replace('http', 'ws').replace('/api/', '/ws/')}/task/ws/{task_id}"
+            async with websockets.connect(ws_url) as websocket:
+                while True:
+                    frame = json.loads(await websocket.recv())
+                    if frame["type"] == "status_update":
+                        return frame["data"]
+        
+        data = asyncio.run(last_frame())
+        assert data["status"] == "Completed"
+        assert set(data["usage"]) == {"queue_wait", "wall_time", "cpu_time", "peak_rss_delta_kb"}
+        assert data["usage"]["wall_time"] >= data["usage"]["cpu_time"] >= 0
+        
+        response = requests.get(f"{task_api_base_url}/task/stats", timeout=10)
+        usage = {row["task_name"]: row for row in response.json()["usage"]}
+        assert usage["task1"]["runs"] >= 1
+    
     def test_direct_start_task2_with_args(self, task_api_base_url):
         """Test direct execution of task2_with_args."""
         endpoint = f"{task_api_base_url}/task/start/task2_with_args"
@@ -229,6 +301,158 @@ class TestDirectTaskAPI:
         assert response.status_code == 200
         data = response.json()
         assert "result" in data
+    
+    def test_direct_batch_start(self, task_api_base_url):
+        """Test starting several direct tasks with one request, with per-item errors."""
+        endpoint = f"{task_api_base_url}/task/batch"
+        
+        response = requests.post(
+            endpoint,
+            json={
+                "tasks": [
+                    {"task_name": "task1"},
+                    {"task_name": "task2_with_args", "parameters": {"name": "BatchUser", "age": 40}},
+                    {"task_name": "nonexistent_task"},
+                ]
+            },
+            timeout=10
+        )
+        
+        assert response.status_code == 200
+        items = response.json()["tasks"]
+        assert [item["index"] for item in items] == [0, 1, 2]
+        assert "task_id" in items[0]
+        assert "task_id" in items[1]
+        assert items[2]["error"]["code"] == 404
+    
+    def test_direct_idempotency_key(self, task_api_base_url):
+        """Test that a retried request with the same Idempotency-Key reuses the task."""
+        endpoint = f"{task_api_base_url}/task/start/task1"
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        
+        first = requests.post(endpoint, headers=headers, timeout=10)
+        second = requests.post(endpoint, headers=headers, timeout=10)
+        
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json()["task_id"] == first.json()["task_id"]
+        assert second.json()["deduplicated"] is True
+        
+        # The same key with other parameters is rejected
+        response = requests.post(
+            f"{task_api_base_url}/task/start/task2_with_args",
+            headers=headers,
+            json={"name": "Other", "age": 1},
+            timeout=10
+        )
+        assert response.status_code == 422
+    
+    def test_direct_cancel(self, task_api_base_url):
+        """Test cancelling a running direct task."""
+        task_id = self.test_direct_start_task2_with_args(task_api_base_url)
+        
+        endpoint = f"{task_api_base_url}/task/cancel/{task_id}"
+        response = requests.post(endpoint, timeout=10)
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "Cancelled"
+        
+        # A finished task can't be cancelled again
+        time.sleep(1)
+        response = requests.post(endpoint, timeout=10)
+        assert response.status_code == 409
+    
+    def test_direct_task_events(self, task_api_base_url):
+        """Test streaming a direct task through Server-Sent Events until it completes."""
+        task_id = self.test_direct_start_task1(task_api_base_url)
+        
+        endpoint = f"{task_api_base_url}/task/events/{task_id}"
+        events = []
+        with requests.get(endpoint, stream=True, timeout=30) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    events.append(line[len("event: "):])
+                elif line.startswith("data: ") and events[-1] == "status_update":
+                    if json.loads(line[len("data: "):])["status"] == "Completed":
+                        break
+        
+        assert events[0] == "history"
+        assert "status_update" in events
+    
+    def test_direct_task_schemas(self, task_api_base_url):
+        """Test the JSON Schemas of task parameters."""
+        response = requests.get(f"{task_api_base_url}/task/schemas", timeout=10)
+        assert response.status_code == 200
+        schemas = response.json()["tasks"]
+        assert {"task1", "task2_with_args"} <= set(schemas)
+        
+        response = requests.get(f"{task_api_base_url}/task/schema/task2_with_args", timeout=10)
+        assert response.status_code == 200
+        assert set(response.json()["required"]) == {"name", "age"}
+        
+        response = requests.get(f"{task_api_base_url}/task/schema/nonexistent_task", timeout=10)
+        assert response.status_code == 404
+
+    def test_direct_start_instance_task(self, task_api_base_url):
+        """Test that instance-method tasks can't be started without a client session."""
+        response = requests.post(f"{task_api_base_url}/task/start/instance_task", timeout=10)
+        assert response.status_code == 400
+    
+    def test_pipeline(self, load_env):
+        """Test a two-node pipeline where the first task's result feeds the second."""
+        base_url = f"{load_env['api_url']}/api/pipelines"
+        response = requests.post(
+            base_url,
+            json={
+                "state": "example_task2",
+                "nodes": [
+                    {"id": "first", "task": "task1"},
+                    {"id": "second", "task": "task2_with_args", "parameters": {"age": 25}, "inputs": {"name": "first"}},
+                ],
+            },
+            timeout=10
+        )
+        assert response.status_code == 200
+        pipeline_id = response.json()["pipeline_id"]
+        
+        for _ in range(30):
+            pipeline = requests.get(f"{base_url}/{pipeline_id}", timeout=10).json()
+            if pipeline["finished_at"]:
+                break
+            time.sleep(1)
+        
+        assert pipeline["status"] == "Completed"
+        assert pipeline["progress"] == 100
+        nodes = {node["id"]: node for node in pipeline["nodes"]}
+        assert nodes["second"]["depends_on"] == ["first"]
+        assert nodes["second"]["result"] == {"name": nodes["first"]["result"], "age": 25}
+    
+    def test_pipeline_cycle(self, load_env):
+        """Test that a pipeline with a dependency cycle is rejected."""
+        response = requests.post(
+            f"{load_env['api_url']}/api/pipelines",
+            json={
+                "state": "example_task2",
+                "nodes": [
+                    {"id": "a", "task": "task1", "depends_on": ["b"]},
+                    {"id": "b", "task": "task1", "depends_on": ["a"]},
+                ],
+            },
+            timeout=10
+        )
+        assert response.status_code == 400
+    
+    def test_task_schedules(self, load_env):
+        """Test listing the scheduled tasks of all states."""
+        response = requests.get(f"{load_env['api_url']}/api/schedules", timeout=10)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "enabled" in data
+        for schedule in data["schedules"]:
+            assert {"name", "state", "task_name", "cron", "next_due", "runs"} <= set(schedule)
 
 
 @pytest.mark.asyncio
@@ -261,6 +485,27 @@ class TestTaskWebSocket:
             # This is expected for testing
             pass
 
+    
+    async def test_multiplexed_websocket(self, task_api_base_url):
+        """Test watching several direct tasks over one multiplexed WebSocket."""
+        task_ids = [
+            requests.post(f"{task_api_base_url}/task/start/task1", timeout=10).json()["task_id"]
+            for _ in range(2)
+        ]
+        
+        host = task_api_base_url.replace('http://', '').split('/')[0]
+        async with websockets.connect(f"ws://{host}/ws/tasks") as websocket:
+            for task_id in task_ids:
+                await websocket.send(json.dumps(
+                    {"action": "subscribe", "state": "example_task2", "task_id": task_id}
+                ))
+            
+            finished = set()
+            while len(finished) < len(task_ids):
+                data = json.loads(await asyncio.wait_for(websocket.recv(), timeout=10.0))
+                assert data["subscription"]["task_id"] in task_ids
+                if data["type"] == "subscription_end":
+                    finished.add(data["subscription"]["task_id"])
 
 if __name__ == "__main__":
     pytest.main(["-xvs", __file__])
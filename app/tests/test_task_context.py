@@ -0,0 +1,112 @@
+"""Unit tests for TaskContext updates of session tasks (no server needed)"""
+import asyncio
+from types import SimpleNamespace
+
+from app.reflex_user_portal.backend.wrapper.events import next_events, state_topic, task_event_bus
+from app.reflex_user_portal.backend.wrapper.models import TaskContext, TaskData, TaskStatus
+
+STATE_NAME = "test_task_context_state"
+
+
+class FakeState:
+    """The parts of a MonitorState a TaskContext writes to."""
+    def __init__(self, client_token: str):
+        self.router = SimpleNamespace(session=SimpleNamespace(client_token=client_token))
+        self.tasks = {}
+        self.task_progress = {}
+        self.indexed = []
+
+    @staticmethod
+    def get_full_name():
+        return STATE_NAME
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def index_task(self, task_id):
+        self.indexed.append(task_id)
+
+
+def new_context(flush_interval_ms: float = 0):
+    state = FakeState(f"token-{id(object())}")
+    context = TaskContext(state, "task-1", flush_interval_ms=flush_interval_ms)
+    state.tasks[context.task_id] = TaskData(id=context.task_id, name="task1", status=TaskStatus.STARTING)
+    return state, context
+
+
+class TestTaskContextUpdates:
+    """What a task's updates write to the state and publish."""
+
+    def test_progress_tick_is_a_delta(self):
+        """Test that a progress-only update publishes {id, progress} and leaves `tasks` alone."""
+        async def run():
+            state, context = new_context()
+            with task_event_bus.subscribe(state_topic(STATE_NAME, context.client_token)) as queue:
+                await context.update(progress=10, status=TaskStatus.PROCESSING)
+                snapshot, = await next_events(queue)
+                assert snapshot["status"] == TaskStatus.PROCESSING
+                assert snapshot["result"] is None
+
+                await context.update(progress=40)
+                assert await next_events(queue) == [{"id": context.task_id, "progress": 40}]
+            assert state.task_progress[context.task_id] == 40
+            assert state.tasks[context.task_id].progress == 10
+        asyncio.run(run())
+
+    def test_custom_status_is_kept(self):
+        """Test that known statuses become TaskStatus members and custom ones pass through."""
+        async def run():
+            state, context = new_context()
+            await context.update(status="Uploading")
+            assert state.tasks[context.task_id].status == "Uploading"
+
+            await context.update(status="Processing")
+            assert state.tasks[context.task_id].status is TaskStatus.PROCESSING
+        asyncio.run(run())
+
+
+class TestTaskContextCoalescing:
+    """Buffering of updates between flushes."""
+
+    def test_progress_ticks_are_merged(self):
+        """Test that ticks within the flush interval are sent once, with the latest progress."""
+        async def run():
+            state, context = new_context(flush_interval_ms=200)
+            with task_event_bus.subscribe(state_topic(STATE_NAME, context.client_token)) as queue:
+                await context.update(progress=0, status=TaskStatus.PROCESSING)
+                await next_events(queue)
+                for progress in (10, 20, 30):
+                    await context.update(progress=progress)
+                assert queue.empty()
+                assert (context.updates, context.merged, context.flushes) == (4, 2, 1)
+
+                events = await asyncio.wait_for(next_events(queue), 2)
+                assert events == [{"id": context.task_id, "progress": 30}]
+                assert context.flushes == 2
+        asyncio.run(run())
+
+    def test_status_change_flushes_at_once(self):
+        """Test that a status change writes the buffered progress along with it."""
+        async def run():
+            state, context = new_context(flush_interval_ms=10_000)
+            await context.update(progress=0, status=TaskStatus.PROCESSING)
+            await context.update(progress=60)
+            assert state.tasks[context.task_id].progress == 0
+
+            await context.update(status=TaskStatus.COMPLETED)
+            task = state.tasks[context.task_id]
+            assert (task.status, task.progress) == (TaskStatus.COMPLETED, 60)
+            assert context._flush_task is None
+        asyncio.run(run())
+
+    def test_same_status_is_buffered(self):
+        async def run():
+            state, context = new_context(flush_interval_ms=10_000)
+            await context.update(progress=10, status=TaskStatus.PROCESSING)
+            await context.update(progress=20, status=TaskStatus.PROCESSING)
+            assert state.tasks[context.task_id].progress == 10
+            assert context.take_pending() == {"progress": 20, "status": TaskStatus.PROCESSING}
+        asyncio.run(run())
@@ -0,0 +1,102 @@
+"""Unit tests for the cron expressions of scheduled tasks (no server needed)"""
+import datetime
+
+import pytest
+
+from app.reflex_user_portal.backend.wrapper.cron import CronExpression, parse_cron
+
+
+def at(*args) -> datetime.datetime:
+    return datetime.datetime(*args)
+
+
+class TestCronParse:
+    """Fields of parsed expressions."""
+
+    def test_steps(self):
+        cron = CronExpression.parse("*/15 0-12/4 * * *")
+        assert cron.minutes == {0, 15, 30, 45}
+        assert cron.hours == {0, 4, 8, 12}
+
+    def test_ranges_and_lists(self):
+        cron = CronExpression.parse("5,10-12 * 1,15 * 1-5")
+        assert cron.minutes == {5, 10, 11, 12}
+        assert cron.days == {1, 15}
+        assert cron.weekdays == {1, 2, 3, 4, 5}
+
+    def test_names(self):
+        """Test that month and weekday names are case-insensitive and 7 is Sunday."""
+        cron = CronExpression.parse("0 0 * JAN-mar,Dec sun,Sat")
+        assert cron.months == {1, 2, 3, 12}
+        assert cron.weekdays == {0, 6}
+        assert CronExpression.parse("0 0 * * 7").weekdays == {0}
+
+    def test_aliases(self):
+        assert CronExpression.parse("@daily").minutes == {0}
+        assert CronExpression.parse("@hourly").hours == set(range(24))
+        assert str(CronExpression.parse("@weekly")) == "@weekly"
+
+    def test_optional(self):
+        assert parse_cron(None) is None
+
+    @pytest.mark.parametrize("expression", [
+        "* * * *",
+        "* * * * * *",
+        "60 * * * *",
+        "* 24 * * *",
+        "* * 0 * *",
+        "* * * 13 *",
+        "* * * * 8",
+        "5-1 * * * *",
+        "*/0 * * * *",
+        "* * * foo *",
+        "x * * * *",
+    ])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(ValueError):
+            CronExpression.parse(expression)
+
+
+class TestCronMatching:
+    """Matching minutes and the next run time."""
+
+    def test_day_of_month_or_day_of_week(self):
+        """Test that a day matches either restricted day field, as in Vixie cron."""
+        cron = CronExpression.parse("0 0 13 * fri")
+        assert cron.matches(at(2026, 3, 13))   # Friday the 13th
+        assert cron.matches(at(2026, 4, 13))   # Monday
+        assert cron.matches(at(2026, 4, 17))   # Friday
+        assert not cron.matches(at(2026, 4, 14))
+
+    def test_unrestricted_day_field_is_ignored(self):
+        """Test that with one day field left as "*" only the other one decides."""
+        cron = CronExpression.parse("0 0 * * mon")
+        assert cron.matches(at(2026, 4, 13))
+        assert not cron.matches(at(2026, 4, 14))
+        cron = CronExpression.parse("0 0 */10 * *")
+        assert cron.matches(at(2026, 4, 11))
+        assert not cron.matches(at(2026, 4, 10))
+
+    def test_next_after_is_strictly_later(self):
+        cron = CronExpression.parse("*/15 * * * *")
+        assert cron.next_after(at(2026, 4, 1, 10, 15)) == at(2026, 4, 1, 10, 30)
+        assert cron.next_after(at(2026, 4, 1, 10, 14, 59, 999)) == at(2026, 4, 1, 10, 15)
+
+    def test_next_after_crosses_month_boundary(self):
+        cron = CronExpression.parse("30 9 1 * *")
+        assert cron.next_after(at(2026, 1, 31, 12, 0)) == at(2026, 2, 1, 9, 30)
+        # No 31st in April
+        assert CronExpression.parse("0 0 31 * *").next_after(at(2026, 3, 31, 1, 0)) == at(2026, 5, 31)
+
+    def test_next_after_crosses_year_boundary(self):
+        assert CronExpression.parse("@yearly").next_after(at(2026, 12, 31, 23, 59)) == at(2027, 1, 1)
+        cron = CronExpression.parse("0 12 29 feb *")
+        assert cron.next_after(at(2026, 3, 1)) == at(2028, 2, 29, 12, 0)
+
+    def test_next_after_keeps_tzinfo(self):
+        moment = datetime.datetime(2026, 4, 1, 10, 0, tzinfo=datetime.timezone.utc)
+        assert CronExpression.parse("0 * * * *").next_after(moment).tzinfo is datetime.timezone.utc
+
+    def test_never_matching_expression(self):
+        with pytest.raises(ValueError):
+            CronExpression.parse("0 0 30 feb *").next_after(at(2026, 1, 1))
@@ -0,0 +1,82 @@
+"""Unit tests for running tasks through the direct-execution path (no server needed)"""
+import asyncio
+
+import pytest
+
+from app.reflex_user_portal.backend.api.task import TaskAPI
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS
+from app.reflex_user_portal.backend.wrapper.executor import run_with_timeout
+from app.reflex_user_portal.backend.wrapper.models import is_terminal_status, TaskStatus
+from app.reflex_user_portal.backend.wrapper.store import task_store
+from app.reflex_user_portal.backend.wrapper.validators import EmptyParams
+from app.reflex_user_portal.utils.error_handler import TaskTimeoutError
+
+STATE_NAME = "ExampleTaskState2"
+
+
+class TestDirectTaskRun:
+    """Direct runs of the example tasks, from submission to their final status."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_app, monkeypatch):
+        # Task records would go to the local database
+        monkeypatch.setattr(task_store, "enabled", False)
+        self.api = TaskAPI(fake_app, STATE_NAME, STATE_MAPPINGS[STATE_NAME])
+
+    async def run_to_end(self, task_name, parameters=None, task_function=None):
+        """Run an example task (or a task_function in its place) and return its final info."""
+        if task_function is None:
+            task_id = (await self.api.run_task_direct(task_name, parameters, idempotency_key=None))["task_id"]
+        else:
+            task_id = self.api._submit_direct_task(task_name, task_function, EmptyParams())
+        for _ in range(100):
+            task_info = self.api._get_direct_task_info(task_id)
+            if is_terminal_status(task_info["status"]):
+                return task_info
+            await asyncio.sleep(0.05)
+        raise AssertionError(f"Task {task_name} didn't finish")
+
+    def test_task_without_input_model(self):
+        """Test that a task without task_args runs (and here fails with its own error)."""
+        task_info = asyncio.run(self.run_to_end("failing_task"))
+        assert task_info["status"] == TaskStatus.ERROR
+        assert task_info["error"] == "Example task failure"
+
+    def test_task_with_input_model(self):
+        task_info = asyncio.run(self.run_to_end("stream_report", {"rows": 2}))
+        assert task_info["status"] == TaskStatus.COMPLETED
+        assert task_info["result"] == [{"row": 1, "value": 1}, {"row": 2, "value": 4}]
+
+    def test_timeout(self):
+        async def slow_task(task):
+            await asyncio.sleep(10)
+        slow_task.timeout = 0.1
+        task_info = asyncio.run(self.run_to_end("slow_task", task_function=slow_task))
+        assert task_info["status"] == TaskStatus.TIMEOUT
+        assert task_info["error"] == "Task timed out after 0.1s"
+
+    def test_timeout_error_of_the_task(self):
+        """Test that a TimeoutError raised by the task body is an error, not a task timeout."""
+        async def http_task(task):
+            raise TimeoutError("Upstream request timed out")
+        task_info = asyncio.run(self.run_to_end("http_task", task_function=http_task))
+        assert task_info["status"] == TaskStatus.ERROR
+        assert task_info["error"] == "Upstream request timed out"
+
+
+class TestRunWithTimeout:
+    """Telling the task timeout apart from TimeoutErrors of the task itself."""
+
+    def test_expired_deadline(self):
+        with pytest.raises(TaskTimeoutError):
+            asyncio.run(run_with_timeout(asyncio.sleep(10), 0.01))
+
+    def test_own_timeout_error_passes_through(self):
+        async def body():
+            raise TimeoutError
+        for timeout in (None, 10):
+            with pytest.raises(TimeoutError):
+                asyncio.run(run_with_timeout(body(), timeout))
+
+    def test_result(self):
+        assert asyncio.run(run_with_timeout(asyncio.sleep(0, "done"), None)) == "done"
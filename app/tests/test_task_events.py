@@ -0,0 +1,121 @@
+"""Unit tests for the task event bus and session stream resyncs (no server needed)"""
+import asyncio
+from types import SimpleNamespace
+
+from app.reflex_user_portal.backend.api.task import TaskAPI
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS
+from app.reflex_user_portal.backend.wrapper import task as task_module
+from app.reflex_user_portal.backend.wrapper.events import (
+    OVERFLOW, TaskEventBus, next_events, state_topic, task_event_bus,
+)
+from app.reflex_user_portal.backend.wrapper.models import TaskData, TaskStatus
+
+STATE_NAME = "ExampleTaskState2"
+
+
+class TestTaskEventBus:
+    """Delivery of published events to subscribers."""
+
+    def test_publish_reaches_subscribers(self):
+        async def run():
+            bus = TaskEventBus()
+            assert bus.publish("topic", {"id": "a"}) == 0
+            with bus.subscribe("topic") as first, bus.subscribe("topic") as second:
+                assert bus.publish("topic", {"id": "a"}) == 2
+                assert await next_events(first) == [{"id": "a"}]
+                assert await next_events(second) == [{"id": "a"}]
+            assert bus.subscriber_count("topic") == 0
+        asyncio.run(run())
+
+    def test_topics_are_separate(self):
+        """Test that subscribers only get the events of their own topic."""
+        async def run():
+            bus = TaskEventBus()
+            with bus.subscribe(state_topic("s", "token-a")) as queue:
+                assert bus.publish(state_topic("s", "token-b"), {"id": "b"}) == 0
+                assert bus.publish(state_topic("s", "token-a"), {"id": "a"}) == 1
+                assert await next_events(queue) == [{"id": "a"}]
+        asyncio.run(run())
+
+    def test_burst_is_drained_at_once(self):
+        async def run():
+            bus = TaskEventBus()
+            with bus.subscribe("topic") as queue:
+                for progress in range(3):
+                    bus.publish("topic", {"progress": progress})
+                assert await next_events(queue) == [{"progress": 0}, {"progress": 1}, {"progress": 2}]
+                assert queue.empty()
+        asyncio.run(run())
+
+    def test_subscription_ends_with_block(self):
+        """Test that a subscriber leaving with an error is unsubscribed too."""
+        bus = TaskEventBus()
+        try:
+            with bus.subscribe("topic"):
+                assert bus.subscriber_count("topic") == 1
+                raise ConnectionError
+        except ConnectionError:
+            pass
+        assert bus.subscriber_count("topic") == 0
+        assert bus.publish("topic", {"id": "a"}) == 0
+
+    def test_overflow_is_signalled_not_silent(self):
+        """Test that a full queue keeps its events, ends with OVERFLOW and then resumes."""
+        async def run():
+            bus = TaskEventBus(max_queue_size=3)
+            with bus.subscribe("topic") as queue:
+                for index in range(5):
+                    bus.publish("topic", {"chunk": index})
+                events = await next_events(queue)
+                assert events == [{"chunk": 0}, {"chunk": 1}, {"chunk": 2}, OVERFLOW]
+                assert bus.overflows == 1
+
+                bus.publish("topic", {"chunk": 5})
+                assert await next_events(queue) == [{"chunk": 5}]
+        asyncio.run(run())
+
+
+class TestStateStreamResync:
+    """Session streams after their subscription overflowed."""
+
+    def test_resync_resends_missed_chunks(self, monkeypatch, fake_app, fake_state_manager):
+        """Test that no result chunk is lost and a full resync frame follows an overflow."""
+        api = TaskAPI(fake_app, STATE_NAME, STATE_MAPPINGS[STATE_NAME])
+        state_name = api.state_cls.get_full_name()
+        token = "resync-token"
+        task = TaskData(id="01TASKSTREAMING00000000000", name="Stream Report", status=TaskStatus.PROCESSING)
+        fake_state_manager.monitor_state.tasks[task.id] = task
+        # The running task's context, as the decorator registers it
+        task_ctx = SimpleNamespace(chunks=[])
+        key = (state_name, token, task.id)
+        monkeypatch.setitem(task_module._running_state_contexts, key, task_ctx)
+        monkeypatch.setattr(task_event_bus, "max_queue_size", 4)
+
+        def emit_chunk(chunk):
+            task_ctx.chunks.append(chunk)
+            task_event_bus.publish(state_topic(state_name, token),
+                                   {"id": task.id, "chunk_start": len(task_ctx.chunks) - 1, "chunks": [chunk]})
+
+        async def run():
+            frames = api._state_task_frames(token, task.id)
+            first = await frames.__anext__()
+            assert first["type"] == "state_update"
+            for chunk in range(10):
+                emit_chunk(chunk)
+
+            received, types = [], []
+            while len(received) < 12:
+                frame = await frames.__anext__()
+                types.append(frame["type"])
+                if frame["type"] == "result_chunks":
+                    assert frame["data"]["chunk_start"] == len(received)
+                    received.extend(frame["data"]["chunks"])
+                if frame["type"] == "resync":
+                    assert frame["data"]["id"] == task.id
+                    # Published after the resync, delivered as usual and without duplicates
+                    emit_chunk(10)
+                    emit_chunk(11)
+            assert received == list(range(12))
+            assert "resync" in types
+            await frames.aclose()
+        asyncio.run(run())
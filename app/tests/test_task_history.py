@@ -0,0 +1,51 @@
+"""Unit tests for the ring buffer of direct task history (no server needed)"""
+from app.reflex_user_portal.backend.wrapper.history import TaskHistory
+
+
+def filled(capacity: int, count: int) -> TaskHistory:
+    history = TaskHistory(capacity)
+    for progress in range(count):
+        history.append(progress=progress)
+    return history
+
+
+class TestTaskHistory:
+    """Sequence numbers, capacity and resume cursors."""
+
+    def test_entries_are_numbered(self):
+        history = TaskHistory(5)
+        assert history.since() == ([], False)
+        entry = history.append(status="Starting")
+        assert entry["seq"] == 1
+        assert isinstance(entry["timestamp"], str)
+        assert [entry["seq"] for entry in filled(5, 3).to_list()] == [1, 2, 3]
+
+    def test_oldest_entries_are_overwritten(self):
+        history = filled(3, 5)
+        assert len(history) == 3
+        assert (history.first_seq, history.last_seq, history.dropped) == (3, 5, 2)
+        assert [entry["progress"] for entry in history.to_list()] == [2, 3, 4]
+
+    def test_since_resumes_after_cursor(self):
+        history = filled(5, 4)
+        entries, truncated = history.since(2)
+        assert [entry["seq"] for entry in entries] == [3, 4]
+        assert not truncated
+        assert history.since(4) == ([], False)
+        assert history.since(10) == ([], False)
+
+    def test_since_reports_lost_entries(self):
+        """Test that a cursor older than the retained entries gets them all and a truncation flag."""
+        history = filled(3, 6)
+        entries, truncated = history.since(1)
+        assert [entry["seq"] for entry in entries] == [4, 5, 6]
+        assert truncated
+        # The entry right before the oldest retained one was seen: nothing was lost
+        entries, truncated = history.since(3)
+        assert [entry["seq"] for entry in entries] == [4, 5, 6]
+        assert not truncated
+
+    def test_negative_cursor_is_the_start(self):
+        entries, truncated = filled(3, 2).since(-5)
+        assert [entry["seq"] for entry in entries] == [1, 2]
+        assert not truncated
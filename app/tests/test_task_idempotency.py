@@ -0,0 +1,68 @@
+"""Unit tests for deduplicated task submissions (no server needed)"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.reflex_user_portal.backend.api.task import TaskAPI
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS
+from app.reflex_user_portal.backend.wrapper.store import task_store
+
+STATE_NAME = "ExampleTaskState2"
+
+
+class TestIdempotencyKey:
+    """Direct task starts repeating an Idempotency-Key."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_app, monkeypatch):
+        monkeypatch.setattr(task_store, "enabled", False)
+        self.api = TaskAPI(fake_app, STATE_NAME, STATE_MAPPINGS[STATE_NAME])
+        self.key = f"key-{id(self)}"
+
+    def start(self, task_name, parameters=None):
+        return self.api.run_task_direct(task_name, parameters, idempotency_key=self.key)
+
+    def test_repeated_request_gets_the_same_task(self):
+        async def run():
+            first = await self.start("stream_report", {"rows": 1})
+            second = await self.start("stream_report", {"rows": 1})
+            assert second["task_id"] == first["task_id"]
+            assert second["deduplicated"]
+        asyncio.run(run())
+
+    def test_key_reused_for_another_task(self):
+        """Test that a key can't return the task of another request with the same (no) arguments."""
+        async def run():
+            await self.start("task1")
+            with pytest.raises(HTTPException) as error:
+                await self.start("failing_task")
+            assert error.value.status_code == 422
+        asyncio.run(run())
+
+    def test_key_reused_with_other_parameters(self):
+        async def run():
+            await self.start("stream_report", {"rows": 1})
+            with pytest.raises(HTTPException) as error:
+                await self.start("stream_report", {"rows": 2})
+            assert error.value.status_code == 422
+        asyncio.run(run())
+
+    def test_concurrent_requests_start_one_task(self, monkeypatch):
+        """Test that a repeat arriving while the first session task is being emitted gets that task."""
+        emitted = []
+
+        async def emit_state_tasks(client_token, tasks):
+            await asyncio.sleep(0.05)
+            emitted.extend(task_id for task_id, *_ in tasks)
+        monkeypatch.setattr(self.api, "_emit_state_tasks", emit_state_tasks)
+
+        async def run():
+            return await asyncio.gather(*(
+                self.api.start_task("token-1", "stream_report", {"rows": 1}, idempotency_key=self.key)
+                for _ in range(2)
+            ))
+        first, second = asyncio.run(run())
+        assert emitted == [first["task_id"]]
+        assert second["task_id"] == first["task_id"]
+        assert second["deduplicated"]
@@ -0,0 +1,48 @@
+"""Unit tests for sortable task IDs (no server needed)"""
+from app.reflex_user_portal.backend.wrapper import ids as ids_module
+from app.reflex_user_portal.backend.wrapper.ids import (
+    CROCKFORD_ALPHABET, TASK_ID_LENGTH, TaskIdGenerator, is_local_task, new_task_id, task_created_ms, task_worker,
+)
+
+
+class TestTaskIds:
+    """Format, order and uniqueness of generated IDs."""
+
+    def test_format(self):
+        task_id = new_task_id()
+        assert len(task_id) == TASK_ID_LENGTH
+        assert set(task_id) <= set(CROCKFORD_ALPHABET)
+
+    def test_ids_sort_in_creation_order_and_are_unique(self):
+        """Test that IDs made within the same millisecond still count up."""
+        generator = TaskIdGenerator("worker-a")
+        task_ids = [generator.new_id() for _ in range(5000)]
+        assert task_ids == sorted(task_ids)
+        assert len(set(task_ids)) == len(task_ids)
+
+    def test_clock_stepping_back_keeps_order(self, monkeypatch):
+        generator = TaskIdGenerator("worker-a")
+        now = [2_000_000_000_000_000_000]
+        monkeypatch.setattr(ids_module.time, "time_ns", lambda: now[0])
+        first = generator.new_id()
+        now[0] -= 5_000_000_000
+        second = generator.new_id()
+        assert first < second
+        assert task_created_ms(second) == task_created_ms(first) == 2_000_000_000_000
+
+    def test_worker_code(self):
+        """Test that IDs carry the code of their worker and foreign IDs aren't local."""
+        first, second = TaskIdGenerator("worker-a"), TaskIdGenerator("worker-b")
+        assert first.worker != second.worker
+        assert task_worker(first.new_id()) == first.worker
+        assert task_worker(TaskIdGenerator("worker-a").new_id()) == first.worker
+        assert is_local_task(new_task_id())
+        foreign = second.new_id() if second.worker != ids_module.current_worker() else first.new_id()
+        assert not is_local_task(foreign)
+
+    def test_other_id_formats(self):
+        """Test that IDs from before this format (uuid4) are treated as local."""
+        legacy_id = "0b9a3c52-8f9e-4c1d-9d4e-3f2a1b0c9d8e"
+        assert task_worker(legacy_id) is None
+        assert task_created_ms(legacy_id) is None
+        assert is_local_task(legacy_id)
@@ -0,0 +1,53 @@
+"""Unit tests for building task pipelines (no server needed)"""
+import pytest
+
+from app.reflex_user_portal.backend.api.pipelines import PipelineRequest, TaskPipelineRunner
+from app.reflex_user_portal.backend.api.task import TaskAPI
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS
+from app.reflex_user_portal.backend.wrapper.models import TaskStatus
+
+
+class TestPipelineBuild:
+    """Validation of pipeline definitions."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_app):
+        task_apis = {name: TaskAPI(fake_app, name, info) for name, info in STATE_MAPPINGS.items()}
+        self.runner = TaskPipelineRunner(fake_app, task_apis)
+
+    def test_input_sources_become_dependencies(self):
+        """Test that input sources are dependencies of the run but the request is left unchanged."""
+        request = PipelineRequest(state="ExampleTaskState2", nodes=[
+            {"id": "report", "task": "task2_with_args", "parameters": {"age": 25}, "inputs": {"name": "load.name"}},
+            {"id": "load", "task": "task1"},
+        ])
+        pipeline = self.runner._build(request)
+        assert pipeline.nodes["report"].depends_on == ["load"]
+        assert pipeline.nodes["load"].depends_on == []
+        assert request.nodes[0].depends_on == []
+
+    def test_instance_task_rejected(self):
+        """Test that tasks needing a client session can't be pipeline nodes."""
+        request = PipelineRequest(state="ExampleTaskState", nodes=[{"id": "a", "task": "task1"}])
+        with pytest.raises(ValueError, match="not a static-method task"):
+            self.runner._build(request)
+
+    def test_cycle_rejected(self):
+        request = PipelineRequest(state="ExampleTaskState2", nodes=[
+            {"id": "a", "task": "task1", "depends_on": ["b"]},
+            {"id": "b", "task": "task1", "inputs": {"x": "a"}},
+        ])
+        with pytest.raises(ValueError):
+            self.runner._build(request)
+
+    def test_failed_nodes_count_as_finished(self):
+        """Test that a failed node ends its progress like any other final status."""
+        request = PipelineRequest(state="ExampleTaskState2", nodes=[
+            {"id": "a", "task": "task1"},
+            {"id": "b", "task": "task1"},
+        ])
+        pipeline = self.runner._build(request)
+        pipeline.nodes["a"].status = TaskStatus.ERROR
+        pipeline.nodes["b"].status = TaskStatus.COMPLETED
+        assert pipeline.progress == 100
+        assert pipeline.to_dict()["error"] is None
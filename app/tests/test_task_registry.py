@@ -0,0 +1,71 @@
+"""Unit tests for the LRU/TTL registry of direct tasks (no server needed)"""
+from app.reflex_user_portal.backend.wrapper import registry as registry_module
+from app.reflex_user_portal.backend.wrapper.registry import TaskRegistry
+
+
+def add_finished(registry: TaskRegistry, task_id: str, result=None):
+    registry.add(task_id, {"status": "Completed", "progress": 100, "result": result})
+    registry.mark_finished(task_id)
+
+
+class TestTaskRegistry:
+    """Eviction of finished tasks from the registry into its archive."""
+
+    def test_running_tasks_are_never_evicted(self):
+        """Test that running tasks stay even when the registry is over capacity."""
+        registry = TaskRegistry(max_size=2, ttl=3600)
+        for task_id in ("a", "b", "c"):
+            registry.add(task_id, {"status": "Processing"})
+        assert len(registry) == 3
+        assert registry.stats()["lru_evictions"] == 0
+
+    def test_lru_eviction_of_finished_tasks(self):
+        """Test that the least recently used finished task is archived first."""
+        registry = TaskRegistry(max_size=3, ttl=3600)
+        add_finished(registry, "a", result=1)
+        add_finished(registry, "b", result=2)
+        registry.add("running", {"status": "Processing"})
+        # Reading "a" makes "b" the least recently used finished task
+        registry.get("a")
+        registry.add("d", {"status": "Processing"})
+
+        assert "b" not in registry
+        assert "a" in registry and "running" in registry and "d" in registry
+        assert registry.get_archived("b").result == 2
+        assert registry.stats()["lru_evictions"] == 1
+
+    def test_ttl_eviction(self, monkeypatch):
+        """Test that finished tasks are archived once their TTL has elapsed."""
+        now = [1000.0]
+        monkeypatch.setattr(registry_module.time, "monotonic", lambda: now[0])
+        registry = TaskRegistry(max_size=10, ttl=60)
+        add_finished(registry, "old", result="x")
+        now[0] += 30
+        add_finished(registry, "new")
+        registry.add("running", {"status": "Processing"})
+
+        now[0] += 31
+        assert registry.get("old") is None
+        assert registry.get("new") is not None
+        assert registry.get("running") is not None
+        assert registry.get_archived("old").to_dict()["result"] == "x"
+        assert registry.stats()["ttl_evictions"] == 1
+
+    def test_readded_task_is_running_again(self):
+        """Test that re-adding a finished task ID doesn't leave it marked as finished."""
+        registry = TaskRegistry(max_size=1, ttl=3600)
+        add_finished(registry, "a")
+        registry.add("a", {"status": "Processing"})
+        registry.add("b", {"status": "Processing"})
+        assert "a" in registry and "b" in registry
+        assert registry.get_archived("a") is None
+
+    def test_archive_is_bounded(self):
+        """Test that the archive drops its oldest entries beyond archive_size."""
+        registry = TaskRegistry(max_size=1, ttl=3600, archive_size=2)
+        for task_id in ("a", "b", "c", "d"):
+            add_finished(registry, task_id)
+        assert registry.get_archived("a") is None
+        assert registry.get_archived("b") is not None
+        assert registry.get_archived("c") is not None
+        assert registry.stats()["archive_evictions"] == 1
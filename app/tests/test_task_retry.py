@@ -0,0 +1,85 @@
+"""Unit tests for the retry policies of monitored tasks (no server needed)"""
+import asyncio
+
+import pytest
+
+from app.reflex_user_portal.backend.wrapper import retry as retry_module
+from app.reflex_user_portal.backend.wrapper.retry import RetryPolicy, as_retry_policy, call_with_retry
+
+
+class TestRetryPolicy:
+    """Backoff delays and which errors are retried."""
+
+    def test_delay_grows_up_to_max_backoff(self):
+        policy = RetryPolicy(backoff=1, multiplier=2, max_backoff=5, jitter=0)
+        assert [policy.delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+    def test_jitter_shortens_delay_within_bounds(self, monkeypatch):
+        policy = RetryPolicy(backoff=4, jitter=0.5)
+        monkeypatch.setattr(retry_module.random, "random", lambda: 0.0)
+        assert policy.delay(1) == 4
+        monkeypatch.setattr(retry_module.random, "random", lambda: 0.999999)
+        assert 2 <= policy.delay(1) < 2.001
+
+    def test_retry_on(self):
+        """Test that only the listed exception types are retried, and only while attempts are left."""
+        policy = RetryPolicy(max_attempts=3, retry_on=(ConnectionError,))
+        assert policy.should_retry(ConnectionResetError(), 1)
+        assert policy.should_retry(ConnectionError(), 2)
+        assert not policy.should_retry(ConnectionError(), 3)
+        assert not policy.should_retry(ValueError(), 1)
+
+    @pytest.mark.parametrize("options", [{"max_attempts": 0}, {"jitter": -0.1}, {"jitter": 1.5}])
+    def test_invalid_policy(self, options):
+        with pytest.raises(ValueError):
+            RetryPolicy(**options)
+
+    def test_decorator_option(self):
+        policy = RetryPolicy(max_attempts=2)
+        assert as_retry_policy(None) is None
+        assert as_retry_policy(policy) is policy
+        assert as_retry_policy(4) == RetryPolicy(max_attempts=4)
+        with pytest.raises(ValueError):
+            as_retry_policy(True)
+
+
+class TestCallWithRetry:
+    """Running an attempt function under a policy."""
+
+    def setup_method(self):
+        self.retries = []
+
+    async def on_retry(self, attempt, error, delay):
+        self.retries.append((attempt, type(error), delay))
+
+    def attempts(self, *outcomes):
+        """Attempt function that raises or returns the given outcomes in turn."""
+        outcomes = list(outcomes)
+
+        async def attempt():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+        return attempt
+
+    def test_succeeds_after_retries(self):
+        policy = RetryPolicy(max_attempts=3, backoff=0, jitter=0)
+        attempt = self.attempts(ConnectionError(), ConnectionError(), "done")
+        assert asyncio.run(call_with_retry(policy, attempt, self.on_retry)) == "done"
+        assert self.retries == [(1, ConnectionError, 0), (2, ConnectionError, 0)]
+
+    def test_gives_up_with_last_error(self):
+        policy = RetryPolicy(max_attempts=2, backoff=0, jitter=0)
+        attempt = self.attempts(ConnectionError(), TimeoutError(), "done")
+        with pytest.raises(TimeoutError):
+            asyncio.run(call_with_retry(policy, attempt, self.on_retry))
+        assert [retry[0] for retry in self.retries] == [1]
+
+    def test_other_errors_fail_at_once(self):
+        policy = RetryPolicy(max_attempts=3, backoff=0, retry_on=(ConnectionError,))
+        with pytest.raises(ValueError):
+            asyncio.run(call_with_retry(policy, self.attempts(ValueError()), self.on_retry))
+        with pytest.raises(ConnectionError):
+            asyncio.run(call_with_retry(None, self.attempts(ConnectionError()), self.on_retry))
+        assert self.retries == []
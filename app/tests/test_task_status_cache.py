@@ -0,0 +1,96 @@
+"""Unit tests for the task status cache and the lock-free status reads (no server needed)"""
+import asyncio
+
+import pytest
+
+from app.reflex_user_portal.backend.api.task import TaskAPI
+from app.reflex_user_portal.backend.states.task import STATE_MAPPINGS
+from app.reflex_user_portal.backend.wrapper import status_cache as status_cache_module
+from app.reflex_user_portal.backend.wrapper.models import TaskData, TaskStatus
+from app.reflex_user_portal.backend.wrapper.status_cache import TaskStatusCache
+
+STATE_NAME = "ExampleTaskState"
+
+
+def snapshot(task_id: str, status: str = TaskStatus.PROCESSING, progress: int = 0):
+    active = status not in (TaskStatus.COMPLETED, TaskStatus.ERROR, TaskStatus.CANCELLED)
+    return TaskData(id=task_id, name="task1", status=status, active=active, progress=progress).to_dict()
+
+
+class TestTaskStatusCache:
+    """When the cache answers and when the session has to be read from the state."""
+
+    def test_unseeded_session_misses(self):
+        cache = TaskStatusCache()
+        assert cache.get("s", "token") is None
+        cache.seed("s", "token", {"a": snapshot("a")})
+        assert "a" in cache.get("s", "token", "a")
+
+    def test_unknown_task_misses(self):
+        """Test that a task the cache doesn't hold is read from the state."""
+        cache = TaskStatusCache()
+        cache.seed("s", "token", {})
+        assert cache.get("s", "token", "a") is None
+
+    def test_stale_running_task_misses(self, monkeypatch):
+        """Test that old snapshots of running tasks expire but final ones don't."""
+        now = [100.0]
+        monkeypatch.setattr(status_cache_module.time, "monotonic", lambda: now[0])
+        cache = TaskStatusCache(max_age=2)
+        cache.seed("s", "token", {"run": snapshot("run"), "done": snapshot("done", TaskStatus.COMPLETED)})
+        assert cache.get("s", "token", "run") is not None
+        assert cache.get("s", "token") is not None
+
+        now[0] += 3
+        assert cache.get("s", "token", "run") is None
+        assert cache.get("s", "token", "done") is not None
+        assert cache.get("s", "token") is None
+
+        # An update published in this process keeps it fresh
+        cache.merge("s", "token", {"id": "run", "progress": 50})
+        assert cache.get("s", "token", "run")["run"]["progress"] == 50
+
+    def test_snapshots_published_during_read_win(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(status_cache_module.time, "monotonic", lambda: now[0])
+        cache = TaskStatusCache()
+        read_at = now[0]
+        now[0] += 1
+        cache.put("s", "token", snapshot("a", progress=80))
+        tasks = cache.seed("s", "token", {"a": snapshot("a", progress=10), "b": snapshot("b")}, read_at)
+        assert tasks["a"]["progress"] == 80
+        assert "b" in tasks
+
+
+class TestStateTaskReads:
+    """Status reads of session tasks through TaskAPI with a state of another worker."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_app):
+        self.state_manager = fake_app.state_manager
+        self.api = TaskAPI(fake_app, STATE_NAME, STATE_MAPPINGS[STATE_NAME])
+        self.token = f"token-{id(self)}"
+
+    def test_task_started_after_seeding(self):
+        """Test that a task started after the session was seeded is found, not a 404."""
+        status = asyncio.run(self.api.get_task_status(self.token))
+        assert status == {"all_tasks": {}}
+        assert self.state_manager.reads == 1
+
+        # Started by another worker: only its state has it
+        task = TaskData(id="01TASKSTARTEDLATER0000000A", name="task1", status=TaskStatus.PROCESSING)
+        self.state_manager.monitor_state.tasks[task.id] = task
+
+        status = asyncio.run(self.api.get_task_status(self.token, task.id))
+        assert status["id"] == task.id
+        assert status["status"] == TaskStatus.PROCESSING
+        assert self.state_manager.reads == 2
+
+    def test_finished_task_served_from_cache(self):
+        """Test that a finished task is answered without another state read."""
+        task = TaskData(id="01TASKFINISHED000000000000", name="task1", status=TaskStatus.COMPLETED,
+                        active=False, result="done")
+        self.state_manager.monitor_state.tasks[task.id] = task
+        assert asyncio.run(self.api.get_task_result(self.token, task.id)) == "done"
+        assert asyncio.run(self.api.get_task_result(self.token, task.id)) == "done"
+        assert self.state_manager.reads == 1
@@ -0,0 +1,70 @@
+"""Unit tests for the batching of the direct task store (no server or database needed)"""
+import asyncio
+
+from app.reflex_user_portal.backend.wrapper.models import TaskStatus
+from app.reflex_user_portal.backend.wrapper.store import TaskStore
+
+
+def new_store(flush_interval: float = 10.0) -> TaskStore:
+    """A store whose batches are collected in `store.batches` instead of written to the database."""
+    store = TaskStore(flush_interval=flush_interval)
+    store.batches = []
+    store._write = store.batches.append
+    return store
+
+
+class TestTaskStoreBatching:
+    """When and how pending task records are written."""
+
+    def test_updates_are_merged_per_task(self):
+        async def run():
+            store = new_store()
+            store.record("a", state="s", task_name="t", status=TaskStatus.STARTING)
+            store.record("a", progress=50, status=TaskStatus.PROCESSING)
+            store.record("b", progress=10)
+            assert store.batches == []
+            assert store.stats()["pending"] == 2
+
+            await store.flush()
+            batch, = store.batches
+            assert batch["a"]["status"] == TaskStatus.PROCESSING
+            assert (batch["a"]["task_name"], batch["a"]["progress"]) == ("t", 50)
+            assert batch["a"].get("finished_at") is None
+            assert store.stats()["pending"] == 0
+        asyncio.run(run())
+
+    def test_terminal_status_is_written_at_once(self):
+        """Test that a finished task doesn't wait for the flush interval."""
+        async def run():
+            store = new_store(flush_interval=10.0)
+            store.record("a", progress=50)
+            store.record("a", status=TaskStatus.ERROR, result={"error": "boom"})
+            await asyncio.sleep(0.05)
+            batch, = store.batches
+            assert batch["a"]["progress"] == 50
+            assert batch["a"]["finished_at"] is not None
+        asyncio.run(run())
+
+    def test_without_loop_writes_synchronously(self):
+        store = new_store()
+        store.record("a", progress=10, result={"values": {1, 2}})
+        batch, = store.batches
+        assert batch["a"]["result"] == {"values": [1, 2]}
+
+    def test_get_includes_pending_updates(self):
+        async def run():
+            store = new_store()
+            store._read = lambda task_id: {"id": task_id, "status": TaskStatus.STARTING, "progress": 0}
+            store.record("a", progress=30, status=TaskStatus.PROCESSING)
+            record = await store.get("a")
+            assert (record["status"], record["progress"]) == (TaskStatus.PROCESSING, 30)
+        asyncio.run(run())
+
+    def test_disabled_store(self):
+        async def run():
+            store = new_store()
+            store.enabled = False
+            store.record("a", status=TaskStatus.COMPLETED)
+            assert store.batches == []
+            assert await store.get("a") is None
+        asyncio.run(run())
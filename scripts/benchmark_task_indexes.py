@@ -0,0 +1,98 @@
+"""
+Benchmark of the MonitorState task lists with many tasks in one session.
+
+Compares computing `active_tasks` and `completed_tasks` by filtering and sorting all
+tasks (as before the indexes) with reading them from the pre-sorted indexes that
+index_task maintains, and times index_task itself.
+
+Usage (from the repository root):
+    python scripts/benchmark_task_indexes.py [--tasks 10000] [--active 10] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("CLERK_SECRET_KEY", "benchmark")
+
+from reflex.state import State
+
+from app.reflex_user_portal.backend.states.task.base import MonitorState
+from app.reflex_user_portal.backend.wrapper.ids import new_task_id
+from app.reflex_user_portal.backend.wrapper.models import (
+    ACTIVE_STATUSES, TaskData, TaskStatus, is_terminal_status,
+)
+
+
+def scan_active_tasks(state):
+    """active_tasks as computed before the indexes."""
+    tasks = [task for task in state.tasks.values() if task.status in ACTIVE_STATUSES]
+    return sorted(tasks, key=lambda task: task.id, reverse=True)
+
+
+def scan_completed_tasks(state):
+    """completed_tasks as computed before the indexes."""
+    tasks = [task for task in state.tasks.values() if is_terminal_status(task.status)]
+    return sorted(tasks, key=lambda task: task.id, reverse=True)
+
+
+def timed(fn, repeat: int) -> float:
+    """Mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks in the session")
+    parser.add_argument("--active", type=int, default=10, help="how many of them are running")
+    parser.add_argument("--repeat", type=int, default=50, help="calls per measurement")
+    args = parser.parse_args()
+
+    root = State(_reflex_internal_init=True)
+    state = root.get_substate(MonitorState.get_full_name().split(".")[1:])
+    for index in range(args.tasks):
+        task_id = new_task_id()
+        running = index >= args.tasks - args.active
+        state.tasks[task_id] = TaskData(
+            id=task_id,
+            name="Benchmark",
+            status=TaskStatus.PROCESSING if running else TaskStatus.COMPLETED,
+            active=running,
+            progress=50 if running else 100,
+        )
+        state.index_task(task_id)
+
+    computed = type(state).computed_vars
+    indexed_active = lambda: computed["active_tasks"].fget(state)
+    indexed_completed = lambda: computed["completed_tasks"].fget(state)
+    assert indexed_active() == scan_active_tasks(state)
+    assert indexed_completed() == scan_completed_tasks(state)
+
+    # A running task finishing and starting again: two status transitions
+    running = state.tasks.__wrapped__[state._task_index.active[0]]
+
+    def transition():
+        running.status = TaskStatus.COMPLETED
+        state.index_task(running.id)
+        running.status = TaskStatus.PROCESSING
+        state.index_task(running.id)
+
+    print(f"{args.tasks} tasks, {args.active} active; mean ms per call over {args.repeat} calls")
+    rows = [
+        ("active_tasks (filter + sort)", timed(lambda: scan_active_tasks(state), args.repeat)),
+        ("active_tasks (index)", timed(indexed_active, args.repeat)),
+        ("completed_tasks (filter + sort)", timed(lambda: scan_completed_tasks(state), args.repeat)),
+        ("completed_tasks (index)", timed(indexed_completed, args.repeat)),
+        ("index_task, two transitions", timed(transition, args.repeat)),
+    ]
+    width = max(len(label) for label, _ in rows)
+    for label, ms in rows:
+        print(f"  {label:<{width}}  {ms:9.3f}")
+
+
+if __name__ == "__main__":
+    main()